@@ -0,0 +1,16 @@
+from typing import Annotated, List, Optional
+
+from fastapi import Query
+
+from app.core.config import settings
+
+# Keyset-пагинация: клиент передаёт id последнего полученного элемента
+AfterId = Annotated[Optional[int], Query(ge=0, description="id последнего элемента предыдущей страницы")]
+Limit = Annotated[int, Query(ge=1, le=settings.API_MAX_PAGE_SIZE)]
+BatchIds = Annotated[List[int], Query(min_length=1, max_length=settings.API_MAX_PAGE_SIZE)]
+
+
+def keyset(stmt, id_column, after_id: Optional[int], limit: int):
+    if after_id is not None:
+        stmt = stmt.where(id_column > after_id)
+    return stmt.order_by(id_column).limit(limit)
@@ -0,0 +1,233 @@
+from datetime import datetime
+from itertools import islice
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import AfterId, BatchIds, Limit, keyset
+from app.core import posters, recurrence
+from app.core.config import settings
+from app.database import dedupe
+from app.database.database import get_async_db, get_async_primary_db
+from app.database.read_models import (
+    EVENT_RECORD_COLUMNS, EventRecord, afetch, covers, merge_materialized, occurrences_stmt, one_off, series_stmt,
+)
+from app.models.event import Event, horizon_stmt
+from app.models.popularity import EventPopularity
+from app.models.venue import Venue
+from app.schemas.dates import UtcDateTime
+from app.schemas.event import EventCreate, EventUpdate, EventInDB, EventImportResult
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# reject — не создавать дубль, merge — дополнить найденное мероприятие, allow — создать всё равно
+OnDuplicate = Literal["reject", "merge", "allow"]
+# id — по возрастанию id (keyset через after_id);
+# trending — только мероприятия с рейтингом (app/models/popularity.py), самые популярные первыми
+EventSort = Literal["id", "trending"]
+
+async def check_venue(db: AsyncSession, venue_id: Optional[int]):
+    if venue_id is not None and await db.get(Venue, venue_id) is None:
+        raise HTTPException(status_code=404, detail="Venue not found")
+
+async def find_duplicate(db: AsyncSession, event: EventCreate, on_duplicate: OnDuplicate) -> Optional[Event]:
+    if on_duplicate == "allow":
+        return None
+    duplicate_id = await dedupe.afind_duplicate(db, event.city, event.date, event.title)
+    if duplicate_id is None:
+        return None
+    duplicate = await db.get(Event, duplicate_id)
+    if on_duplicate == "merge":
+        dedupe.fill_missing(duplicate, event.model_dump())
+    return duplicate
+
+@router.post("/", response_model=EventInDB)
+async def create_event(
+    event: EventCreate,
+    on_duplicate: OnDuplicate = "reject",
+    db: AsyncSession = Depends(get_async_primary_db),
+):
+    await check_venue(db, event.venue_id)
+    duplicate = await find_duplicate(db, event, on_duplicate)
+    if duplicate is not None:
+        if on_duplicate == "reject":
+            raise HTTPException(status_code=409, detail={"message": "Duplicate event", "duplicate_of": duplicate.id})
+        await db.commit()
+        await db.refresh(duplicate)
+        return duplicate
+    db_event = Event(**event.model_dump())
+    db.add(db_event)
+    await db.commit()
+    await db.refresh(db_event)
+    return db_event
+
+@router.post("/import", response_model=EventImportResult)
+async def import_events(
+    events: List[EventCreate] = Body(..., max_length=settings.API_MAX_PAGE_SIZE),
+    on_duplicate: OnDuplicate = "reject",
+    db: AsyncSession = Depends(get_async_primary_db),
+):
+    """Пакетное создание; дубли (в том числе внутри самого пакета) не создаются, а перечисляются в duplicates."""
+    created, duplicates = [], []
+    for index, event in enumerate(events):
+        await check_venue(db, event.venue_id)
+        duplicate = await find_duplicate(db, event, on_duplicate)
+        if duplicate is not None:
+            duplicates.append({"index": index, "duplicate_of": duplicate.id})
+            continue
+        db_event = Event(**event.model_dump())
+        db.add(db_event)
+        # flush пишет полосы SimHash — следующие записи пакета сверяются и с этой
+        await db.flush()
+        created.append(db_event)
+    await db.commit()
+    for db_event in created:
+        await db.refresh(db_event)
+    return {"created": created, "duplicates": duplicates}
+
+@router.get("/", response_model=List[EventInDB])
+async def read_events(
+    skip: int = Query(0, ge=0),
+    limit: Limit = settings.API_DEFAULT_PAGE_SIZE,
+    after_id: AfterId = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    venue_id: Optional[int] = None,
+    city: Optional[str] = None,
+    sort: EventSort = "id",
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Список отдаётся из колонок, без загрузки ORM-сущностей
+    stmt = select(*EVENT_RECORD_COLUMNS)
+    if city is not None:
+        stmt = stmt.where(Event.city == city)
+    if date_from is not None:
+        stmt = stmt.where(Event.date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Event.date < date_to)
+    if venue_id is not None:
+        stmt = stmt.where(Event.venue_id == venue_id)
+    if sort == "trending":
+        if after_id is not None:
+            raise HTTPException(status_code=400, detail="after_id is only supported with sort=id")
+        # Готовый score из event_popularity; с city — обход индекса (city, score)
+        stmt = stmt.join(EventPopularity, EventPopularity.event_id == Event.id)
+        if city is not None:
+            stmt = stmt.where(EventPopularity.city == city)
+        stmt = stmt.order_by(EventPopularity.score.desc(), Event.id).offset(skip).limit(limit)
+    elif after_id is not None:
+        stmt = keyset(stmt, Event.id, after_id, limit)
+    else:
+        stmt = stmt.order_by(Event.id).offset(skip).limit(limit)
+    return await afetch(db, stmt, EventRecord)
+
+@router.get("/occurrences", response_model=List[EventInDB])
+async def read_event_occurrences(
+    date_from: Optional[UtcDateTime] = None,
+    date_to: Optional[UtcDateTime] = None,
+    city: Optional[str] = None,
+    limit: Limit = settings.API_DEFAULT_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Мероприятия города по дате в [date_from, date_to): серии развёрнуты в повторения.
+
+    Повторение отдаётся записью серии (тот же id и rrule) с датой этого повторения.
+    """
+    date_from = date_from or datetime.utcnow()
+    city = city or settings.get_default_city()
+    stmt = select(*EVENT_RECORD_COLUMNS).where(Event.city == city, one_off(), Event.date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Event.date < date_to)
+    one_offs = await afetch(db, stmt.order_by(Event.date).limit(limit), EventRecord)
+    horizon = (await db.execute(horizon_stmt())).first()
+    if covers(horizon, date_from):
+        end = horizon.until if date_to is None else min(date_to, horizon.until)
+        occurrences = await afetch(
+            db, occurrences_stmt(EVENT_RECORD_COLUMNS, city, date_from, end).limit(limit), EventRecord,
+        )
+        rows = merge_materialized(one_offs, occurrences, horizon.until, limit=limit, end=date_to)
+        if rows is not None:
+            return rows
+    series = await afetch(db, series_stmt(EVENT_RECORD_COLUMNS, city, date_from, date_to), EventRecord)
+    return list(islice(recurrence.merge_by_date(one_offs, series, date_from, date_to), limit))
+
+@router.get("/batch", response_model=List[EventInDB])
+async def read_events_batch(ids: BatchIds, db: AsyncSession = Depends(get_async_db)):
+    result = await db.scalars(select(Event).where(Event.id.in_(set(ids))).order_by(Event.id))
+    return result.all()
+
+@router.get("/{event_id}", response_model=EventInDB)
+async def read_event(event_id: int, db: AsyncSession = Depends(get_async_db)):
+    event = await db.get(Event, event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return event
+
+@router.get("/{event_id}/poster")
+async def read_event_poster(
+    event_id: int,
+    size: str = Query("medium", pattern="^(thumb|medium|original)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    version = await db.scalar(select(Event.poster_version).where(Event.id == event_id))
+    if version is None or not posters.poster_file(event_id, version, size).exists():
+        raise HTTPException(status_code=404, detail="Poster not found")
+    # Файлы версии неизменяемы: при замене постера меняется poster_version
+    return FileResponse(
+        posters.poster_file(event_id, version, size),
+        media_type="image/jpeg",
+        headers={"Cache-Control": "public, max-age=86400"},
+    )
+
+@router.put("/{event_id}/poster", response_model=EventInDB)
+async def upload_event_poster(
+    event_id: int,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_primary_db),
+):
+    db_event = await db.get(Event, event_id)
+    if db_event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    data = await file.read(settings.POSTER_MAX_BYTES + 1)
+    if len(data) > settings.POSTER_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Poster is too large")
+    try:
+        version = await posters.store_poster(event_id, data)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Unsupported image")
+    if version != db_event.poster_version:
+        db_event.poster_version = version
+        # Бот загрузит новый файл в Telegram при первой отправке и запомнит file_id
+        db_event.poster_file_id = None
+        await db.commit()
+        await db.refresh(db_event)
+    return db_event
+
+@router.put("/{event_id}", response_model=EventInDB)
+async def update_event(event_id: int, event: EventUpdate, db: AsyncSession = Depends(get_async_primary_db)):
+    db_event = await db.get(Event, event_id)
+    if db_event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    await check_venue(db, event.venue_id)
+
+    for key, value in event.model_dump(exclude_unset=True).items():
+        setattr(db_event, key, value)
+    
+    await db.commit()
+    await db.refresh(db_event)
+    return db_event
+
+@router.delete("/{event_id}")
+async def delete_event(event_id: int, db: AsyncSession = Depends(get_async_primary_db)):
+    event = await db.get(Event, event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    await db.delete(event)
+    await db.commit()
+    posters.delete_posters(event_id)
+    return {"message": "Event deleted successfully"}
@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import AfterId, Limit, keyset
+from app.core.config import settings
+from app.database.database import get_async_db, get_async_primary_db
+from app.models.event import Event
+from app.models.favorite import Favorite
+from app.models.popularity import add_scores, log_weight
+from app.schemas.favorite import FavoriteCreate, FavoriteInDB
+
+router = APIRouter(prefix="/favorites", tags=["favorites"])
+
+@router.post("/", response_model=FavoriteInDB)
+async def create_favorite(favorite: FavoriteCreate, db: AsyncSession = Depends(get_async_primary_db)):
+    if await db.get(Event, favorite.event_id) is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    exists = await db.scalar(
+        select(Favorite).where(Favorite.user_id == favorite.user_id, Favorite.event_id == favorite.event_id)
+    )
+    if exists is not None:
+        raise HTTPException(status_code=409, detail="Favorite already exists")
+    db_favorite = Favorite(**favorite.model_dump())
+    db.add(db_favorite)
+    now = datetime.utcnow()
+    increment = {favorite.event_id: log_weight(settings.POPULARITY_FAVORITE_WEIGHT, now)}
+    await db.run_sync(lambda session: add_scores(session.connection(), increment, now))
+    await db.commit()
+    await db.refresh(db_favorite)
+    return db_favorite
+
+@router.get("/", response_model=List[FavoriteInDB])
+async def read_favorites(
+    after_id: AfterId = None,
+    limit: Limit = settings.API_DEFAULT_PAGE_SIZE,
+    user_id: Optional[int] = None,
+    event_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = select(Favorite)
+    if user_id is not None:
+        stmt = stmt.where(Favorite.user_id == user_id)
+    if event_id is not None:
+        stmt = stmt.where(Favorite.event_id == event_id)
+    result = await db.scalars(keyset(stmt, Favorite.id, after_id, limit))
+    return result.all()
+
+@router.delete("/{favorite_id}")
+async def delete_favorite(favorite_id: int, db: AsyncSession = Depends(get_async_primary_db)):
+    favorite = await db.get(Favorite, favorite_id)
+    if favorite is None:
+        raise HTTPException(status_code=404, detail="Favorite not found")
+
+    await db.delete(favorite)
+    await db.commit()
+    return {"message": "Favorite deleted successfully"}
@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import AfterId, Limit, keyset
+from app.core.config import settings
+from app.database.database import get_async_db, get_async_primary_db
+from app.models.feedback import Feedback
+from app.schemas.feedback import FeedbackCreate, FeedbackInDB
+
+router = APIRouter(prefix="/feedback", tags=["feedback"])
+
+@router.post("/", response_model=FeedbackInDB)
+async def create_feedback(feedback: FeedbackCreate, db: AsyncSession = Depends(get_async_primary_db)):
+    db_feedback = Feedback(**feedback.model_dump())
+    db.add(db_feedback)
+    await db.commit()
+    await db.refresh(db_feedback)
+    return db_feedback
+
+@router.get("/", response_model=List[FeedbackInDB])
+async def read_feedback(
+    after_id: AfterId = None,
+    limit: Limit = settings.API_DEFAULT_PAGE_SIZE,
+    user_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = select(Feedback)
+    if user_id is not None:
+        stmt = stmt.where(Feedback.user_id == user_id)
+    if date_from is not None:
+        stmt = stmt.where(Feedback.created_at >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Feedback.created_at < date_to)
+    result = await db.scalars(keyset(stmt, Feedback.id, after_id, limit))
+    return result.all()
+
+@router.get("/{feedback_id}", response_model=FeedbackInDB)
+async def read_feedback_item(feedback_id: int, db: AsyncSession = Depends(get_async_db)):
+    feedback = await db.get(Feedback, feedback_id)
+    if feedback is None:
+        raise HTTPException(status_code=404, detail="Feedback not found")
+    return feedback
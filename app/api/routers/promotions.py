@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import AfterId, BatchIds, Limit, keyset
+from app.core.config import settings
+from app.database.database import get_async_db, get_async_primary_db
+from app.models.promotion import Promotion
+from app.models.venue import Venue
+from app.schemas.promotion import PromotionCreate, PromotionUpdate, PromotionInDB
+
+router = APIRouter(prefix="/promotions", tags=["promotions"])
+
+@router.post("/", response_model=PromotionInDB)
+async def create_promotion(promotion: PromotionCreate, db: AsyncSession = Depends(get_async_primary_db)):
+    if promotion.venue_id is not None and await db.get(Venue, promotion.venue_id) is None:
+        raise HTTPException(status_code=404, detail="Venue not found")
+    db_promotion = Promotion(**promotion.model_dump())
+    db.add(db_promotion)
+    await db.commit()
+    await db.refresh(db_promotion)
+    return db_promotion
+
+@router.get("/", response_model=List[PromotionInDB])
+async def read_promotions(
+    after_id: AfterId = None,
+    limit: Limit = settings.API_DEFAULT_PAGE_SIZE,
+    active: Optional[bool] = None,
+    venue: Optional[str] = None,
+    venue_id: Optional[int] = None,
+    city: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = select(Promotion)
+    if city is not None:
+        stmt = stmt.where(Promotion.city == city)
+    if active is not None:
+        now = datetime.utcnow()
+        is_running = (Promotion.is_active == True) & (Promotion.start_date <= now) & (Promotion.end_date >= now)
+        stmt = stmt.where(is_running if active else ~is_running)
+    if venue is not None:
+        stmt = stmt.where(Promotion.venue == venue)
+    if venue_id is not None:
+        stmt = stmt.where(Promotion.venue_id == venue_id)
+    result = await db.scalars(keyset(stmt, Promotion.id, after_id, limit))
+    return result.all()
+
+@router.get("/batch", response_model=List[PromotionInDB])
+async def read_promotions_batch(ids: BatchIds, db: AsyncSession = Depends(get_async_db)):
+    result = await db.scalars(select(Promotion).where(Promotion.id.in_(set(ids))).order_by(Promotion.id))
+    return result.all()
+
+@router.get("/{promotion_id}", response_model=PromotionInDB)
+async def read_promotion(promotion_id: int, db: AsyncSession = Depends(get_async_db)):
+    promotion = await db.get(Promotion, promotion_id)
+    if promotion is None:
+        raise HTTPException(status_code=404, detail="Promotion not found")
+    return promotion
+
+@router.put("/{promotion_id}", response_model=PromotionInDB)
+async def update_promotion(promotion_id: int, promotion: PromotionUpdate, db: AsyncSession = Depends(get_async_primary_db)):
+    db_promotion = await db.get(Promotion, promotion_id)
+    if db_promotion is None:
+        raise HTTPException(status_code=404, detail="Promotion not found")
+
+    if promotion.venue_id is not None and await db.get(Venue, promotion.venue_id) is None:
+        raise HTTPException(status_code=404, detail="Venue not found")
+
+    for key, value in promotion.model_dump(exclude_unset=True).items():
+        setattr(db_promotion, key, value)
+
+    await db.commit()
+    await db.refresh(db_promotion)
+    return db_promotion
+
+@router.delete("/{promotion_id}")
+async def delete_promotion(promotion_id: int, db: AsyncSession = Depends(get_async_primary_db)):
+    promotion = await db.get(Promotion, promotion_id)
+    if promotion is None:
+        raise HTTPException(status_code=404, detail="Promotion not found")
+
+    await db.delete(promotion)
+    await db.commit()
+    return {"message": "Promotion deleted successfully"}
@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import AfterId, Limit, keyset
+from app.core.config import settings
+from app.database.database import get_async_db, get_async_primary_db
+from app.models.digest import add_default_preferences
+from app.models.subscriber import Subscriber
+from app.schemas.subscriber import SubscriberCreate, SubscriberInDB
+
+router = APIRouter(prefix="/subscribers", tags=["subscribers"])
+
+@router.post("/", response_model=SubscriberInDB)
+async def create_subscriber(subscriber: SubscriberCreate, db: AsyncSession = Depends(get_async_primary_db)):
+    exists = await db.scalar(select(Subscriber).where(Subscriber.user_id == subscriber.user_id))
+    if exists is not None:
+        raise HTTPException(status_code=409, detail="Subscriber already exists")
+    db_subscriber = Subscriber(**subscriber.model_dump())
+    db.add(db_subscriber)
+    now = datetime.utcnow()
+    await db.run_sync(lambda session: add_default_preferences(session.connection(), [subscriber.user_id], now))
+    await db.commit()
+    await db.refresh(db_subscriber)
+    return db_subscriber
+
+@router.get("/", response_model=List[SubscriberInDB])
+async def read_subscribers(
+    after_id: AfterId = None,
+    limit: Limit = settings.API_DEFAULT_PAGE_SIZE,
+    city: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = select(Subscriber)
+    if city is not None:
+        stmt = stmt.where(Subscriber.city == city)
+    result = await db.scalars(keyset(stmt, Subscriber.id, after_id, limit))
+    return result.all()
+
+@router.get("/{user_id}", response_model=SubscriberInDB)
+async def read_subscriber(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    subscriber = await db.scalar(select(Subscriber).where(Subscriber.user_id == user_id))
+    if subscriber is None:
+        raise HTTPException(status_code=404, detail="Subscriber not found")
+    return subscriber
+
+@router.delete("/{user_id}")
+async def delete_subscriber(user_id: int, db: AsyncSession = Depends(get_async_primary_db)):
+    subscriber = await db.scalar(select(Subscriber).where(Subscriber.user_id == user_id))
+    if subscriber is None:
+        raise HTTPException(status_code=404, detail="Subscriber not found")
+
+    await db.delete(subscriber)
+    await db.commit()
+    return {"message": "Subscriber deleted successfully"}
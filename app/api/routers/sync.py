@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import Limit
+from app.core.config import settings
+from app.database.database import get_async_db
+from app.database.read_models import EVENT_RECORD_COLUMNS, EventRecord, afetch
+from app.models.change_log import ChangeLog
+from app.models.event import Event
+from app.models.promotion import Promotion
+from app.schemas.sync import ChangesPage
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+@router.get("/changes", response_model=ChangesPage)
+async def read_changes(
+    since: int = Query(0, ge=0, description="cursor из предыдущего ответа; 0 — полная выгрузка"),
+    limit: Limit = settings.API_MAX_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Изменения мероприятий и акций после since: актуальные записи и id удалённых.
+
+    Страница ограничена limit записями журнала; пока has_more, клиент
+    повторяет запрос с since=cursor.
+    """
+    result = await db.execute(
+        select(ChangeLog.seq, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.op)
+        .where(ChangeLog.seq > since)
+        .order_by(ChangeLog.seq)
+        .limit(limit + 1)
+    )
+    changes = result.all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    # Несколько изменений одной записи на странице схлопываются в последнее
+    latest = {}
+    for _, entity, entity_id, op in changes:
+        latest[entity, entity_id] = op
+    upserted = {"event": [], "promotion": []}
+    deleted = {"event": [], "promotion": []}
+    for (entity, entity_id), op in latest.items():
+        (deleted if op == "delete" else upserted)[entity].append(entity_id)
+
+    # Запись, удалённая позже этой страницы, здесь не найдётся — удаление придёт следующей страницей
+    events = []
+    if upserted["event"]:
+        events = await afetch(
+            db, select(*EVENT_RECORD_COLUMNS).where(Event.id.in_(upserted["event"])).order_by(Event.id), EventRecord,
+        )
+    promotions = []
+    if upserted["promotion"]:
+        promotions = (await db.scalars(
+            select(Promotion).where(Promotion.id.in_(upserted["promotion"])).order_by(Promotion.id)
+        )).all()
+
+    return {
+        "cursor": changes[-1].seq if changes else since,
+        "has_more": has_more,
+        "events": [event._asdict() for event in events],
+        "promotions": promotions,
+        "deleted": {"events": sorted(deleted["event"]), "promotions": sorted(deleted["promotion"])},
+    }
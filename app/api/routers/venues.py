@@ -0,0 +1,88 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import AfterId, Limit, keyset
+from app.core.config import settings
+from app.database import geo
+from app.database.database import get_async_db, get_async_primary_db
+from app.models.event import Event
+from app.models.promotion import Promotion
+from app.models.venue import Venue
+from app.schemas.venue import VenueCreate, VenueUpdate, VenueInDB, VenueNearby
+
+router = APIRouter(prefix="/venues", tags=["venues"])
+
+async def ensure_unique_name(db: AsyncSession, name: str, venue_id: int = None):
+    existing = await db.scalar(select(Venue.id).where(Venue.name == name))
+    if existing is not None and existing != venue_id:
+        raise HTTPException(status_code=409, detail="Venue already exists")
+
+@router.post("/", response_model=VenueInDB)
+async def create_venue(venue: VenueCreate, db: AsyncSession = Depends(get_async_primary_db)):
+    await ensure_unique_name(db, venue.name)
+    db_venue = Venue(**venue.model_dump())
+    db.add(db_venue)
+    await db.commit()
+    await db.refresh(db_venue)
+    return db_venue
+
+@router.get("/", response_model=List[VenueInDB])
+async def read_venues(
+    after_id: AfterId = None,
+    limit: Limit = settings.API_DEFAULT_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_db),
+):
+    result = await db.scalars(keyset(select(Venue), Venue.id, after_id, limit))
+    return result.all()
+
+@router.get("/nearby", response_model=List[VenueNearby])
+async def read_nearby_venues(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(settings.NEARBY_RADIUS_KM, gt=0, le=100),
+    limit: Limit = settings.API_DEFAULT_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_db),
+):
+    nearby = await geo.nearby_venues(db, lat, lon, radius_km, limit)
+    return [{**venue._asdict(), "distance_km": round(distance, 3)} for venue, distance in nearby]
+
+@router.get("/{venue_id}", response_model=VenueInDB)
+async def read_venue(venue_id: int, db: AsyncSession = Depends(get_async_db)):
+    venue = await db.get(Venue, venue_id)
+    if venue is None:
+        raise HTTPException(status_code=404, detail="Venue not found")
+    return venue
+
+@router.put("/{venue_id}", response_model=VenueInDB)
+async def update_venue(venue_id: int, venue: VenueUpdate, db: AsyncSession = Depends(get_async_primary_db)):
+    db_venue = await db.get(Venue, venue_id)
+    if db_venue is None:
+        raise HTTPException(status_code=404, detail="Venue not found")
+
+    values = venue.model_dump(exclude_unset=True)
+    if values.get("name") is not None:
+        await ensure_unique_name(db, values["name"], venue_id)
+    for key, value in values.items():
+        setattr(db_venue, key, value)
+
+    await db.commit()
+    await db.refresh(db_venue)
+    return db_venue
+
+@router.delete("/{venue_id}")
+async def delete_venue(venue_id: int, db: AsyncSession = Depends(get_async_primary_db)):
+    venue = await db.get(Venue, venue_id)
+    if venue is None:
+        raise HTTPException(status_code=404, detail="Venue not found")
+
+    # ON DELETE SET NULL вручную: в SQLite внешние ключи не проверяются.
+    # Через ORM, а не bulk UPDATE, чтобы изменения попали в журнал синхронизации
+    for model in (Event, Promotion):
+        for linked in await db.scalars(select(model).where(model.venue_id == venue_id)):
+            linked.venue_id = None
+    await db.delete(venue)
+    await db.commit()
+    return {"message": "Venue deleted successfully"}
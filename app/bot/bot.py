@@ -1,72 +1,52 @@
-from aiogram import Bot, Dispatcher, types
-from aiogram.filters import Command, CommandObject
-from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton, ReplyKeyboardRemove
+from aiogram import Bot, Dispatcher, F, Router, types
+from aiogram.filters import Command, CommandObject, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.storage.memory import MemoryStorage
-from datetime import datetime
-import asyncio
-from sqlalchemy import Column, Integer, String
+from aiogram.types import FSInputFile
+from datetime import datetime, timedelta
+from itertools import islice
 
+from sqlalchemy import func, select
+
+from app.core import posters, recurrence
 from app.core.config import settings
-from app.database.database import get_db
+from app.database.database import SessionLocal, get_db
+from app.database import dedupe, geo, read_models
 from app.models.event import Event
 from app.models.promotion import Promotion
-from app.models.feedback import Feedback
 from app.models.favorite import Favorite
 from app.models.subscriber import Subscriber
-from app.models.base import BaseModel
-
-CATEGORIES = [
-    "Вечеринка",
-    "Концерт",
-    "Встреча",
-    "Акция",
-    "Другое"
-]
-
-# Модель для хранения языка пользователя
-class UserLang(BaseModel):
-    __tablename__ = "user_langs"
-    user_id = Column(Integer, unique=True, nullable=False)
-    lang = Column(String(5), default="ru")
-
-# Словари переводов
-TRANSLATIONS = {
-    "ru": {
-        "welcome": "Привет! 👋\nТы в боте Sxodim.Aktau — афише самых интересных мероприятий в городе Актау 🇰🇿\n\n📆 Тут ты найдёшь:\n— ближайшие вечеринки, концерты и встречи\n— акции в кафе, ресторанах и местах отдыха\n— полезную информацию и обратную связь\n\nКоманды, которые тебе доступны:\n/upcoming_event — ближайшие мероприятия\n/promotions_in_public_catering — акции в заведениях\n/feedback — оставить отзыв\n/help — помощь и справка\n\nОставайся с нами и не пропусти ничего интересного! 🎊",
-        "choose_lang": "Выберите язык / Тілді таңдаңыз / Select language:",
-        "lang_set": "Язык успешно изменён!"
-    },
-    "kz": {
-        "welcome": "Сәлем! 👋\nСен Sxodim.Aktau ботындасың — Ақтаудағы ең қызықты іс-шаралардың афишасы 🇰🇿\n\n📆 Мұнда сен табасың:\n— жақын кештер, концерттер және кездесулер\n— дәмханалар мен мейрамханалардағы акциялар\n— пайдалы ақпарат және кері байланыс\n\nҚол жетімді командалар:\n/upcoming_event — жақын іс-шаралар\n/promotions_in_public_catering — акциялар\n/feedback — пікір қалдыру\n/help — көмек және анықтама\n\nБізбен бірге бол және ештеңені жіберіп алма! 🎊",
-        "choose_lang": "Выберите язык / Тілді таңдаңыз / Select language:",
-        "lang_set": "Тіл сәтті өзгертілді!"
-    },
-    "en": {
-        "welcome": "Hi! 👋\nYou are in Sxodim.Aktau bot — the poster of the most interesting events in Aktau 🇰🇿\n\n📆 Here you will find:\n— upcoming parties, concerts and meetings\n— promotions in cafes, restaurants and leisure places\n— useful information and feedback\n\nAvailable commands:\n/upcoming_event — upcoming events\n/promotions_in_public_catering — promotions\n/feedback — leave feedback\n/help — help and info\n\nStay with us and don't miss anything interesting! 🎊",
-        "choose_lang": "Выберите язык / Тілді таңдаңыз / Select language:",
-        "lang_set": "Language changed successfully!"
-    }
-}
-
-LANGS = [
-    ("Русский", "ru"),
-    ("Қазақша", "kz"),
-    ("English", "en")
-]
-
-# Initialize bot and dispatcher
-bot = Bot(token=settings.BOT_TOKEN)
-storage = MemoryStorage()
-dp = Dispatcher(storage=storage)
+from app.models.broadcast import BroadcastJob
+from app.models.digest import DIGEST_FREQUENCIES, DigestPreference, change_log_head, next_send_at
+from app.models.user_lang import UserLang
+from app.models.venue import Venue
+from app.bot.users import get_user_city, get_user_lang, set_user_city, set_user_lang, write_behind
+from app.bot.middlewares import UpdateTracker
+from app.bot.recorder import UpdateRecorder, track_handlers
+from app.bot.routing import ButtonRouter, HasLocation, IndexedStorage, TextIn
+from app.bot.cards import CAPTION_LIMIT, admin_event_keyboard, format_digest, format_event, event_keyboard
+from app.bot.i18n import CATALOG, CATEGORY_BY_LABEL, DEFAULT_LANG, t
+from app.bot.keyboards import CITY_KEYBOARD, keyboards
+from app.bot import date_picker
+from app.bot import inline
+
+# Хендлеры регистрируются на роутерах; Bot и Dispatcher создаются фабриками при запуске
+router = Router()
+# Reply-кнопки главного меню и режимов поиска; подписи на всех языках
+buttons = ButtonRouter(name="buttons")
+# Шаги поиска срабатывают только в своих состояниях SearchStates
+search_router = Router(name="search")
 
 # States
 class EventStates(StatesGroup):
     waiting_for_title = State()
     waiting_for_description = State()
     waiting_for_date = State()
+    waiting_for_recurrence = State()
     waiting_for_location = State()
+    confirm_duplicate = State()
+    waiting_for_poster = State()
 
 class PromotionStates(StatesGroup):
     waiting_for_title = State()
@@ -74,6 +54,11 @@ class PromotionStates(StatesGroup):
     waiting_for_venue = State()
     waiting_for_dates = State()
 
+class SearchStates(StatesGroup):
+    choose_mode = State()
+    wait_date = State()
+    wait_category = State()
+
 class FeedbackStates(StatesGroup):
     waiting_for_message = State()
 
@@ -89,529 +74,755 @@ class EditPromoStates(StatesGroup):
     promo_id = State()
     field = State()
 
-USER_MENU = ReplyKeyboardMarkup(
-    keyboard=[
-        [KeyboardButton(text="Ближайшие мероприятия"), KeyboardButton(text="Акции")],
-        [KeyboardButton(text="Поиск"), KeyboardButton(text="Избранное")],
-        [KeyboardButton(text="Оставить отзыв"), KeyboardButton(text="Помощь")],
-        [KeyboardButton(text="Язык")]
-    ],
-    resize_keyboard=True
-)
-
-ADMIN_MENU = ReplyKeyboardMarkup(
-    keyboard=[
-        [KeyboardButton(text="Ближайшие мероприятия"), KeyboardButton(text="Акции")],
-        [KeyboardButton(text="Поиск"), KeyboardButton(text="Избранное")],
-        [KeyboardButton(text="Оставить отзыв"), KeyboardButton(text="Помощь")],
-        [KeyboardButton(text="Язык")],
-        [KeyboardButton(text="Админ-панель"), KeyboardButton(text="Статистика")],
-        [KeyboardButton(text="Рассылка")]
-    ],
-    resize_keyboard=True
-)
+def main_menu(user_id, lang):
+    kb = keyboards(lang)
+    return kb.admin_menu if user_id in settings.get_admin_ids() else kb.user_menu
+
+# file_id постеров, загруженных этим процессом: до записи в базу (и на отстающей реплике)
+poster_file_ids = {}
+
+def remember_poster_file_id(event_id, version, file_id):
+    poster_file_ids[event_id, version] = file_id
+    with SessionLocal(primary=True) as db:
+        # Без ORM: file_id — деталь Telegram, в журнал синхронизации не попадает
+        db.execute(
+            Event.__table__.update()
+            .where(Event.id == event_id, Event.poster_version == version)
+            .values(poster_file_id=file_id)
+        )
+        db.commit()
+
+async def send_event_card(message: types.Message, event, lang=DEFAULT_LANG, reply_markup=None):
+    text = format_event(event, lang)
+    file_id = event.poster_file_id or poster_file_ids.get((event.id, event.poster_version))
+    path = posters.poster_file(event.id, event.poster_version, "original") if event.poster_version else None
+    if file_id is None and (path is None or not path.exists()):
+        await message.answer(text, reply_markup=reply_markup)
+        return
+    # Файл уходит в Telegram один раз; дальше карточки отправляются по file_id
+    photo = file_id or FSInputFile(path)
+    if len(text) <= CAPTION_LIMIT:
+        sent = await message.answer_photo(photo, caption=text, reply_markup=reply_markup)
+    else:
+        sent = await message.answer_photo(photo)
+        await message.answer(text, reply_markup=reply_markup)
+    if file_id is None and sent and sent.photo:
+        remember_poster_file_id(event.id, event.poster_version, sent.photo[-1].file_id)
+
+async def send_events(message: types.Message, events, lang=DEFAULT_LANG, keyboard=event_keyboard):
+    for event in events:
+        await send_event_card(message, event, lang, keyboard(event, lang))
+
+def format_promotion(promotion, lang, key="promotion_card"):
+    return t(
+        lang, key,
+        title=promotion.title,
+        description=promotion.description,
+        venue=promotion.venue,
+        end_date=promotion.end_date.strftime('%d.%m.%Y'),
+    )
+
+def find_venue_id(db, name):
+    if not name:
+        return None
+    return db.query(Venue.id).filter(Venue.name == name.strip()).scalar()
+
+# Геопозиция из кнопки «Рядом со мной»
+@router.message(HasLocation())
+async def nearby(message: types.Message):
+    lang = get_user_lang(message.from_user.id)
+    lat, lon = message.location.latitude, message.location.longitude
+    radius = settings.NEARBY_RADIUS_KM
+    db = next(get_db())
+    events = geo.nearby_events(db, lat, lon, radius, settings.NEARBY_LIMIT)
+    promotions = geo.nearby_promotions(db, lat, lon, radius, settings.NEARBY_LIMIT)
+    if not events and not promotions:
+        await message.answer(t(lang, "nothing_nearby", radius=f"{radius:g}"))
+        return
+    for event, distance in events:
+        text = f"{format_event(event, lang)}\n\n{t(lang, 'distance', distance=f'{distance:.1f}')}"
+        await message.answer(text, reply_markup=event_keyboard(event, lang))
+    for promotion, distance in promotions:
+        await message.answer(f"{format_promotion(promotion, lang)}\n{t(lang, 'distance', distance=f'{distance:.1f}')}")
 
 # Command handlers
-@dp.message(Command("start"))
+@router.message(Command("start"))
 async def cmd_start(message: types.Message):
     lang = get_user_lang(message.from_user.id)
-    await message.answer(TRANSLATIONS[lang]["welcome"], reply_markup=ReplyKeyboardRemove())
+    await message.answer(t(lang, "welcome"), reply_markup=main_menu(message.from_user.id, lang))
 
-@dp.message(Command("help"))
+@router.message(Command("help"))
+@buttons.button("btn_help")
 async def cmd_help(message: types.Message):
-    help_text = (
-        "📚 Справка по использованию бота:\n\n"
-        "1. /upcoming_event - Показывает ближайшие мероприятия\n"
-        "2. /feedback - Позволяет оставить отзыв\n"
-        "3. /promotions_in_public_catering - Показывает акции в заведениях\n\n"
-        "Для менеджеров доступна дополнительная панель управления."
-    )
-    await message.answer(help_text)
+    await message.answer(t(get_user_lang(message.from_user.id), "help"))
 
-@dp.message(Command("upcoming_event"))
+@router.message(Command("upcoming_event"))
+@buttons.button("btn_upcoming")
 async def cmd_upcoming_events(message: types.Message):
+    lang = get_user_lang(message.from_user.id)
     db = next(get_db())
-    events = db.query(Event).filter(Event.date >= datetime.utcnow()).order_by(Event.date).limit(5).all()
+    events = read_models.upcoming_events(db, get_user_city(message.from_user.id), limit=5)
     
     if not events:
-        await message.answer("На данный момент нет предстоящих мероприятий.")
+        await message.answer(t(lang, "no_upcoming"))
         return
 
-    for event in events:
-        event_text = (
-            f"🎉 {event.title}\n\n"
-            f"📅 Дата: {event.date.strftime('%d.%m.%Y %H:%M')}\n"
-            f"📍 Место: {event.location}\n\n"
-            f"{event.description}"
-        )
-        inline_kb = InlineKeyboardMarkup(
-            inline_keyboard=[
-                [InlineKeyboardButton(text="⭐️ В избранное", callback_data=f"fav_{event.id}")],
-                [InlineKeyboardButton(text="Подробнее", callback_data=f"details_{event.id}")],
-                [InlineKeyboardButton(text="Поделиться", switch_inline_query=event.title)]
-            ]
-        )
-        await message.answer(event_text, reply_markup=inline_kb)
+    await send_events(message, events, lang)
 
-@dp.message(Command("feedback"))
+@router.message(Command("feedback"))
+@buttons.button("btn_feedback")
 async def cmd_feedback(message: types.Message, state: FSMContext):
-    await message.answer("Пожалуйста, напишите ваш отзыв или предложение:")
+    await message.answer(t(get_user_lang(message.from_user.id), "feedback_prompt"))
     await state.set_state(FeedbackStates.waiting_for_message)
 
-@dp.message(FeedbackStates.waiting_for_message)
+@router.message(StateFilter(FeedbackStates.waiting_for_message), F.text)
 async def process_feedback(message: types.Message, state: FSMContext):
-    db = next(get_db())
-    feedback = Feedback(user_id=message.from_user.id, message=message.text)
-    db.add(feedback)
-    db.commit()
-    await message.answer("Спасибо за ваш отзыв! 🙏")
+    write_behind.add_feedback(message.from_user.id, message.text)
+    await message.answer(t(get_user_lang(message.from_user.id), "feedback_thanks"))
     await state.clear()
 
-@dp.message(Command("promotions_in_public_catering"))
+@router.message(Command("promotions_in_public_catering"))
+@buttons.button("btn_promotions")
 async def cmd_promotions(message: types.Message):
+    lang = get_user_lang(message.from_user.id)
     db = next(get_db())
-    promotions = db.query(Promotion).filter(Promotion.is_active == True).all()
+    promotions = read_models.active_promotions(db, get_user_city(message.from_user.id))
     
     if not promotions:
-        await message.answer("На данный момент нет активных акций.")
+        await message.answer(t(lang, "no_promotions"))
         return
 
     for promotion in promotions:
-        promotion_text = (
-            f"🏷 {promotion.title}\n\n"
-            f"📝 {promotion.description}\n"
-            f"🏪 Место: {promotion.location}\n"
-            f"📅 Действует до: {promotion.end_date.strftime('%d.%m.%Y')}"
-        )
-        await message.answer(promotion_text)
+        await message.answer(format_promotion(promotion, lang))
 
-@dp.message(Command("admin"))
+@router.message(Command("admin"))
+@buttons.button("btn_admin_panel")
 async def cmd_admin(message: types.Message):
+    lang = get_user_lang(message.from_user.id)
     if message.from_user.id not in settings.get_admin_ids():
-        await message.answer("У вас нет доступа к админ-панели.")
-        return
-
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="➕ Добавить мероприятие", callback_data="add_event"),
-            InlineKeyboardButton(text="➕ Добавить акцию", callback_data="add_promotion")
-        ],
-        [
-            InlineKeyboardButton(text="📋 Список мероприятий", callback_data="list_events"),
-            InlineKeyboardButton(text="📋 Список акций", callback_data="list_promotions")
-        ]
-    ])
-    
-    await message.answer("Панель управления:", reply_markup=keyboard)
+        await message.answer(t(lang, "no_admin_access"))
+        return
+
+    await message.answer(t(lang, "admin_panel"), reply_markup=keyboards(lang).admin_panel)
 
-@dp.message(Command("search"))
+@router.message(Command("search"))
+@buttons.button("btn_search")
 async def cmd_search(message: types.Message, state: FSMContext):
-    # Клавиатура для выбора поиска
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text="Поиск по дате")],
-            [KeyboardButton(text="Поиск по категории")]
-        ],
-        resize_keyboard=True
-    )
-    await message.answer("Как вы хотите искать мероприятие?", reply_markup=keyboard)
-    await state.set_state("search:choose_mode")
+    lang = get_user_lang(message.from_user.id)
+    await message.answer(t(lang, "search_mode_prompt"), reply_markup=keyboards(lang).search_mode)
+    await state.set_state(SearchStates.choose_mode)
 
-@dp.message(lambda m: m.text == "Поиск по дате")
+@buttons.button("btn_search_date")
 async def search_by_date(message: types.Message, state: FSMContext):
-    await message.answer("Введите дату в формате ДД.ММ.ГГГГ:", reply_markup=ReplyKeyboardMarkup(keyboard=[[KeyboardButton(text="Меню")]], resize_keyboard=True))
-    await state.set_state("search:wait_date")
+    lang = get_user_lang(message.from_user.id)
+    today = datetime.utcnow().date()
+    city = get_user_city(message.from_user.id)
+    await message.answer(
+        t(lang, "calendar_prompt"), reply_markup=calendar_markup(city, today.year, today.month, lang),
+    )
+    await state.set_state(SearchStates.wait_date)
 
-@dp.message(lambda m: m.text == "Поиск по категории")
+@buttons.button("btn_search_category")
 async def search_by_category(message: types.Message, state: FSMContext):
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[[KeyboardButton(text=cat)] for cat in CATEGORIES] + [[KeyboardButton(text="Меню")]],
-        resize_keyboard=True
-    )
-    await message.answer("Выберите категорию:", reply_markup=keyboard)
-    await state.set_state("search:wait_category")
+    lang = get_user_lang(message.from_user.id)
+    await message.answer(t(lang, "category_prompt"), reply_markup=keyboards(lang).categories)
+    await state.set_state(SearchStates.wait_category)
 
-@dp.message(lambda m: m.text == "Меню")
-async def back_to_menu(message: types.Message):
+@buttons.button("btn_menu")
+async def back_to_menu(message: types.Message, state: FSMContext):
     lang = get_user_lang(message.from_user.id)
-    await message.answer("Главное меню:", reply_markup=ReplyKeyboardRemove())
+    await state.clear()
+    await message.answer(t(lang, "main_menu"), reply_markup=main_menu(message.from_user.id, lang))
 
-@dp.message(lambda m: m.text in CATEGORIES)
-async def process_search_category(message: types.Message, state: FSMContext):
-    category = message.text
+# Клавиатура категорий остаётся на экране, поэтому состояние не сбрасываем
+@search_router.message(StateFilter(SearchStates.wait_category), TextIn(CATEGORY_BY_LABEL))
+async def process_search_category(message: types.Message):
+    lang = get_user_lang(message.from_user.id)
+    category = CATEGORY_BY_LABEL[message.text]
     db = next(get_db())
-    events = db.query(Event).filter(Event.description.ilike(f"%{category}%")).all()
+    events = read_models.events_by_category(db, get_user_city(message.from_user.id), category)
     if not events:
-        await message.answer("Мероприятий по выбранной категории не найдено.")
+        await message.answer(t(lang, "no_category_events"))
     else:
-        for event in events:
-            event_text = (
-                f"🎉 {event.title}\n\n"
-                f"📅 Дата: {event.date.strftime('%d.%m.%Y %H:%M')}\n"
-                f"📍 Место: {event.location}\n\n"
-                f"{event.description}"
-            )
-            inline_kb = InlineKeyboardMarkup(
-                inline_keyboard=[
-                    [InlineKeyboardButton(text="⭐️ В избранное", callback_data=f"fav_{event.id}")],
-                    [InlineKeyboardButton(text="Подробнее", callback_data=f"details_{event.id}")],
-                    [InlineKeyboardButton(text="Поделиться", switch_inline_query=event.title)]
-                ]
-            )
-            await message.answer(event_text, reply_markup=inline_kb)
-    await state.clear()
+        await send_events(message, events, lang)
 
-@dp.message()
+@search_router.message(StateFilter(SearchStates.wait_date), F.text)
 async def process_search_date(message: types.Message, state: FSMContext):
-    current_state = await state.get_state()
-    if current_state == "search:wait_date":
-        try:
-            date = datetime.strptime(message.text, "%d.%m.%Y")
-        except ValueError:
-            await message.answer("Неверный формат даты. Введите в формате ДД.ММ.ГГГГ:")
-            return
-        db = next(get_db())
-        events = db.query(Event).filter(Event.date >= date, Event.date < date.replace(hour=23, minute=59, second=59)).all()
-        if not events:
-            await message.answer("Мероприятий на эту дату не найдено.")
-        else:
-            for event in events:
-                event_text = (
-                    f"🎉 {event.title}\n\n"
-                    f"📅 Дата: {event.date.strftime('%d.%m.%Y %H:%M')}\n"
-                    f"📍 Место: {event.location}\n\n"
-                    f"{event.description}"
-                )
-                inline_kb = InlineKeyboardMarkup(
-                    inline_keyboard=[
-                        [InlineKeyboardButton(text="⭐️ В избранное", callback_data=f"fav_{event.id}")],
-                        [InlineKeyboardButton(text="Подробнее", callback_data=f"details_{event.id}")],
-                        [InlineKeyboardButton(text="Поделиться", switch_inline_query=event.title)]
-                    ]
-                )
-                await message.answer(event_text, reply_markup=inline_kb)
-        await state.clear()
+    lang = get_user_lang(message.from_user.id)
+    try:
+        date = datetime.strptime(message.text, "%d.%m.%Y")
+    except ValueError:
+        await message.answer(t(lang, "invalid_date"))
+        return
+    db = next(get_db())
+    events = read_models.events_between(db, get_user_city(message.from_user.id), date, date + timedelta(days=1))
+    if not events:
+        await message.answer(t(lang, "no_date_events"))
+    else:
+        await send_events(message, events, lang)
+    await state.clear()
+
+def calendar_markup(city, year, month, lang):
+    db = next(get_db())
+    start, end = date_picker.month_bounds(year, month)
+    days = read_models.event_days(db, city, start, end)
+    return date_picker.build_calendar(year, month, days, datetime.utcnow().date(), lang)
+
+@search_router.callback_query(F.data == date_picker.NOOP)
+async def calendar_noop(callback_query: types.CallbackQuery):
+    await callback_query.answer()
+
+@search_router.callback_query(F.data.startswith("cal_month_"))
+async def calendar_month(callback_query: types.CallbackQuery):
+    lang = get_user_lang(callback_query.from_user.id)
+    year, month = map(int, callback_query.data.removeprefix("cal_month_").split("-"))
+    city = get_user_city(callback_query.from_user.id)
+    await callback_query.message.edit_reply_markup(reply_markup=calendar_markup(city, year, month, lang))
+    await callback_query.answer()
+
+@search_router.callback_query(F.data.startswith("cal_day_"))
+async def calendar_day(callback_query: types.CallbackQuery, state: FSMContext):
+    lang = get_user_lang(callback_query.from_user.id)
+    day = datetime.strptime(callback_query.data.removeprefix("cal_day_"), "%Y-%m-%d")
+    db = next(get_db())
+    events = read_models.events_between(db, get_user_city(callback_query.from_user.id), day, day + timedelta(days=1))
+    await callback_query.answer()
+    if not events:
+        await callback_query.message.answer(t(lang, "no_date_events"))
+    else:
+        await send_events(callback_query.message, events, lang)
+    await state.clear()
+
+@search_router.callback_query(F.data.in_({"cal_weekend", "cal_week"}))
+async def calendar_range(callback_query: types.CallbackQuery, state: FSMContext):
+    lang = get_user_lang(callback_query.from_user.id)
+    now = datetime.utcnow()
+    if callback_query.data == "cal_weekend":
+        start, end = date_picker.weekend_range(now)
+    else:
+        start, end = date_picker.next_days_range(now)
+    db = next(get_db())
+    events = read_models.events_between(db, get_user_city(callback_query.from_user.id), start, end)
+    await callback_query.answer()
+    if not events:
+        await callback_query.message.answer(t(lang, "no_range_events"))
+    else:
+        await send_events(callback_query.message, events, lang)
+    await state.clear()
 
-@dp.message(Command("subscribe"))
+@router.message(Command("subscribe"))
 async def cmd_subscribe(message: types.Message):
+    lang = get_user_lang(message.from_user.id)
     db = next(get_db())
     user_id = message.from_user.id
-    exists = db.query(Subscriber).filter_by(user_id=user_id).first()
+    exists = write_behind.is_subscribed(user_id) or db.query(Subscriber.id).filter_by(user_id=user_id).first()
     if not exists:
-        db.add(Subscriber(user_id=user_id))
-        db.commit()
-        await message.answer("Вы подписались на уведомления о новых мероприятиях!")
+        write_behind.add_subscriber(user_id, get_user_city(user_id))
+        await message.answer(t(lang, "subscribed"))
     else:
-        await message.answer("Вы уже подписаны на уведомления.")
+        await message.answer(t(lang, "already_subscribed"))
 
-@dp.message(Command("favorites"))
+@router.message(Command("digest"))
+async def cmd_digest(message: types.Message):
+    lang = get_user_lang(message.from_user.id)
+    db = next(get_db(primary=True))
+    frequency = db.scalar(select(DigestPreference.frequency).where(DigestPreference.user_id == message.from_user.id))
+    current = t(lang, f"btn_digest_{frequency or 'off'}")
+    await message.answer(t(lang, "digest_prompt", current=current), reply_markup=keyboards(lang).digest_frequency)
+
+@router.callback_query(F.data.in_({f"digest_{frequency}" for frequency in DIGEST_FREQUENCIES}))
+async def process_digest_frequency(callback_query: types.CallbackQuery):
+    frequency = callback_query.data.split("_", 1)[1]
+    user_id = callback_query.from_user.id
+    lang = get_user_lang(user_id)
+    now = datetime.utcnow()
+    db = next(get_db(primary=True))
+    preference = db.scalar(select(DigestPreference).where(DigestPreference.user_id == user_id))
+    if preference is None:
+        # Первый дайджест — только о том, что появится после включения
+        preference = DigestPreference(user_id=user_id, cursor=change_log_head(db.connection()))
+        db.add(preference)
+    preference.frequency = frequency
+    preference.next_send_at = next_send_at(frequency, now)
+    db.commit()
+    await callback_query.answer()
+    await callback_query.message.edit_reply_markup(reply_markup=None)
+    await callback_query.message.answer(t(lang, "digest_saved", current=t(lang, f"btn_digest_{frequency}")))
+
+# Листание дайджеста: страница собирается заново по диапазону журнала из callback_data
+@router.callback_query(F.data.startswith("dg_"))
+async def process_digest_page(callback_query: types.CallbackQuery):
+    after_seq, until_seq, page = map(int, callback_query.data.split("_")[1:])
+    user_id = callback_query.from_user.id
+    lang = get_user_lang(user_id)
+    db = next(get_db())
+    items = read_models.digest_items(db, get_user_city(user_id), after_seq, until_seq)
+    await callback_query.answer()
+    if not items:
+        await callback_query.message.answer(t(lang, "digest_empty"))
+        return
+    text, markup = format_digest(items, page, lang, after_seq, until_seq)
+    await callback_query.message.edit_text(text, reply_markup=markup)
+
+@router.message(Command("favorites"))
+@buttons.button("btn_favorites")
 async def cmd_favorites(message: types.Message):
+    lang = get_user_lang(message.from_user.id)
+    # Только что добавленное могло ещё не дойти до базы
+    if write_behind.has_pending_favorites(message.from_user.id):
+        await write_behind.flush()
+    db = next(get_db(primary=True))
+    events = read_models.favorite_events(db, message.from_user.id)
+    if not events:
+        await message.answer(t(lang, "no_favorites"))
+        return
+    for event in events:
+        await send_event_card(message, event, lang)
+
+@router.message(Command("foryou"))
+@buttons.button("btn_for_you")
+async def cmd_for_you(message: types.Message):
+    lang = get_user_lang(message.from_user.id)
+    db = next(get_db())
+    # Подборку заранее считает app/jobs/recommendations.py — здесь только чтение
+    user_id = message.from_user.id
+    events = read_models.recommended_events(db, user_id, get_user_city(user_id), settings.FOR_YOU_LIMIT)
+    if not events:
+        await message.answer(t(lang, "no_recommendations"))
+        return
+    await message.answer(t(lang, "for_you_title"))
+    await send_events(message, events, lang)
+
+@router.message(Command("popular"))
+@buttons.button("btn_popular")
+async def cmd_popular(message: types.Message):
+    lang = get_user_lang(message.from_user.id)
     db = next(get_db())
-    favs = db.query(Favorite).filter_by(user_id=message.from_user.id).all()
-    if not favs:
-        await message.answer("У вас пока нет избранных мероприятий.")
-        return
-    for fav in favs:
-        event = db.query(Event).filter_by(id=fav.event_id).first()
-        if event:
-            event_text = (
-                f"🎉 {event.title}\n\n"
-                f"📅 Дата: {event.date.strftime('%d.%m.%Y %H:%M')}\n"
-                f"📍 Место: {event.location}\n\n"
-                f"{event.description}"
-            )
-            await message.answer(event_text)
-
-@dp.message(Command("broadcast"))
-async def cmd_broadcast(message: types.Message, command: CommandObject):
+    # Рейтинг поддерживается при записи действий (app/models/popularity.py) — здесь чтение по индексу
+    events = read_models.popular_events(db, get_user_city(message.from_user.id), settings.POPULAR_LIMIT)
+    if not events:
+        await message.answer(t(lang, "no_popular"))
+        return
+    await message.answer(t(lang, "popular_title"))
+    await send_events(message, events, lang)
+
+@router.message(Command("broadcast"))
+@buttons.button("btn_broadcast")
+async def cmd_broadcast(message: types.Message, command: CommandObject = None):
+    lang = get_user_lang(message.from_user.id)
     if message.from_user.id not in settings.get_admin_ids():
-        await message.answer("У вас нет доступа к этой команде.")
+        await message.answer(t(lang, "no_command_access"))
         return
-    text = command.args or None
+    # С кнопки приходит без аргументов — показываем подсказку
+    text = command.args if command else None
     if not text:
-        await message.answer("Введите текст рассылки после команды, например: /broadcast Сегодня новое мероприятие!")
+        await message.answer(t(lang, "broadcast_usage"))
         return
-    db = next(get_db())
-    subscribers = db.query(Subscriber).all()
-    count = 0
-    for sub in subscribers:
-        try:
-            await bot.send_message(sub.user_id, f"📢 {text}")
-            count += 1
-        except Exception:
-            pass
-    await message.answer(f"Рассылка отправлена {count} подписчикам.")
+    city = get_user_city(message.from_user.id)
+    db = next(get_db(primary=True))
+    # Отправкой занимается процесс фоновых задач (app/jobs); получатели — подписчики города админа
+    db.add(BroadcastJob(text=text, created_by=message.from_user.id, city=city))
+    db.commit()
+    await message.answer(t(lang, "broadcast_queued", city=settings.get_cities()[city]))
 
-@dp.message(Command("faq"))
+@router.message(Command("faq"))
 async def cmd_faq(message: types.Message):
-    faq_text = (
-        "❓ <b>Часто задаваемые вопросы</b>\n\n"
-        "<b>Как добавить мероприятие?</b>\n"
-        "— Только администратор может добавлять мероприятия через /admin.\n\n"
-        "<b>Как попасть в избранное?</b>\n"
-        "— Нажмите ⭐️ под интересующим мероприятием.\n\n"
-        "<b>Как подписаться на рассылку?</b>\n"
-        "— Используйте команду /subscribe.\n\n"
-        "<b>Как связаться с поддержкой?</b>\n"
-        "— Используйте команду /contact."
-    )
-    await message.answer(faq_text, parse_mode="HTML")
+    await message.answer(t(get_user_lang(message.from_user.id), "faq"), parse_mode="HTML")
 
-@dp.message(Command("contact"))
+@router.message(Command("contact"))
 async def cmd_contact(message: types.Message):
-    await message.answer("📞 Для связи с поддержкой напишите: @your_support_username или на email: support@example.com")
+    await message.answer(t(get_user_lang(message.from_user.id), "contact"))
 
-@dp.message(Command("language"))
+@router.message(Command("language"))
+@buttons.button("btn_language")
 async def cmd_language(message: types.Message):
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text=title, callback_data=f"lang_{code}")] for title, code in LANGS
-        ]
-    )
-    await message.answer(TRANSLATIONS["ru"]["choose_lang"], reply_markup=keyboard)
+    lang = get_user_lang(message.from_user.id)
+    await message.answer(t(lang, "choose_lang"), reply_markup=keyboards(lang).languages)
 
-@dp.callback_query(lambda c: c.data.startswith("lang_"))
+@router.callback_query(lambda c: c.data.startswith("lang_"))
 async def set_language(callback_query: types.CallbackQuery):
     lang = callback_query.data.split("_", 1)[1]
-    db = next(get_db())
+    if lang not in CATALOG:
+        await callback_query.answer()
+        return
     user_id = callback_query.from_user.id
-    user_lang = db.query(UserLang).filter_by(user_id=user_id).first()
-    if not user_lang:
-        db.add(UserLang(user_id=user_id, lang=lang))
-    else:
-        user_lang.lang = lang
-    db.commit()
-    await callback_query.answer(TRANSLATIONS[lang]["lang_set"])
+    set_user_lang(user_id, lang)
+    await callback_query.answer(t(lang, "lang_set"))
+    await callback_query.message.answer(t(lang, "main_menu"), reply_markup=main_menu(user_id, lang))
 
-@dp.message(Command("stats"))
+@router.message(Command("city"))
+@buttons.button("btn_city")
+async def cmd_city(message: types.Message):
+    lang = get_user_lang(message.from_user.id)
+    await message.answer(
+        t(lang, "choose_city", city=settings.get_cities()[get_user_city(message.from_user.id)]),
+        reply_markup=CITY_KEYBOARD,
+    )
+
+@router.callback_query(F.data.startswith("city_"))
+async def set_city(callback_query: types.CallbackQuery):
+    city = callback_query.data.removeprefix("city_")
+    cities = settings.get_cities()
+    if city not in cities:
+        await callback_query.answer()
+        return
+    user_id = callback_query.from_user.id
+    set_user_city(user_id, city)
+    lang = get_user_lang(user_id)
+    await callback_query.answer()
+    await callback_query.message.answer(
+        t(lang, "city_set", city=cities[city]), reply_markup=main_menu(user_id, lang),
+    )
+
+@router.message(Command("stats"))
+@buttons.button("btn_stats")
 async def cmd_stats(message: types.Message):
+    lang = get_user_lang(message.from_user.id)
     if message.from_user.id not in settings.get_admin_ids():
-        await message.answer("У вас нет доступа к этой команде.")
+        await message.answer(t(lang, "no_command_access"))
         return
+    city = get_user_city(message.from_user.id)
     db = next(get_db())
-    users = db.query(UserLang).count()
-    subscribers = db.query(Subscriber).count()
-    events = db.query(Event).count()
-    promotions = db.query(Promotion).count()
-    favorites = db.query(Favorite).count()
-    text = (
-        f"📊 <b>Статистика</b>\n\n"
-        f"👤 Пользователей: <b>{users}</b>\n"
-        f"🔔 Подписчиков: <b>{subscribers}</b>\n"
-        f"🎉 Мероприятий: <b>{events}</b>\n"
-        f"🎁 Акций: <b>{promotions}</b>\n"
-        f"⭐️ Избранных: <b>{favorites}</b>"
+    # Счётчики по городу админа; каждый идёт по индексу, который начинается с city
+    def count(model):
+        return db.scalar(select(func.count()).select_from(model).where(model.city == city))
+    text = t(
+        lang, "stats",
+        city=settings.get_cities()[city],
+        users=count(UserLang),
+        subscribers=count(Subscriber),
+        events=count(Event),
+        promotions=count(Promotion),
+        favorites=db.scalar(
+            select(func.count()).select_from(Favorite)
+            .join(Event, Event.id == Favorite.event_id)
+            .where(Event.city == city)
+        ),
     )
     await message.answer(text, parse_mode="HTML")
 
 # Event handlers
-@dp.callback_query(lambda c: c.data == "add_event")
+@router.callback_query(lambda c: c.data == "add_event")
 async def process_add_event(callback_query: types.CallbackQuery, state: FSMContext):
+    lang = get_user_lang(callback_query.from_user.id)
     if callback_query.from_user.id not in settings.get_admin_ids():
-        await callback_query.answer("У вас нет доступа к этой функции.")
+        await callback_query.answer(t(lang, "no_function_access"))
         return
     
-    await callback_query.message.answer("Введите название мероприятия:")
+    await callback_query.message.answer(t(lang, "event_title_prompt"))
     await state.set_state(EventStates.waiting_for_title)
 
-@dp.message(EventStates.waiting_for_title)
+@router.message(StateFilter(EventStates.waiting_for_title))
 async def process_event_title(message: types.Message, state: FSMContext):
     await state.update_data(title=message.text)
-    await message.answer("Введите описание мероприятия:")
+    await message.answer(t(get_user_lang(message.from_user.id), "event_description_prompt"))
     await state.set_state(EventStates.waiting_for_description)
 
-@dp.message(EventStates.waiting_for_description)
+@router.message(StateFilter(EventStates.waiting_for_description))
 async def process_event_description(message: types.Message, state: FSMContext):
     await state.update_data(description=message.text)
-    await message.answer("Введите дату и время мероприятия (в формате ДД.ММ.ГГГГ ЧЧ:ММ):")
+    await message.answer(t(get_user_lang(message.from_user.id), "event_date_prompt"))
     await state.set_state(EventStates.waiting_for_date)
 
-@dp.message(EventStates.waiting_for_date)
+@router.message(StateFilter(EventStates.waiting_for_date))
 async def process_event_date(message: types.Message, state: FSMContext):
+    lang = get_user_lang(message.from_user.id)
     try:
         date = datetime.strptime(message.text, "%d.%m.%Y %H:%M")
         await state.update_data(date=date)
-        await message.answer("Введите место проведения мероприятия:")
-        await state.set_state(EventStates.waiting_for_location)
+        await message.answer(t(lang, "recurrence_prompt"), reply_markup=keyboards(lang).recurrence)
+        await state.set_state(EventStates.waiting_for_recurrence)
     except ValueError:
-        await message.answer("Неверный формат даты. Пожалуйста, используйте формат ДД.ММ.ГГГГ ЧЧ:ММ")
+        await message.answer(t(lang, "invalid_datetime"))
+
+# Дата уже введена — она станет первым повторением серии
+@router.callback_query(StateFilter(EventStates.waiting_for_recurrence), F.data.startswith("rec_"))
+async def process_event_recurrence(callback_query: types.CallbackQuery, state: FSMContext):
+    frequency = callback_query.data.split("_", 1)[1]
+    await callback_query.answer()
+    await callback_query.message.edit_reply_markup(reply_markup=None)
+    await state.update_data(rrule=None if frequency == "once" else f"FREQ={frequency}")
+    await callback_query.message.answer(t(get_user_lang(callback_query.from_user.id), "event_location_prompt"))
+    await state.set_state(EventStates.waiting_for_location)
+
+@router.message(StateFilter(EventStates.waiting_for_recurrence))
+async def process_event_rrule(message: types.Message, state: FSMContext):
+    lang = get_user_lang(message.from_user.id)
+    try:
+        rule = recurrence.normalize_rule(message.text or "")
+    except ValueError:
+        await message.answer(t(lang, "invalid_rrule"), reply_markup=keyboards(lang).recurrence)
+        return
+    await state.update_data(rrule=rule)
+    await message.answer(t(lang, "event_location_prompt"))
+    await state.set_state(EventStates.waiting_for_location)
 
-@dp.message(EventStates.waiting_for_location)
-async def process_event_location(message: types.Message, state: FSMContext):
+async def save_event(message: types.Message, state: FSMContext, user_id: int):
     data = await state.get_data()
-    db = next(get_db())
+    db = next(get_db(primary=True))
     
     event = Event(
         title=data['title'],
         description=data['description'],
         date=data['date'],
-        location=message.text
+        rrule=data.get('rrule'),
+        location=data['location'],
+        venue_id=find_venue_id(db, data['location']),
+        city=get_user_city(user_id),
     )
     
     db.add(event)
     db.commit()
     
-    await message.answer("✅ Мероприятие успешно добавлено!")
+    lang = get_user_lang(user_id)
+    await message.answer(t(lang, "event_added"))
+    await state.clear()
+    await state.update_data(poster_event_id=event.id)
+    await message.answer(t(lang, "poster_prompt"))
+    await state.set_state(EventStates.waiting_for_poster)
+
+@router.message(StateFilter(EventStates.waiting_for_location))
+async def process_event_location(message: types.Message, state: FSMContext):
+    await state.update_data(location=message.text)
+    data = await state.get_data()
+    user_id = message.from_user.id
+    db = next(get_db(primary=True))
+    # Другой админ или API могли уже добавить это мероприятие — спрашиваем, прежде чем создавать
+    duplicate_id = dedupe.find_duplicate(db, get_user_city(user_id), data['date'], data['title'])
+    duplicate = db.get(Event, duplicate_id) if duplicate_id is not None else None
+    if duplicate is None:
+        await save_event(message, state, user_id)
+        return
+    lang = get_user_lang(user_id)
+    await message.answer(t(lang, "duplicate_found"))
+    await send_event_card(message, duplicate, lang)
+    await message.answer(t(lang, "duplicate_confirm"), reply_markup=keyboards(lang).duplicate_confirm)
+    await state.set_state(EventStates.confirm_duplicate)
+
+@router.callback_query(StateFilter(EventStates.confirm_duplicate), F.data.in_({"dup_add", "dup_cancel"}))
+async def process_event_duplicate(callback_query: types.CallbackQuery, state: FSMContext):
+    user_id = callback_query.from_user.id
+    await callback_query.answer()
+    await callback_query.message.edit_reply_markup(reply_markup=None)
+    if callback_query.data == "dup_add":
+        await save_event(callback_query.message, state, user_id)
+        return
+    lang = get_user_lang(user_id)
+    await state.clear()
+    await callback_query.message.answer(t(lang, "event_not_added"), reply_markup=main_menu(user_id, lang))
+
+@router.callback_query(F.data.startswith("poster_"))
+async def process_poster_start(callback_query: types.CallbackQuery, state: FSMContext):
+    lang = get_user_lang(callback_query.from_user.id)
+    if callback_query.from_user.id not in settings.get_admin_ids():
+        await callback_query.answer(t(lang, "no_access"))
+        return
+    await state.update_data(poster_event_id=int(callback_query.data.split("_", 1)[1]))
+    await callback_query.message.answer(t(lang, "poster_prompt"))
+    await state.set_state(EventStates.waiting_for_poster)
+    await callback_query.answer()
+
+@router.message(StateFilter(EventStates.waiting_for_poster))
+async def process_event_poster(message: types.Message, state: FSMContext, bot: Bot):
+    lang = get_user_lang(message.from_user.id)
+    if message.text == "/skip":
+        await state.clear()
+        await message.answer(t(lang, "main_menu"), reply_markup=main_menu(message.from_user.id, lang))
+        return
+    if not message.photo:
+        await message.answer(t(lang, "poster_invalid"))
+        return
+    event_id = (await state.get_data())["poster_event_id"]
+    # Самый большой размер; его file_id и будет использоваться для всех отправок
+    photo = message.photo[-1]
+    data = await bot.download(photo.file_id)
+    version = await posters.store_poster(event_id, data.getvalue())
+    db = next(get_db(primary=True))
+    event = db.get(Event, event_id)
+    if event is None:
+        posters.delete_posters(event_id)
+        await message.answer(t(lang, "event_not_found"))
+    else:
+        event.poster_file_id = photo.file_id
+        event.poster_version = version
+        db.commit()
+        await message.answer(t(lang, "poster_saved"))
     await state.clear()
 
 # Promotion handlers
-@dp.callback_query(lambda c: c.data == "add_promotion")
+@router.callback_query(lambda c: c.data == "add_promotion")
 async def process_add_promotion(callback_query: types.CallbackQuery, state: FSMContext):
+    lang = get_user_lang(callback_query.from_user.id)
     if callback_query.from_user.id not in settings.get_admin_ids():
-        await callback_query.answer("У вас нет доступа к этой функции.")
+        await callback_query.answer(t(lang, "no_function_access"))
         return
     
-    await callback_query.message.answer("Введите название акции:")
+    await callback_query.message.answer(t(lang, "promo_title_prompt"))
     await state.set_state(PromotionStates.waiting_for_title)
 
-@dp.message(PromotionStates.waiting_for_title)
+@router.message(StateFilter(PromotionStates.waiting_for_title))
 async def process_promotion_title(message: types.Message, state: FSMContext):
     await state.update_data(title=message.text)
-    await message.answer("Введите описание акции:")
+    await message.answer(t(get_user_lang(message.from_user.id), "promo_description_prompt"))
     await state.set_state(PromotionStates.waiting_for_description)
 
-@dp.message(PromotionStates.waiting_for_description)
+@router.message(StateFilter(PromotionStates.waiting_for_description))
 async def process_promotion_description(message: types.Message, state: FSMContext):
     await state.update_data(description=message.text)
-    await message.answer("Введите название заведения:")
+    await message.answer(t(get_user_lang(message.from_user.id), "promo_venue_prompt"))
     await state.set_state(PromotionStates.waiting_for_venue)
 
-@dp.message(PromotionStates.waiting_for_venue)
+@router.message(StateFilter(PromotionStates.waiting_for_venue))
 async def process_promotion_venue(message: types.Message, state: FSMContext):
     await state.update_data(venue=message.text)
-    await message.answer("Введите период действия акции (например, 'до 31.12.2024'):")
+    await message.answer(t(get_user_lang(message.from_user.id), "promo_dates_prompt"))
     await state.set_state(PromotionStates.waiting_for_dates)
 
-@dp.message(PromotionStates.waiting_for_dates)
+@router.message(StateFilter(PromotionStates.waiting_for_dates))
 async def process_promotion_dates(message: types.Message, state: FSMContext):
     data = await state.get_data()
-    db = next(get_db())
+    db = next(get_db(primary=True))
     
     promotion = Promotion(
         title=data['title'],
         description=data['description'],
         venue=data['venue'],
-        valid_until=message.text
+        venue_id=find_venue_id(db, data['venue']),
+        valid_until=message.text,
+        city=get_user_city(message.from_user.id),
     )
     
     db.add(promotion)
     db.commit()
     
-    await message.answer("✅ Акция успешно добавлена!")
+    await message.answer(t(get_user_lang(message.from_user.id), "promo_added"))
     await state.clear()
 
 # List handlers
-@dp.callback_query(lambda c: c.data == "list_events")
+@router.callback_query(lambda c: c.data == "list_events")
 async def process_list_events(callback_query: types.CallbackQuery):
+    lang = get_user_lang(callback_query.from_user.id)
     if callback_query.from_user.id not in settings.get_admin_ids():
-        await callback_query.answer("У вас нет доступа к этой функции.")
+        await callback_query.answer(t(lang, "no_function_access"))
         return
-    db = next(get_db())
-    events = db.query(Event).order_by(Event.date).all()
+    db = next(get_db(primary=True))
+    events = read_models.all_events(db, get_user_city(callback_query.from_user.id))
     if not events:
-        await callback_query.message.answer("Список мероприятий пуст.")
+        await callback_query.message.answer(t(lang, "events_empty"))
         return
-    for event in events:
-        event_text = (
-            f"🎉 {event.title}\n\n"
-            f"📅 Дата: {event.date.strftime('%d.%m.%Y %H:%M')}\n"
-            f"📍 Место: {event.location}\n\n"
-            f"{event.description}"
-        )
-        inline_kb = InlineKeyboardMarkup(
-            inline_keyboard=[
-                [InlineKeyboardButton(text="⭐️ В избранное", callback_data=f"fav_{event.id}")],
-                [InlineKeyboardButton(text="Подробнее", callback_data=f"details_{event.id}")],
-                [InlineKeyboardButton(text="Поделиться", switch_inline_query=event.title)]
-            ]
-        )
-        await callback_query.message.answer(event_text, reply_markup=inline_kb)
+    await send_events(callback_query.message, events, lang, keyboard=admin_event_keyboard)
 
-@dp.callback_query(lambda c: c.data == "list_promotions")
+@router.callback_query(lambda c: c.data == "list_promotions")
 async def process_list_promotions(callback_query: types.CallbackQuery):
+    lang = get_user_lang(callback_query.from_user.id)
     if callback_query.from_user.id not in settings.get_admin_ids():
-        await callback_query.answer("У вас нет доступа к этой функции.")
+        await callback_query.answer(t(lang, "no_function_access"))
         return
-    db = next(get_db())
-    promotions = db.query(Promotion).all()
+    db = next(get_db(primary=True))
+    promotions = read_models.all_promotions(db, get_user_city(callback_query.from_user.id))
     if not promotions:
-        await callback_query.message.answer("Список акций пуст.")
+        await callback_query.message.answer(t(lang, "promotions_empty"))
         return
     for promotion in promotions:
-        promotion_text = (
-            f"🎁 {promotion.title}\n\n"
-            f"🏪 Заведение: {promotion.venue}\n"
-            f"⏰ Действует: {promotion.valid_until}\n\n"
-            f"{promotion.description}"
-        )
-        await callback_query.message.answer(promotion_text)
+        await callback_query.message.answer(format_promotion(promotion, lang, "promotion_admin_card"))
 
 # Обработчик добавления в избранное
-@dp.callback_query(lambda c: c.data.startswith("fav_"))
+@router.callback_query(lambda c: c.data.startswith("fav_"))
 async def add_to_favorites(callback_query: types.CallbackQuery):
     event_id = int(callback_query.data.split("_", 1)[1])
     db = next(get_db())
     user_id = callback_query.from_user.id
-    # Проверка на дубли
-    exists = db.query(Favorite).filter_by(user_id=user_id, event_id=event_id).first()
+    lang = get_user_lang(user_id)
+    # Проверка на дубли: сначала в буфере, затем в базе
+    exists = (
+        write_behind.has_favorite(user_id, event_id)
+        or db.query(Favorite.id).filter_by(user_id=user_id, event_id=event_id).first()
+    )
     if not exists:
-        db.add(Favorite(user_id=user_id, event_id=event_id))
-        db.commit()
-        await callback_query.answer("Добавлено в избранное!")
+        write_behind.add_favorite(user_id, event_id)
+        await callback_query.answer(t(lang, "fav_added"))
     else:
-        await callback_query.answer("Уже в избранном.")
+        await callback_query.answer(t(lang, "fav_exists"))
+
+# «Подробнее»: заведение с адресом и точкой на карте, у серии — ближайшие даты
+@router.callback_query(F.data.startswith("details_"))
+async def event_details(callback_query: types.CallbackQuery):
+    event_id = int(callback_query.data.split("_", 1)[1])
+    lang = get_user_lang(callback_query.from_user.id)
+    db = next(get_db())
+    event = db.execute(
+        select(Event.date, Event.rrule, Venue.name, Venue.address, Venue.latitude, Venue.longitude)
+        .outerjoin(Venue, Venue.id == Event.venue_id)
+        .where(Event.id == event_id)
+    ).first()
+    if event is None:
+        await callback_query.answer(t(lang, "event_not_found"))
+        return
+    write_behind.add_hit(event_id, settings.POPULARITY_DETAILS_WEIGHT)
+    lines = []
+    if event.name:
+        lines.append(t(lang, "details_venue", venue=event.name, address=event.address or "—"))
+    if event.rrule:
+        upcoming = islice(recurrence.dates(event.rrule, event.date, datetime.utcnow()), settings.DETAILS_DATES)
+        dates = "\n".join(date.strftime('%d.%m.%Y %H:%M') for date in upcoming)
+        if dates:
+            lines.append(t(lang, "details_dates", dates=dates))
+    if not lines:
+        await callback_query.answer(t(lang, "details_none"), show_alert=True)
+        return
+    await callback_query.answer()
+    await callback_query.message.answer("\n\n".join(lines))
+    if event.latitude is not None and event.longitude is not None:
+        await callback_query.message.answer_location(event.latitude, event.longitude)
 
 # Удаление мероприятия
-@dp.callback_query(lambda c: c.data.startswith("delete_event_"))
+@router.callback_query(lambda c: c.data.startswith("delete_event_"))
 async def delete_event(callback_query: types.CallbackQuery):
+    lang = get_user_lang(callback_query.from_user.id)
     if callback_query.from_user.id not in settings.get_admin_ids():
-        await callback_query.answer("Нет доступа.")
+        await callback_query.answer(t(lang, "no_access"))
         return
     event_id = int(callback_query.data.split("_", 2)[2])
-    db = next(get_db())
+    db = next(get_db(primary=True))
     event = db.query(Event).filter_by(id=event_id).first()
     if event:
         db.delete(event)
         db.commit()
-        await callback_query.message.answer("Мероприятие удалено.")
+        posters.delete_posters(event_id)
+        await callback_query.message.answer(t(lang, "event_deleted"))
     else:
-        await callback_query.message.answer("Мероприятие не найдено.")
+        await callback_query.message.answer(t(lang, "event_not_found"))
 
 # Редактирование мероприятия (пошагово)
-@dp.callback_query(lambda c: c.data.startswith("edit_event_"))
+@router.callback_query(lambda c: c.data.startswith("edit_event_"))
 async def edit_event_start(callback_query: types.CallbackQuery, state: FSMContext):
+    lang = get_user_lang(callback_query.from_user.id)
     if callback_query.from_user.id not in settings.get_admin_ids():
-        await callback_query.answer("Нет доступа.")
+        await callback_query.answer(t(lang, "no_access"))
         return
     event_id = int(callback_query.data.split("_", 2)[2])
     await state.update_data(event_id=event_id)
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="Название", callback_data="edit_field_title")],
-            [InlineKeyboardButton(text="Описание", callback_data="edit_field_description")],
-            [InlineKeyboardButton(text="Дата", callback_data="edit_field_date")],
-            [InlineKeyboardButton(text="Место", callback_data="edit_field_location")]
-        ]
-    )
-    await callback_query.message.answer("Что вы хотите изменить?", reply_markup=keyboard)
+    await callback_query.message.answer(t(lang, "edit_prompt"), reply_markup=keyboards(lang).edit_event_fields)
     await state.set_state(EditEventStates.waiting_for_field)
 
-@dp.callback_query(lambda c: c.data.startswith("edit_field_"))
+@router.callback_query(lambda c: c.data.startswith("edit_field_"))
 async def edit_event_field(callback_query: types.CallbackQuery, state: FSMContext):
+    lang = get_user_lang(callback_query.from_user.id)
     field = callback_query.data.split("_", 2)[2]
     await state.update_data(field=field)
-    await callback_query.message.answer(f"Введите новое значение для поля: {field}")
+    await callback_query.message.answer(t(lang, "edit_value_prompt", field=t(lang, f"field_{field}")))
     await state.set_state(EditEventStates.waiting_for_value)
 
-@dp.message(EditEventStates.waiting_for_value)
+@router.message(StateFilter(EditEventStates.waiting_for_value))
 async def edit_event_value(message: types.Message, state: FSMContext):
+    lang = get_user_lang(message.from_user.id)
     data = await state.get_data()
     event_id = data["event_id"]
     field = data["field"]
-    db = next(get_db())
+    db = next(get_db(primary=True))
     event = db.query(Event).filter_by(id=event_id).first()
     if not event:
-        await message.answer("Мероприятие не найдено.")
+        await message.answer(t(lang, "event_not_found"))
         await state.clear()
         return
     value = message.text
@@ -619,78 +830,95 @@ async def edit_event_value(message: types.Message, state: FSMContext):
         try:
             value = datetime.strptime(value, "%d.%m.%Y %H:%M")
         except ValueError:
-            await message.answer("Неверный формат даты. Введите в формате ДД.ММ.ГГГГ ЧЧ:ММ")
+            await message.answer(t(lang, "invalid_datetime"))
             return
     setattr(event, field, value)
     db.commit()
-    await message.answer(f"Поле {field} успешно обновлено!")
+    await message.answer(t(lang, "field_updated", field=t(lang, f"field_{field}")))
     await state.clear()
 
 # Удаление акции
-@dp.callback_query(lambda c: c.data.startswith("delete_promo_"))
+@router.callback_query(lambda c: c.data.startswith("delete_promo_"))
 async def delete_promotion(callback_query: types.CallbackQuery):
+    lang = get_user_lang(callback_query.from_user.id)
     if callback_query.from_user.id not in settings.get_admin_ids():
-        await callback_query.answer("Нет доступа.")
+        await callback_query.answer(t(lang, "no_access"))
         return
     promo_id = int(callback_query.data.split("_", 2)[2])
-    db = next(get_db())
+    db = next(get_db(primary=True))
     promo = db.query(Promotion).filter_by(id=promo_id).first()
     if promo:
         db.delete(promo)
         db.commit()
-        await callback_query.message.answer("Акция удалена.")
+        await callback_query.message.answer(t(lang, "promo_deleted"))
     else:
-        await callback_query.message.answer("Акция не найдена.")
+        await callback_query.message.answer(t(lang, "promo_not_found"))
 
 # Редактирование акции (пошагово)
-@dp.callback_query(lambda c: c.data.startswith("edit_promo_"))
+@router.callback_query(lambda c: c.data.startswith("edit_promo_"))
 async def edit_promo_start(callback_query: types.CallbackQuery, state: FSMContext):
+    lang = get_user_lang(callback_query.from_user.id)
     if callback_query.from_user.id not in settings.get_admin_ids():
-        await callback_query.answer("Нет доступа.")
+        await callback_query.answer(t(lang, "no_access"))
         return
     promo_id = int(callback_query.data.split("_", 2)[2])
     await state.update_data(promo_id=promo_id)
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="Название", callback_data="edit_promo_field_title")],
-            [InlineKeyboardButton(text="Описание", callback_data="edit_promo_field_description")],
-            [InlineKeyboardButton(text="Заведение", callback_data="edit_promo_field_venue")],
-            [InlineKeyboardButton(text="Срок действия", callback_data="edit_promo_field_valid_until")]
-        ]
-    )
-    await callback_query.message.answer("Что вы хотите изменить?", reply_markup=keyboard)
+    await callback_query.message.answer(t(lang, "edit_prompt"), reply_markup=keyboards(lang).edit_promo_fields)
     await state.set_state(EditPromoStates.waiting_for_field)
 
-@dp.callback_query(lambda c: c.data.startswith("edit_promo_field_"))
+@router.callback_query(lambda c: c.data.startswith("edit_promo_field_"))
 async def edit_promo_field(callback_query: types.CallbackQuery, state: FSMContext):
+    lang = get_user_lang(callback_query.from_user.id)
     field = callback_query.data.split("_", 3)[3]
     await state.update_data(field=field)
-    await callback_query.message.answer(f"Введите новое значение для поля: {field}")
+    await callback_query.message.answer(t(lang, "edit_value_prompt", field=t(lang, f"field_{field}")))
     await state.set_state(EditPromoStates.waiting_for_value)
 
-@dp.message(EditPromoStates.waiting_for_value)
+@router.message(StateFilter(EditPromoStates.waiting_for_value))
 async def edit_promo_value(message: types.Message, state: FSMContext):
+    lang = get_user_lang(message.from_user.id)
     data = await state.get_data()
     promo_id = data["promo_id"]
     field = data["field"]
-    db = next(get_db())
+    db = next(get_db(primary=True))
     promo = db.query(Promotion).filter_by(id=promo_id).first()
     if not promo:
-        await message.answer("Акция не найдена.")
+        await message.answer(t(lang, "promo_not_found"))
         await state.clear()
         return
     value = message.text
     setattr(promo, field, value)
     db.commit()
-    await message.answer(f"Поле {field} успешно обновлено!")
+    await message.answer(t(lang, "field_updated", field=t(lang, f"field_{field}")))
     await state.clear()
 
-# Функция для получения языка пользователя
-def get_user_lang(user_id):
-    db = next(get_db())
-    user_lang = db.query(UserLang).filter_by(user_id=user_id).first()
-    return user_lang.lang if user_lang else "ru"
-
-async def start_bot():
+def create_bot() -> Bot:
+    return Bot(token=settings.BOT_TOKEN)
+
+def create_dispatcher() -> Dispatcher:
+    dp = Dispatcher(storage=IndexedStorage(MemoryStorage()))
+    update_tracker = UpdateTracker()
+    dp.update.outer_middleware(update_tracker)
+    dp["update_tracker"] = update_tracker
+    if settings.UPDATE_LOG_PATH:
+        # После UpdateTracker: апдейты, отклонённые в режиме drain, не записываются
+        recorder = UpdateRecorder(settings.UPDATE_LOG_PATH, settings.UPDATE_LOG_SALT, settings.UPDATE_LOG_SAMPLE)
+        dp.update.outer_middleware(recorder)
+        dp["update_recorder"] = recorder
+    # Буфер сбрасывается в базу фоновой задачей; последний сброс — в drain_bot
+    dp["write_behind"] = write_behind
+    dp.startup.register(write_behind.start)
+    # Сначала команды и сценарии ввода, затем кнопки; сообщение без совпадений дальше не идёт
+    dp.include_router(router)
+    dp.include_router(buttons)
+    dp.include_router(search_router)
+    dp.include_router(inline.router)
+    if settings.UPDATE_LOG_PATH:
+        track_handlers(dp)
+    return dp
+
+async def start_bot(bot: Bot, dp: Dispatcher):
     print("Bot polling started!")
-    await dp.start_polling(bot) 
\ No newline at end of file
+    # Остановкой и закрытием сессии управляет drain (app/core/lifecycle.py)
+    await dp.start_polling(bot, handle_signals=False, close_bot_session=False)
+ 
\ No newline at end of file
@@ -0,0 +1,60 @@
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from app.bot.date_picker import NOOP
+from app.bot.i18n import DEFAULT_LANG, messages, t
+from app.core import recurrence
+from app.core.config import settings
+
+# Подпись к фото в Telegram — не длиннее 1024 символов
+CAPTION_LIMIT = 1024
+
+
+def format_event(event, lang: str = DEFAULT_LANG) -> str:
+    date = event.date.strftime('%d.%m.%Y %H:%M')
+    # Повторение серии показывает свою дату и частоту серии
+    rule = getattr(event, "rrule", None)
+    if rule:
+        date = f"{date} · {t(lang, 'recurs_' + recurrence.frequency(rule))}"
+    return t(
+        lang, "event_card",
+        title=event.title,
+        date=date,
+        location=event.location,
+        description=event.description,
+    )
+
+def event_rows(event, labels):
+    return [
+        [InlineKeyboardButton(text=labels["btn_favorite"], callback_data=f"fav_{event.id}")],
+        [InlineKeyboardButton(text=labels["btn_details"], callback_data=f"details_{event.id}")],
+        [InlineKeyboardButton(text=labels["btn_share"], switch_inline_query=event.title)]
+    ]
+
+def event_keyboard(event, lang: str = DEFAULT_LANG) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=event_rows(event, messages(lang)))
+
+def admin_event_keyboard(event, lang: str = DEFAULT_LANG) -> InlineKeyboardMarkup:
+    labels = messages(lang)
+    return InlineKeyboardMarkup(
+        inline_keyboard=event_rows(event, labels) + [
+            [InlineKeyboardButton(text=labels["btn_poster"], callback_data=f"poster_{event.id}")],
+        ]
+    )
+
+def format_digest(items, page: int, lang: str, after_seq: int, until_seq: int):
+    """Страница дайджеста и кнопки листания; диапазон журнала в callback_data — страницы собираются заново."""
+    pages = max(1, -(-len(items) // settings.DIGEST_PAGE_SIZE))
+    page = min(max(page, 0), pages - 1)
+    lines = [t(lang, "digest_title", count=len(items))]
+    for item in items[page * settings.DIGEST_PAGE_SIZE:(page + 1) * settings.DIGEST_PAGE_SIZE]:
+        line = t(lang, f"digest_{item.kind}", title=item.title, date=item.date.strftime('%d.%m.%Y %H:%M'))
+        lines.append(f"{line} · {item.place}" if item.place else line)
+    if pages == 1:
+        return "\n\n".join(lines), None
+    buttons = []
+    if page > 0:
+        buttons.append(InlineKeyboardButton(text="◀", callback_data=f"dg_{after_seq}_{until_seq}_{page - 1}"))
+    buttons.append(InlineKeyboardButton(text=f"{page + 1}/{pages}", callback_data=NOOP))
+    if page < pages - 1:
+        buttons.append(InlineKeyboardButton(text="▶", callback_data=f"dg_{after_seq}_{until_seq}_{page + 1}"))
+    return "\n\n".join(lines), InlineKeyboardMarkup(inline_keyboard=[buttons])
@@ -0,0 +1,67 @@
+"""Инлайн-календарь для поиска по дате: отмечены только дни, на которые есть мероприятия."""
+import calendar
+from datetime import date, datetime, timedelta
+from typing import Mapping, Tuple
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from app.bot.i18n import messages
+
+NOOP = "cal_noop"
+
+
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def shift_month(year: int, month: int, delta: int) -> Tuple[int, int]:
+    index = year * 12 + month - 1 + delta
+    return index // 12, index % 12 + 1
+
+
+def weekend_range(now: datetime) -> Tuple[datetime, datetime]:
+    saturday = now.date() + timedelta(days=5 - now.weekday())
+    start = datetime.combine(saturday, datetime.min.time())
+    return max(start, now), start + timedelta(days=2)
+
+
+def next_days_range(now: datetime, days: int = 7) -> Tuple[datetime, datetime]:
+    return now, now + timedelta(days=days)
+
+
+def build_calendar(year: int, month: int, event_days: Mapping[date, int], today: date, lang: str) -> InlineKeyboardMarkup:
+    labels = messages(lang)
+    prev_year, prev_month = shift_month(year, month, -1)
+    next_year, next_month = shift_month(year, month, 1)
+    # В прошлые месяцы не листаем
+    has_prev = (prev_year, prev_month) >= (today.year, today.month)
+    rows = [
+        [
+            InlineKeyboardButton(
+                text="‹" if has_prev else " ",
+                callback_data=f"cal_month_{prev_year}-{prev_month:02d}" if has_prev else NOOP,
+            ),
+            InlineKeyboardButton(text=f"{labels[f'month_{month}']} {year}", callback_data=NOOP),
+            InlineKeyboardButton(text="›", callback_data=f"cal_month_{next_year}-{next_month:02d}"),
+        ],
+        [InlineKeyboardButton(text=name, callback_data=NOOP) for name in labels["weekdays"].split()],
+    ]
+    for week in calendar.monthcalendar(year, month):
+        row = []
+        for day in week:
+            if not day:
+                row.append(InlineKeyboardButton(text=" ", callback_data=NOOP))
+                continue
+            current = date(year, month, day)
+            if current in event_days and current >= today:
+                row.append(InlineKeyboardButton(text=f"•{day}•", callback_data=f"cal_day_{current.isoformat()}"))
+            else:
+                row.append(InlineKeyboardButton(text=str(day), callback_data=NOOP))
+        rows.append(row)
+    rows.append([
+        InlineKeyboardButton(text=labels["btn_weekend"], callback_data="cal_weekend"),
+        InlineKeyboardButton(text=labels["btn_next_week"], callback_data="cal_week"),
+    ])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
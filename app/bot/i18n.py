@@ -0,0 +1,55 @@
+"""Каталог переводов: app/locales/<lang>.json загружается один раз при импорте."""
+import json
+from pathlib import Path
+from types import MappingProxyType
+from typing import FrozenSet, Mapping
+
+LOCALES_DIR = Path(__file__).resolve().parent.parent / "locales"
+DEFAULT_LANG = "ru"
+
+LANGS = (
+    ("Русский", "ru"),
+    ("Қазақша", "kz"),
+    ("English", "en"),
+)
+
+# Ключи категорий; для поиска по описанию используется русское название
+CATEGORIES = ("cat_party", "cat_concert", "cat_meetup", "cat_promo", "cat_other")
+
+
+def load_catalog(directory: Path = LOCALES_DIR) -> Mapping[str, Mapping[str, str]]:
+    default = json.loads((directory / f"{DEFAULT_LANG}.json").read_text(encoding="utf-8"))
+    catalog = {}
+    for _, lang in LANGS:
+        messages = json.loads((directory / f"{lang}.json").read_text(encoding="utf-8"))
+        unknown = messages.keys() - default.keys()
+        if unknown:
+            raise ValueError(f"Unknown keys in {lang}.json: {sorted(unknown)}")
+        # Непереведённые ключи берутся из языка по умолчанию
+        catalog[lang] = MappingProxyType({**default, **messages})
+    return MappingProxyType(catalog)
+
+
+CATALOG = load_catalog()
+
+
+def messages(lang: str) -> Mapping[str, str]:
+    return CATALOG.get(lang) or CATALOG[DEFAULT_LANG]
+
+
+def t(lang: str, key: str, **kwargs) -> str:
+    text = messages(lang)[key]
+    return text.format(**kwargs) if kwargs else text
+
+
+def labels(key: str) -> FrozenSet[str]:
+    """Все переводы подписи кнопки — для фильтра по тексту на любом языке."""
+    return frozenset(catalog[key] for catalog in CATALOG.values())
+
+
+# Подпись категории на любом языке -> русское название для поиска
+CATEGORY_BY_LABEL = MappingProxyType({
+    catalog[key]: CATALOG[DEFAULT_LANG][key]
+    for catalog in CATALOG.values()
+    for key in CATEGORIES
+})
@@ -0,0 +1,100 @@
+"""Inline-режим: @bot <текст> возвращает подходящие предстоящие мероприятия города пользователя."""
+import re
+
+from aiogram import Router, types
+from aiogram.types import InlineQueryResultArticle, InlineQueryResultCachedPhoto, InputTextMessageContent
+
+from app.bot.cards import CAPTION_LIMIT, format_event, event_keyboard
+from app.bot.users import get_user_city, write_behind
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.database import read_models
+
+router = Router(name="inline")
+
+# Ключ — (город, нормализованный текст запроса), значение — весь ранжированный список (до INLINE_MAX_RESULTS)
+results_cache = TTLCache(maxsize=settings.INLINE_CACHE_SIZE, ttl=settings.INLINE_CACHE_TTL)
+
+
+def normalize_query(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().casefold()
+
+
+def rank(events, query):
+    # Тот же порядок, что и в read_models.search_events: совпадение с начала, затем дата
+    return sorted(
+        (event for event in events if query in event.title.casefold()),
+        key=lambda event: (not event.title.casefold().startswith(query), event.date),
+    )
+
+
+def find_events(city: str, query: str):
+    cached = results_cache.get((city, query))
+    if cached is not None:
+        return cached
+    # Уточнение уже закэшированного префикса фильтруем в памяти, если тот список не обрезан лимитом
+    for end in range(len(query) - 1, -1, -1):
+        parent = results_cache.get((city, query[:end]))
+        if parent is not None and len(parent) < settings.INLINE_MAX_RESULTS:
+            events = rank(parent, query)
+            break
+    else:
+        with SessionLocal() as db:
+            events = read_models.search_events(db, city, query, settings.INLINE_MAX_RESULTS)
+    results_cache.set((city, query), events)
+    return events
+
+
+def poster_thumbnail_url(event):
+    if not settings.PUBLIC_API_URL or not event.poster_version:
+        return None
+    return f"{settings.PUBLIC_API_URL}/events/{event.id}/poster?size=thumb&v={event.poster_version}"
+
+
+def to_article(event):
+    # Карточка уходит в чужой чат, поэтому текст на языке по умолчанию
+    text = format_event(event)
+    description = f"{event.date.strftime('%d.%m.%Y %H:%M')} · {event.location or ''}"
+    if event.poster_file_id and len(text) <= CAPTION_LIMIT:
+        # Постер уже загружен в Telegram — отправляется по file_id без повторной загрузки
+        return InlineQueryResultCachedPhoto(
+            id=str(event.id),
+            photo_file_id=event.poster_file_id,
+            title=event.title,
+            description=description,
+            caption=text,
+            reply_markup=event_keyboard(event),
+        )
+    return InlineQueryResultArticle(
+        id=str(event.id),
+        title=event.title,
+        description=description,
+        input_message_content=InputTextMessageContent(message_text=text),
+        reply_markup=event_keyboard(event),
+        thumbnail_url=poster_thumbnail_url(event),
+    )
+
+
+@router.inline_query()
+async def inline_search(inline_query: types.InlineQuery):
+    query = normalize_query(inline_query.query)
+    offset = int(inline_query.offset) if inline_query.offset.isdigit() else 0
+    events = find_events(get_user_city(inline_query.from_user.id), query)
+    page = events[offset:offset + settings.INLINE_PAGE_SIZE]
+    next_offset = offset + len(page)
+    await inline_query.answer(
+        [to_article(event) for event in page],
+        # Результаты одинаковы для всех пользователей города — при одном городе пусть кэширует Telegram
+        cache_time=settings.INLINE_CACHE_TIME,
+        is_personal=len(settings.get_cities()) > 1,
+        next_offset=str(next_offset) if next_offset < len(events) else "",
+    )
+
+
+# Выбранный результат — карточка ушла в чат, это «Поделиться».
+# Telegram присылает такие апдейты, только если в @BotFather включено /setinlinefeedback
+@router.chosen_inline_result()
+async def inline_shared(chosen: types.ChosenInlineResult):
+    if chosen.result_id.isdigit():
+        write_behind.add_hit(int(chosen.result_id), settings.POPULARITY_SHARE_WEIGHT)
@@ -0,0 +1,110 @@
+"""Клавиатуры собираются один раз на каждый язык; объекты aiogram неизменяемы и переиспользуются."""
+from types import MappingProxyType
+from typing import NamedTuple
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
+
+from app.bot.i18n import CATALOG, CATEGORIES, DEFAULT_LANG, LANGS
+from app.core.config import settings
+from app.models.digest import DIGEST_FREQUENCIES
+
+
+class Keyboards(NamedTuple):
+    user_menu: ReplyKeyboardMarkup
+    admin_menu: ReplyKeyboardMarkup
+    search_mode: ReplyKeyboardMarkup
+    categories: ReplyKeyboardMarkup
+    back_to_menu: ReplyKeyboardMarkup
+    admin_panel: InlineKeyboardMarkup
+    languages: InlineKeyboardMarkup
+    edit_event_fields: InlineKeyboardMarkup
+    edit_promo_fields: InlineKeyboardMarkup
+    duplicate_confirm: InlineKeyboardMarkup
+    recurrence: InlineKeyboardMarkup
+    digest_frequency: InlineKeyboardMarkup
+
+
+def reply_keyboard(rows) -> ReplyKeyboardMarkup:
+    return ReplyKeyboardMarkup(
+        keyboard=[
+            [button if isinstance(button, KeyboardButton) else KeyboardButton(text=button) for button in row]
+            for row in rows
+        ],
+        resize_keyboard=True,
+    )
+
+
+def build_keyboards(messages) -> Keyboards:
+    user_rows = [
+        [messages["btn_upcoming"], messages["btn_promotions"]],
+        [messages["btn_search"], messages["btn_for_you"], messages["btn_popular"]],
+        [messages["btn_favorites"], messages["btn_feedback"]],
+        # Кнопка отправляет геопозицию — ответ ищет мероприятия и акции рядом
+        [KeyboardButton(text=messages["btn_nearby"], request_location=True)],
+        [messages["btn_help"], messages["btn_language"]] + (
+            # Выбор города нужен, только если их несколько
+            [messages["btn_city"]] if len(settings.get_cities()) > 1 else []
+        ),
+    ]
+    admin_rows = user_rows + [
+        [messages["btn_admin_panel"], messages["btn_stats"]],
+        [messages["btn_broadcast"]],
+    ]
+    return Keyboards(
+        user_menu=reply_keyboard(user_rows),
+        admin_menu=reply_keyboard(admin_rows),
+        search_mode=reply_keyboard([[messages["btn_search_date"]], [messages["btn_search_category"]]]),
+        categories=reply_keyboard([[messages[key]] for key in CATEGORIES] + [[messages["btn_menu"]]]),
+        back_to_menu=reply_keyboard([[messages["btn_menu"]]]),
+        admin_panel=InlineKeyboardMarkup(inline_keyboard=[
+            [
+                InlineKeyboardButton(text=messages["btn_add_event"], callback_data="add_event"),
+                InlineKeyboardButton(text=messages["btn_add_promotion"], callback_data="add_promotion"),
+            ],
+            [
+                InlineKeyboardButton(text=messages["btn_list_events"], callback_data="list_events"),
+                InlineKeyboardButton(text=messages["btn_list_promotions"], callback_data="list_promotions"),
+            ],
+        ]),
+        languages=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text=title, callback_data=f"lang_{code}")] for title, code in LANGS
+        ]),
+        edit_event_fields=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text=messages[f"field_{field}"], callback_data=f"edit_field_{field}")]
+            for field in ("title", "description", "date", "location")
+        ]),
+        edit_promo_fields=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text=messages[f"field_{field}"], callback_data=f"edit_promo_field_{field}")]
+            for field in ("title", "description", "venue", "valid_until")
+        ]),
+        duplicate_confirm=InlineKeyboardMarkup(inline_keyboard=[[
+            InlineKeyboardButton(text=messages["btn_add_anyway"], callback_data="dup_add"),
+            InlineKeyboardButton(text=messages["btn_cancel"], callback_data="dup_cancel"),
+        ]]),
+        recurrence=InlineKeyboardMarkup(inline_keyboard=[
+            [
+                InlineKeyboardButton(text=messages["btn_once"], callback_data="rec_once"),
+                InlineKeyboardButton(text=messages["btn_daily"], callback_data="rec_DAILY"),
+            ],
+            [
+                InlineKeyboardButton(text=messages["btn_weekly"], callback_data="rec_WEEKLY"),
+                InlineKeyboardButton(text=messages["btn_monthly"], callback_data="rec_MONTHLY"),
+            ],
+        ]),
+        digest_frequency=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text=messages[f"btn_digest_{frequency}"], callback_data=f"digest_{frequency}")]
+            for frequency in DIGEST_FREQUENCIES
+        ]),
+    )
+
+
+KEYBOARDS = MappingProxyType({lang: build_keyboards(messages) for lang, messages in CATALOG.items()})
+
+# Названия городов из настроек, одинаковые на всех языках
+CITY_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text=name, callback_data=f"city_{code}")] for code, name in settings.get_cities().items()
+])
+
+
+def keyboards(lang: str) -> Keyboards:
+    return KEYBOARDS.get(lang) or KEYBOARDS[DEFAULT_LANG]
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import TelegramObject
+
+
+class UpdateTracker(BaseMiddleware):
+    """Считает апдейты в обработке; в режиме drain перестаёт принимать новые.
+
+    Запоминает, до какого апдейта подтверждать offset после drain: обработанные
+    не должны прийти снова, отклонённые — должны.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.accepting = True
+        self.last_handled: Optional[int] = None
+        self.first_rejected: Optional[int] = None
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        update_id = getattr(event, "update_id", None)
+        if not self.accepting:
+            # offset этого апдейта не подтверждается — Telegram доставит его снова после рестарта
+            if update_id is not None and (self.first_rejected is None or update_id < self.first_rejected):
+                self.first_rejected = update_id
+            return UNHANDLED
+        if update_id is not None and (self.last_handled is None or update_id > self.last_handled):
+            self.last_handled = update_id
+        self.in_flight += 1
+        self._idle.clear()
+        try:
+            return await handler(event, data)
+        finally:
+            self.in_flight -= 1
+            if not self.in_flight:
+                self._idle.set()
+
+    def confirm_offset(self) -> Optional[int]:
+        """offset для getUpdates после drain; None — подтверждать нечего."""
+        if self.last_handled is None:
+            return None
+        offset = self.last_handled + 1
+        return offset if self.first_rejected is None else min(offset, self.first_rejected)
+
+    async def drain(self, timeout: float) -> bool:
+        self.accepting = False
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
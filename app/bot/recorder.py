@@ -0,0 +1,167 @@
+"""Запись входящих апдейтов для воспроизведения (benchmarks/replay_updates.py).
+
+Включается UPDATE_LOG_PATH: каждый апдейт дописывается строкой JSON в gzip-файл
+вместе со временем прихода, временем обработки и именем обработчика. Файл
+открывается на дозапись — каждый запуск бота добавляет отдельный gzip-член,
+а gzip читает такие файлы целиком.
+
+Обезличивание до записи:
+- id пользователей и чатов заменяются HMAC с солью UPDATE_LOG_SALT: у одного
+  пользователя один псевдоним, поэтому сценарии (FSM) воспроизводятся; без
+  соли она случайна на каждый запуск. Это касается и пересланных сообщений
+  (forward_from, forward_origin), и отправленных контактов (contact.user_id);
+- имена, username и vCard убираются, file_id заменяются хэшем, координаты
+  округляются до ~1 км;
+- в свободном тексте буквы заменяются на «x» с сохранением длины, цифр и
+  пунктуации (даты и время остаются); команды и подписи кнопок не меняются,
+  чтобы маршрутизация при воспроизведении была той же.
+
+id администраторов (ADMIN_IDS) не меняются, иначе их сценарии не воспроизвести.
+"""
+import contextvars
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.types import TelegramObject
+
+from app.bot.i18n import CATALOG
+from app.bot.routing import ButtonRouter
+from app.core.config import settings
+
+# Внешний middleware кладёт сюда список, внутренний (HandlerName) — имя сработавшего обработчика
+current_handler: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("current_handler", default=None)
+
+# Объекты, чей id — пользователь или чат; user_id заменяется в любом объекте (contact.user_id)
+ID_OWNERS = {
+    "from", "chat", "user", "sender_chat", "forward_from", "forward_from_chat", "sender_user",
+    "new_chat_members", "left_chat_member",
+}
+ID_FIELDS = {"user_id"}
+# Убираются целиком
+NAMES = {"last_name", "username", "forward_sender_name", "sender_user_name", "author_signature", "vcard"}
+FREE_TEXT = {"text", "caption", "query", "title"}
+FILE_IDS = {"file_id", "file_unique_id"}
+# Тексты бота и подписи кнопок — не личные данные, по ним идёт маршрутизация
+KNOWN_TEXTS = frozenset(text for messages in CATALOG.values() for text in messages.values())
+LETTERS = re.compile(r"[^\W\d_]")
+
+
+def handler_name(handler, event) -> str:
+    callback = handler.callback
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, ButtonRouter):
+        # Кнопки обрабатывает один dispatch — нужен обработчик конкретной подписи
+        callback = owner.actions[event.text].callback
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+class HandlerName(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        holder = current_handler.get()
+        if holder is not None:
+            holder.append(handler_name(data["handler"], event))
+        return await handler(event, data)
+
+
+def track_handlers(dp: Dispatcher):
+    """Имя обработчика каждого апдейта попадает в current_handler."""
+    for router in dp.chain_tail:
+        for name, observer in router.observers.items():
+            if name not in ("update", "error"):
+                observer.middleware(HandlerName())
+
+
+def mask_text(text: str) -> str:
+    if text in KNOWN_TEXTS:
+        return text
+    if text.startswith("/"):
+        command, separator, arguments = text.partition(" ")
+        return command + separator + LETTERS.sub("x", arguments)
+    return LETTERS.sub("x", text)
+
+
+class UpdateRecorder(BaseMiddleware):
+    def __init__(self, path: str, salt: str = "", sample: float = 1.0):
+        self.salt = salt.encode() or os.urandom(16)
+        self.sample = sample
+        self.admin_ids = set(settings.get_admin_ids())
+        self.file = gzip.open(path, "at", encoding="utf-8")
+
+    def pseudonym(self, value: int) -> int:
+        if value in self.admin_ids:
+            return value
+        digest = hmac.new(self.salt, str(abs(value)).encode(), hashlib.sha256).digest()
+        # Групповые чаты в Telegram отрицательные — знак сохраняется
+        pseudonym = int.from_bytes(digest[:6], "big")
+        return -pseudonym if value < 0 else pseudonym
+
+    def sampled(self, user) -> bool:
+        if self.sample >= 1 or user is None:
+            return True
+        # Выборка по пользователю, а не по апдейту: сценарии попадают в лог целиком
+        return self.pseudonym(user.id) % 10000 < self.sample * 10000
+
+    def scrub(self, value, key: str = None):
+        if isinstance(value, list):
+            return [self.scrub(item, key) for item in value]
+        if not isinstance(value, dict):
+            return value
+        result = {}
+        for name, item in value.items():
+            if name in NAMES:
+                continue
+            if name == "first_name":
+                result[name] = "user"
+            elif (name == "id" and key in ID_OWNERS or name in ID_FIELDS) and isinstance(item, int):
+                result[name] = self.pseudonym(item)
+            elif name in FREE_TEXT and isinstance(item, str):
+                result[name] = mask_text(item)
+            elif name in FILE_IDS:
+                result[name] = hashlib.sha1(self.salt + item.encode()).hexdigest()
+            elif name in ("latitude", "longitude"):
+                result[name] = round(item, 2)
+            elif name == "phone_number":
+                result[name] = "0"
+            else:
+                result[name] = self.scrub(item, name)
+        return result
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if not self.sampled(data.get("event_from_user")):
+            return await handler(event, data)
+        holder = []
+        token = current_handler.set(holder)
+        arrived = time.time()
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_handler.reset(token)
+            record = {
+                "at": arrived,
+                "ms": round(elapsed * 1000, 3),
+                "handler": holder[-1] if holder else None,
+                "update": self.scrub(event.model_dump(mode="json", exclude_none=True, by_alias=True)),
+            }
+            self.file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,87 @@
+"""Маршрутизация сообщений без лишней работы на каждом апдейте.
+
+ButtonRouter находит обработчик reply-кнопки по точному тексту одним поиском
+в словаре вместо перебора фильтров. IndexedStorage помнит ключи с активным
+состоянием, поэтому для пользователей вне сценария get_state не обращается
+к хранилищу.
+
+Фильтры здесь асинхронные: синхронные (в том числе F и State без StateFilter)
+aiogram вызывает через asyncio.to_thread.
+"""
+from typing import Any, Container, Dict, Optional, Set
+
+from aiogram import Router, types
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.filters import Filter
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from app.bot.i18n import labels
+
+
+class TextIn(Filter):
+    """Точное совпадение текста; в отличие от F.text.in_ не выполняется в потоке."""
+
+    def __init__(self, values: Container[str]):
+        self.values = values
+
+    async def __call__(self, message: types.Message) -> bool:
+        return message.text in self.values
+
+
+class HasLocation(Filter):
+    async def __call__(self, message: types.Message) -> bool:
+        return message.location is not None
+
+
+class ButtonRouter(Router):
+    def __init__(self, *, name: Optional[str] = None):
+        super().__init__(name=name)
+        self.actions: Dict[str, CallableObject] = {}
+        self.message.register(self.dispatch, TextIn(self.actions))
+
+    def button(self, key: str):
+        """Регистрирует обработчик на подпись кнопки key на всех языках."""
+        def decorator(callback):
+            action = CallableObject(callback)
+            for label in labels(key):
+                if label in self.actions:
+                    raise ValueError(f"Button label {label!r} is already registered")
+                self.actions[label] = action
+            return callback
+        return decorator
+
+    async def dispatch(self, message: types.Message, **kwargs: Any) -> Any:
+        return await self.actions[message.text].call(message, **kwargs)
+
+
+class IndexedStorage(BaseStorage):
+    """Обёртка над хранилищем FSM с индексом ключей, у которых есть состояние.
+
+    Индекс живёт в памяти процесса и пуст после старта, поэтому подходит для
+    одного процесса бота с MemoryStorage (состояния и так не переживают рестарт).
+    """
+
+    def __init__(self, storage: BaseStorage):
+        self.storage = storage
+        self.active: Set[StorageKey] = set()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self.storage.set_state(key, state)
+        if state is None:
+            self.active.discard(key)
+        else:
+            self.active.add(key)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        if key not in self.active:
+            return None
+        return await self.storage.get_state(key)
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        await self.storage.set_data(key, data)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        return await self.storage.get_data(key)
+
+    async def close(self) -> None:
+        await self.storage.close()
@@ -0,0 +1,51 @@
+"""Настройки пользователя (язык и город): кэш в памяти процесса и отложенная запись в user_langs."""
+from typing import NamedTuple
+
+from sqlalchemy import select
+
+from app.bot.i18n import DEFAULT_LANG
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.database.write_behind import WriteBehind
+from app.models.user_lang import UserLang
+
+
+class UserPrefs(NamedTuple):
+    lang: str
+    city: str
+
+
+user_prefs = TTLCache(maxsize=settings.USER_LANG_CACHE_SIZE, ttl=settings.USER_LANG_CACHE_TTL)
+# Избранное, отзывы, язык, город и подписки пишутся в базу пачками
+write_behind = WriteBehind(SessionLocal)
+
+
+def get_user_prefs(user_id: int) -> UserPrefs:
+    prefs = user_prefs.get(user_id)
+    if prefs is None:
+        with SessionLocal() as db:
+            row = db.execute(select(UserLang.lang, UserLang.city).where(UserLang.user_id == user_id)).first()
+        prefs = UserPrefs(row.lang, row.city) if row else UserPrefs(DEFAULT_LANG, settings.get_default_city())
+        user_prefs.set(user_id, prefs)
+    return prefs
+
+
+def get_user_lang(user_id: int) -> str:
+    return write_behind.lang(user_id) or get_user_prefs(user_id).lang
+
+
+def get_user_city(user_id: int) -> str:
+    city = write_behind.city(user_id) or get_user_prefs(user_id).city
+    # Город могли убрать из CITIES — тогда показываем город по умолчанию
+    return city if city in settings.get_cities() else settings.get_default_city()
+
+
+def set_user_lang(user_id: int, lang: str):
+    write_behind.set_lang(user_id, lang)
+    user_prefs.set(user_id, get_user_prefs(user_id)._replace(lang=lang))
+
+
+def set_user_city(user_id: int, city: str):
+    write_behind.set_city(user_id, city)
+    user_prefs.set(user_id, get_user_prefs(user_id)._replace(city=city))
@@ -1,8 +1,8 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 import os
 from dotenv import load_dotenv
-from pydantic import ConfigDict
+from pydantic import ConfigDict, field_validator
 
 load_dotenv()
 
@@ -16,8 +16,99 @@ class Settings(BaseSettings):
     def get_admin_ids(self) -> List[int]:
         return [int(id.strip()) for id in self.ADMIN_IDS.split(",") if id.strip()]
     
+    # Города: "код:Название" через запятую; первый — город по умолчанию для новых пользователей и записей
+    CITIES: str = os.getenv("CITIES", "aktau:Актау")
+
+    def get_cities(self) -> Dict[str, str]:
+        cities = {}
+        for item in self.CITIES.split(","):
+            code, _, name = item.strip().partition(":")
+            if code:
+                cities[code.strip()] = name.strip() or code.strip()
+        return cities
+
+    def get_default_city(self) -> str:
+        return next(iter(self.get_cities()))
+
     # Database settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./bot.db")
+
+    # Реплики только для чтения через запятую; пусто — всё идёт в DATABASE_URL
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    # Реплика, отстающая сильнее, пропускается; должно быть больше JOBS_POLL_INTERVAL (частота heartbeat)
+    REPLICA_MAX_LAG: float = float(os.getenv("REPLICA_MAX_LAG", "15"))
+    REPLICA_LAG_CHECK_INTERVAL: float = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "2"))
+
+    def get_replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+    # SQLite profile (PRAGMA на каждое новое соединение)
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    # Отрицательное значение — размер в КиБ, положительное — в страницах
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+    # PostgreSQL profile (QueuePool)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+
+    @field_validator("SQLITE_JOURNAL_MODE")
+    @classmethod
+    def check_journal_mode(cls, value: str) -> str:
+        value = value.upper()
+        if value not in {"WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"}:
+            raise ValueError(f"Unsupported SQLite journal mode: {value}")
+        return value
+
+    @field_validator("SQLITE_SYNCHRONOUS")
+    @classmethod
+    def check_synchronous(cls, value: str) -> str:
+        value = value.upper()
+        if value not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+            raise ValueError(f"Unsupported SQLite synchronous mode: {value}")
+        return value
+    
+    # API settings
+    API_DEFAULT_PAGE_SIZE: int = int(os.getenv("API_DEFAULT_PAGE_SIZE", "50"))
+    API_MAX_PAGE_SIZE: int = int(os.getenv("API_MAX_PAGE_SIZE", "200"))
+    
+    # Inline mode (@bot <текст>)
+    INLINE_PAGE_SIZE: int = int(os.getenv("INLINE_PAGE_SIZE", "20"))
+    INLINE_MAX_RESULTS: int = int(os.getenv("INLINE_MAX_RESULTS", "200"))
+    INLINE_CACHE_TTL: float = float(os.getenv("INLINE_CACHE_TTL", "60"))
+    INLINE_CACHE_SIZE: int = int(os.getenv("INLINE_CACHE_SIZE", "1024"))
+    # cache_time для answerInlineQuery: столько Telegram отвечает из своего кэша
+    INLINE_CACHE_TIME: int = int(os.getenv("INLINE_CACHE_TIME", "300"))
+
+    # Поиск «рядом со мной» по отправленной геопозиции
+    NEARBY_RADIUS_KM: float = float(os.getenv("NEARBY_RADIUS_KM", "5"))
+    NEARBY_LIMIT: int = int(os.getenv("NEARBY_LIMIT", "5"))
+
+    # Отложенная запись избранного, отзывов, языка и подписок (app/database/write_behind.py)
+    WRITE_BEHIND_MAX_PENDING: int = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "500"))
+    WRITE_BEHIND_FLUSH_INTERVAL: float = float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", "1"))
+    # Сколько сбросов подряд без единой записи (база недоступна) изменения ждут, прежде чем отбрасываются
+    WRITE_BEHIND_MAX_RETRIES: int = int(os.getenv("WRITE_BEHIND_MAX_RETRIES", "60"))
+
+    # Постеры мероприятий (app/core/posters.py)
+    MEDIA_DIR: str = os.getenv("MEDIA_DIR", "./media")
+    POSTER_WORKERS: int = int(os.getenv("POSTER_WORKERS", "2"))
+    POSTER_MAX_BYTES: int = int(os.getenv("POSTER_MAX_BYTES", str(10 * 1024 * 1024)))
+    # Публичный адрес API для ссылок на превью постеров (инлайн-режим); пусто — без превью
+    PUBLIC_API_URL: str = os.getenv("PUBLIC_API_URL", "")
+
+    # Поиск дублей мероприятий (app/database/dedupe.py): максимум различающихся бит SimHash названия
+    DEDUP_MAX_DISTANCE: int = int(os.getenv("DEDUP_MAX_DISTANCE", "10"))
+
+    # Кэш языка и города пользователя (app/bot/users.py)
+    USER_LANG_CACHE_SIZE: int = int(os.getenv("USER_LANG_CACHE_SIZE", "10000"))
+    USER_LANG_CACHE_TTL: float = float(os.getenv("USER_LANG_CACHE_TTL", "3600"))
     
     # Web settings
     WEBHOOK_HOST: str = os.getenv("WEBHOOK_HOST", "")
@@ -28,4 +119,54 @@ class Settings(BaseSettings):
     WEBAPP_HOST: str = "0.0.0.0"
     WEBAPP_PORT: int = 8000
 
-settings = Settings() 
\ No newline at end of file
+    # Multi-process deployment (python -m app.supervisor)
+    API_WORKERS: int = int(os.getenv("API_WORKERS", "2"))
+    HEALTH_HOST: str = os.getenv("HEALTH_HOST", "127.0.0.1")
+    BOT_HEALTH_PORT: int = int(os.getenv("BOT_HEALTH_PORT", "8081"))
+    JOBS_HEALTH_PORT: int = int(os.getenv("JOBS_HEALTH_PORT", "8082"))
+    SHUTDOWN_TIMEOUT: float = float(os.getenv("SHUTDOWN_TIMEOUT", "30"))
+    # Сколько ждать in-flight апдейты и фоновые задачи; должно быть меньше SHUTDOWN_TIMEOUT
+    DRAIN_TIMEOUT: float = float(os.getenv("DRAIN_TIMEOUT", "20"))
+
+    # Запись апдейтов для воспроизведения (app/bot/recorder.py); пустой путь — запись выключена
+    UPDATE_LOG_PATH: str = os.getenv("UPDATE_LOG_PATH", "")
+    # Соль псевдонимов id; пустая — случайная на каждый запуск
+    UPDATE_LOG_SALT: str = os.getenv("UPDATE_LOG_SALT", "")
+    # Доля пользователей, чьи апдейты записываются (0..1)
+    UPDATE_LOG_SAMPLE: float = float(os.getenv("UPDATE_LOG_SAMPLE", "1"))
+
+    # Background jobs
+    JOBS_POLL_INTERVAL: float = float(os.getenv("JOBS_POLL_INTERVAL", "5"))
+    BROADCAST_RATE: float = float(os.getenv("BROADCAST_RATE", "25"))
+    BROADCAST_CHECKPOINT_EVERY: int = int(os.getenv("BROADCAST_CHECKPOINT_EVERY", "20"))
+    REMINDER_LEAD_HOURS: int = int(os.getenv("REMINDER_LEAD_HOURS", "24"))
+    # Повторения серий в event_occurrences хранятся на столько дней вперёд (app/jobs/occurrences.py)
+    OCCURRENCE_WINDOW_DAYS: int = int(os.getenv("OCCURRENCE_WINDOW_DAYS", "14"))
+    # Дайджест новых мероприятий и акций (app/jobs/digest.py): по умолчанию у подписчиков — daily
+    DIGEST_DEFAULT_FREQUENCY: str = os.getenv("DIGEST_DEFAULT_FREQUENCY", "daily")
+    # Час отправки по UTC (5 — 10:00 в Актау) и день недели еженедельного дайджеста (0 — понедельник)
+    DIGEST_HOUR: int = int(os.getenv("DIGEST_HOUR", "5"))
+    DIGEST_WEEKDAY: int = int(os.getenv("DIGEST_WEEKDAY", "0"))
+    DIGEST_PAGE_SIZE: int = int(os.getenv("DIGEST_PAGE_SIZE", "8"))
+    # Сколько дайджестов отправляется за один проход задачи
+    DIGEST_BATCH_SIZE: int = int(os.getenv("DIGEST_BATCH_SIZE", "500"))
+
+    # Рекомендации «Для вас» (app/jobs/recommendations.py)
+    RECOMMENDATIONS_INTERVAL: float = float(os.getenv("RECOMMENDATIONS_INTERVAL", "3600"))
+    RECOMMENDATIONS_SIMILAR_K: int = int(os.getenv("RECOMMENDATIONS_SIMILAR_K", "20"))
+    RECOMMENDATIONS_PER_USER: int = int(os.getenv("RECOMMENDATIONS_PER_USER", "20"))
+    # У очень активных пользователей учитываются только последние N избранных (пар N²)
+    RECOMMENDATIONS_MAX_FAVORITES: int = int(os.getenv("RECOMMENDATIONS_MAX_FAVORITES", "200"))
+    FOR_YOU_LIMIT: int = int(os.getenv("FOR_YOU_LIMIT", "5"))
+
+    # Популярность (app/models/popularity.py): за период полураспада вклад действия уменьшается вдвое
+    POPULARITY_HALF_LIFE_HOURS: float = float(os.getenv("POPULARITY_HALF_LIFE_HOURS", "72"))
+    # Вес действий: ⭐ в избранное, «Поделиться», «Подробнее»
+    POPULARITY_FAVORITE_WEIGHT: float = float(os.getenv("POPULARITY_FAVORITE_WEIGHT", "3"))
+    POPULARITY_SHARE_WEIGHT: float = float(os.getenv("POPULARITY_SHARE_WEIGHT", "2"))
+    POPULARITY_DETAILS_WEIGHT: float = float(os.getenv("POPULARITY_DETAILS_WEIGHT", "1"))
+    POPULAR_LIMIT: int = int(os.getenv("POPULAR_LIMIT", "5"))
+    # Сколько ближайших дат серии показывает «Подробнее»
+    DETAILS_DATES: int = int(os.getenv("DETAILS_DATES", "3"))
+
+settings = Settings()
@@ -0,0 +1,25 @@
+from aiohttp import web
+
+from app.core.config import settings
+
+
+async def start_health_server(role: str, port: int, ready):
+    """Поднимает /health и /ready для процесса-роли. ready — async-функция без аргументов."""
+
+    async def health(request):
+        return web.json_response({"role": role, "status": "ok"})
+
+    async def readiness(request):
+        is_ready = await ready()
+        return web.json_response(
+            {"role": role, "ready": is_ready},
+            status=200 if is_ready else 503,
+        )
+
+    app = web.Application()
+    app.router.add_get("/health", health)
+    app.router.add_get("/ready", readiness)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, settings.HEALTH_HOST, port).start()
+    return runner
@@ -0,0 +1,63 @@
+import asyncio
+import contextlib
+import logging
+
+from app.core import posters
+from app.core.config import settings
+from app.database.database import engine, async_engine, async_replica_engines, replicas
+
+logger = logging.getLogger(__name__)
+
+
+async def drain_bot(dp, timeout: float = None, bot=None) -> None:
+    """Останавливает приём апдейтов, ждёт завершения начатых обработчиков и сбрасывает их записи.
+
+    С bot подтверждает Telegram offset обработанных апдейтов: stop_polling
+    не запрашивает getUpdates после последней пачки, и без подтверждения она
+    пришла бы снова после рестарта.
+    """
+    timeout = settings.DRAIN_TIMEOUT if timeout is None else timeout
+    tracker = dp["update_tracker"]
+    with contextlib.suppress(RuntimeError):
+        await dp.stop_polling()
+    if not await tracker.drain(timeout):
+        logger.warning("%s updates still in flight after %ss drain", tracker.in_flight, timeout)
+    offset = tracker.confirm_offset()
+    if bot is not None and offset is not None:
+        try:
+            await bot.get_updates(offset=offset, limit=1, timeout=0)
+        except Exception:
+            logger.exception("Could not confirm update offset %s, handled updates may be redelivered", offset)
+    # Отложенные записи обработчиков — после того как новые перестали поступать
+    write_behind = dp.get("write_behind")
+    if write_behind is not None:
+        await write_behind.close()
+    # Последние записи лога апдейтов дописываются в gzip при закрытии
+    recorder = dp.get("update_recorder")
+    if recorder is not None:
+        recorder.close()
+
+
+async def wait_tasks(tasks, timeout: float = None) -> None:
+    timeout = settings.DRAIN_TIMEOUT if timeout is None else timeout
+    tasks = [task for task in tasks if task is not None]
+    if not tasks:
+        return
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        logger.warning("Task %s did not finish in %ss, cancelling", task.get_name(), timeout)
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def close_resources(bot=None) -> None:
+    """Закрывает сессию бота и пулы соединений; вызывается последним шагом drain."""
+    if bot is not None:
+        await bot.session.close()
+    posters.shutdown_pool()
+    await async_engine.dispose()
+    for replica in async_replica_engines:
+        await replica.dispose()
+    engine.dispose()
+    for replica in replicas.engines:
+        replica.dispose()
@@ -0,0 +1,84 @@
+"""Постеры мероприятий: варианты размеров на диске, рендер в пуле процессов.
+
+Файлы лежат в MEDIA_DIR/posters/<event_id>/<version>/<size>.jpg, где version —
+хэш содержимого загруженного изображения. Ресайз и перекодирование — CPU-работа,
+поэтому выполняются в ProcessPoolExecutor, а не в цикле событий бота или API.
+"""
+import asyncio
+import hashlib
+import multiprocessing
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+
+# Наибольшая сторона в пикселях; original — нормализованная копия загруженного файла
+VARIANTS = {"thumb": 320, "medium": 1080, "original": 2560}
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: дочерние процессы не наследуют потоки и соединения родителя
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.POSTER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
+
+
+def render_variants(data: bytes, directory: str) -> None:
+    """Выполняется в дочернем процессе."""
+    from PIL import Image, ImageOps
+
+    with Image.open(BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source).convert("RGB")
+    for name, side in VARIANTS.items():
+        variant = image.copy()
+        variant.thumbnail((side, side), Image.Resampling.LANCZOS)
+        variant.save(Path(directory) / f"{name}.jpg", "JPEG", quality=85, optimize=True, progressive=True)
+
+
+def posters_root() -> Path:
+    return Path(settings.MEDIA_DIR) / "posters"
+
+
+def poster_file(event_id: int, version: str, size: str) -> Path:
+    return posters_root() / str(event_id) / version / f"{size}.jpg"
+
+
+async def store_poster(event_id: int, data: bytes) -> str:
+    """Сохраняет варианты постера и возвращает его version; старые версии удаляются."""
+    version = hashlib.sha1(data).hexdigest()[:12]
+    event_dir = posters_root() / str(event_id)
+    target = event_dir / version
+    if not target.exists():
+        event_dir.mkdir(parents=True, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=event_dir, prefix=".tmp-")
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(get_pool(), render_variants, data, tmp)
+            Path(tmp).rename(target)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+    for old in event_dir.iterdir():
+        if old.name != version:
+            shutil.rmtree(old, ignore_errors=True)
+    return version
+
+
+def delete_posters(event_id: int) -> None:
+    shutil.rmtree(posters_root() / str(event_id), ignore_errors=True)
@@ -0,0 +1,119 @@
+"""Повторяющиеся мероприятия: правило RRULE (RFC 5545) и ленивое развёртывание.
+
+В events хранится одна строка на серию: date — первое повторение (DTSTART),
+rrule — правило без DTSTART, например FREQ=WEEKLY;BYDAY=TH. Генератор
+occurrences выдаёт повторения только внутри запрошенного окна, а
+merge_by_date сливает их с разовыми мероприятиями по дате (heapq.merge).
+Ближайшие дни дополнительно развёрнуты в event_occurrences
+(app/models/event.py) — списки, которые в них укладываются, читают их по индексу.
+"""
+import heapq
+from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import attrgetter
+from typing import Iterable, Iterator, Optional, Tuple
+
+from dateutil.rrule import rrule, rrulestr
+
+FREQUENCIES = ("YEARLY", "MONTHLY", "WEEKLY", "DAILY")
+# Длина периода частот, для которых начало серии можно переносить (см. rebase)
+PERIODS = {"WEEKLY": timedelta(weeks=1), "DAILY": timedelta(days=1)}
+
+
+def rule_parts(rule: str) -> dict:
+    return dict(part.split("=", 1) for part in rule.split(";") if "=" in part)
+
+
+def frequency(rule: str) -> Optional[str]:
+    return rule_parts(rule).get("FREQ")
+
+
+def normalize_rule(value: str) -> str:
+    """Приводит правило к виду FREQ=...;...; ValueError, если оно некорректно."""
+    rule = value.strip().upper().removeprefix("RRULE:")
+    if "DTSTART" in rule or "\n" in rule:
+        raise ValueError("Rule must not contain DTSTART: the event date is the first occurrence")
+    # Чаще раза в день — не афиша, а расписание; такие серии развёртывались бы в тысячи строк
+    if frequency(rule) not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    rrulestr(rule, dtstart=datetime(2000, 1, 1))
+    return rule
+
+
+@lru_cache(maxsize=1024)
+def parse_rule(rule: str, dtstart: datetime) -> rrule:
+    return rrulestr(rule, dtstart=dtstart)
+
+
+def last_occurrence(rule: str, dtstart: datetime) -> Optional[datetime]:
+    """Дата последнего повторения; None — серия бесконечна."""
+    if "COUNT=" not in rule and "UNTIL=" not in rule:
+        return None
+    last = dtstart
+    for last in parse_rule(rule, dtstart):
+        pass
+    return last
+
+
+def rebase(rule: str, dtstart: datetime, start: datetime) -> datetime:
+    """Начало серии, перенесённое ближе к start на целое число периодов.
+
+    rrule перебирает повторения от DTSTART, и у серии, начатой год назад,
+    каждый запрос окна проходил бы весь год. Для DAILY/WEEKLY без COUNT сдвиг
+    на целое число периодов (с запасом в один период) даёт те же повторения
+    начиная со start; для MONTHLY/YEARLY повторений в год немного.
+    """
+    parts = rule_parts(rule)
+    period = PERIODS.get(parts.get("FREQ"))
+    if period is None or "COUNT" in parts or start <= dtstart:
+        return dtstart
+    period *= int(parts.get("INTERVAL", 1))
+    return dtstart + period * max((start - dtstart) // period - 1, 0)
+
+
+@lru_cache(maxsize=1024)
+def fixed_step(rule: str) -> Optional[Tuple[timedelta, Optional[datetime]]]:
+    """(шаг, UNTIL) для правил вида FREQ=DAILY|WEEKLY[;INTERVAL=n][;UNTIL=...] — их повторения dtstart + k * шаг."""
+    parts = rule_parts(rule)
+    if parts.keys() - {"FREQ", "INTERVAL", "UNTIL"} or parts["FREQ"] not in PERIODS:
+        return None
+    until = parts.get("UNTIL")
+    if until is not None:
+        try:
+            until = datetime.strptime(until, "%Y%m%dT%H%M%S" if "T" in until else "%Y%m%d")
+        except ValueError:
+            return None
+    return PERIODS[parts["FREQ"]] * int(parts.get("INTERVAL", 1)), until
+
+
+def dates(rule: str, dtstart: datetime, start: datetime, end: Optional[datetime] = None) -> Iterator[datetime]:
+    """Даты повторений в [start, end); без end — бесконечно."""
+    fixed = fixed_step(rule)
+    if fixed is not None:
+        # Кнопки бота дают именно такие правила — считаем без rrule
+        step, until = fixed
+        date = dtstart + step * max(-((dtstart - start) // step), 0)
+        while (until is None or date <= until) and (end is None or date < end):
+            yield date
+            date += step
+        return
+    for date in parse_rule(rule, rebase(rule, dtstart, start)).xafter(start, inc=True):
+        if end is not None and date >= end:
+            return
+        yield date
+
+
+def occurrences(row, start: datetime, end: Optional[datetime] = None) -> Iterator:
+    """Повторения серии в окне — копии строки (NamedTuple) с датой повторения."""
+    return (row._replace(date=date) for date in dates(row.rrule, row.date, start, end))
+
+
+def next_occurrence(row, after: datetime):
+    """Ближайшее повторение не раньше after или None, если серия закончилась."""
+    date = next(dates(row.rrule, row.date, after), None)
+    return row._replace(date=date) if date is not None else None
+
+
+def merge_by_date(one_offs: Iterable, series: Iterable, start: datetime, end: Optional[datetime] = None) -> Iterator:
+    """Разовые мероприятия (уже отсортированы по дате) вперемешку с повторениями серий."""
+    return heapq.merge(one_offs, *(occurrences(row, start, end) for row in series), key=attrgetter("date"))
@@ -0,0 +1,56 @@
+"""64-битный SimHash названия мероприятия для поиска почти одинаковых записей.
+
+Название нормализуется (регистр, пунктуация, пробелы) и режется на символьные
+биграммы: опечатка или лишнее слово меняет лишь несколько биграмм, поэтому
+хэши похожих названий отличаются в немногих битах.
+
+Хэш делится на BANDS полос по 8 бит. Если два хэша отличаются не больше чем
+в BANDS - 1 битах, хотя бы одна полоса у них совпадает целиком — поэтому
+кандидатов можно искать точным совпадением полосы по индексу. При большем
+расстоянии совпадение полосы не гарантировано, но остаётся вероятным.
+"""
+import hashlib
+import re
+from typing import List, Tuple
+
+BITS = 64
+BANDS = 8
+BAND_BITS = BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def normalize_title(title: str) -> str:
+    # Пробелы тоже убираются: «Stand-up» и «Standup» — одно и то же
+    return re.sub(r"[\W_]", "", title.casefold().replace("ё", "е"))
+
+
+def shingles(text: str) -> List[str]:
+    if len(text) < 2:
+        return [text]
+    return [text[i:i + 2] for i in range(len(text) - 1)]
+
+
+def simhash(title: str) -> int:
+    weights = [0] * BITS
+    for shingle in shingles(normalize_title(title)):
+        value = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for bit in range(BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def bands(value: int) -> List[Tuple[int, int]]:
+    return [(band, value >> (band * BAND_BITS) & BAND_MASK) for band in range(BANDS)]
+
+
+def distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def to_signed(value: int) -> int:
+    """BIGINT в базе знаковый: старший бит хэша переносится в знак."""
+    return value - (1 << BITS) if value >> (BITS - 1) else value
+
+
+def to_unsigned(value: int) -> int:
+    return value & ((1 << BITS) - 1)
@@ -1,13 +1,264 @@
-from sqlalchemy import create_engine
+import itertools
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
 from app.core.config import settings
+from app.models.heartbeat import ReplicaHeartbeat
+
+logger = logging.getLogger(__name__)
+
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def is_sqlite(url) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def is_postgresql(url) -> bool:
+    return make_url(url).get_backend_name() == "postgresql"
+
+
+def sqlite_pragmas() -> dict:
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+
+
+def engine_options(url) -> dict:
+    """Параметры create_engine для профиля, выбранного по DATABASE_URL."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        options = {
+            # Синхронные роуты FastAPI выполняются в пуле потоков
+            "connect_args": {
+                "check_same_thread": False,
+                "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            },
+        }
+        if url.database in (None, "", ":memory:"):
+            # In-memory база живёт, пока живёт единственное соединение
+            options["poolclass"] = StaticPool
+        return options
+    if url.get_backend_name() == "postgresql":
+        return {
+            "poolclass": QueuePool,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+            "connect_args": {
+                "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}",
+            },
+        }
+    return {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+
+def async_url(url):
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()}")
+    return url.set(drivername=driver)
+
+
+def async_engine_options(url) -> dict:
+    options = engine_options(url)
+    if is_postgresql(url):
+        # asyncpg не понимает libpq-параметр options
+        options.pop("poolclass")
+        options["connect_args"] = {
+            "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)},
+        }
+    return options
+
+
+def install_sqlite_pragmas(engine, pragmas=None):
+    pragmas = pragmas or sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return engine
+
+
+def build_engine(url):
+    engine = create_engine(url, **engine_options(url))
+    if is_sqlite(url):
+        install_sqlite_pragmas(engine)
+    return engine
+
+
+def build_async_engine(url):
+    engine = create_async_engine(async_url(url), **async_engine_options(url))
+    if is_sqlite(url):
+        install_sqlite_pragmas(engine.sync_engine)
+    return engine
+
+
+def replica_options(url) -> dict:
+    """Реплика только для чтения: запись через неё невозможна даже по ошибке."""
+    options = engine_options(url)
+    if is_sqlite(url):
+        # Файл реплики подменяется копией целиком — соединения не переиспользуются
+        options["poolclass"] = NullPool
+    elif is_postgresql(url):
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS} -c default_transaction_read_only=on",
+        }
+    return options
+
+
+def build_replica_engine(url):
+    engine = create_engine(url, **replica_options(url))
+    if is_sqlite(url):
+        install_sqlite_pragmas(engine, {"query_only": "ON", "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS})
+    return engine
+
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def build_async_replica_engine(url):
+    options = async_engine_options(url)
+    if is_sqlite(url):
+        options["poolclass"] = NullPool
+    elif is_postgresql(url):
+        options["connect_args"]["server_settings"]["default_transaction_read_only"] = "on"
+    engine = create_async_engine(async_url(url), **options)
+    if is_sqlite(url):
+        install_sqlite_pragmas(engine.sync_engine, {"query_only": "ON", "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS})
+    return engine
 
-def get_db():
-    db = SessionLocal()
+
+class ReplicaSet:
+    """Реплики по кругу; отстающие дольше max_lag пропускаются.
+
+    Отставание — возраст строки replica_heartbeat на реплике (её раз в цикл
+    фоновых задач обновляет app/jobs/heartbeat.py на основной базе).
+    Проверка кэшируется на check_interval секунд.
+    """
+
+    def __init__(self, engines, max_lag: float = None, check_interval: float = None):
+        self.engines = list(engines)
+        self.max_lag = settings.REPLICA_MAX_LAG if max_lag is None else max_lag
+        self.check_interval = settings.REPLICA_LAG_CHECK_INTERVAL if check_interval is None else check_interval
+        self._order = itertools.cycle(range(len(self.engines))) if self.engines else None
+        self._checked = {}
+
+    def __bool__(self):
+        return bool(self.engines)
+
+    def lag(self, engine) -> float:
+        with engine.connect() as conn:
+            beat_at = conn.execute(select(ReplicaHeartbeat.beat_at).where(ReplicaHeartbeat.id == 1)).scalar()
+        if beat_at is None:
+            return float("inf")
+        return (datetime.utcnow() - beat_at).total_seconds()
+
+    def is_fresh(self, engine) -> bool:
+        checked_at, fresh = self._checked.get(engine, (None, False))
+        now = time.monotonic()
+        if checked_at is None or now - checked_at >= self.check_interval:
+            try:
+                fresh = self.lag(engine) <= self.max_lag
+            except Exception:
+                logger.warning("Replica %s is unavailable", engine.url, exc_info=True)
+                fresh = False
+            self._checked[engine] = (now, fresh)
+        return fresh
+
+    def pick(self):
+        for _ in range(len(self.engines)):
+            engine = self.engines[next(self._order)]
+            if self.is_fresh(engine):
+                return engine
+        return None
+
+
+class RoutingSession(Session):
+    """Чтение — с реплики, запись и всё после неё в этой сессии — с основной базы.
+
+    primary=True — сразу основная база: для чтения после собственной записи
+    в другой сессии и для чтения, от которого зависит следующая запись.
+    """
+
+    def __init__(self, *args, replicas: ReplicaSet = None, primary: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.primary = primary or not replicas
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not self.primary and (self._flushing or (clause is not None and clause.is_dml)):
+            self.primary = True
+        if not self.primary:
+            replica = self.replicas.pick()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+engine = build_engine(settings.DATABASE_URL)
+replicas = ReplicaSet(build_replica_engine(url) for url in settings.get_replica_urls())
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replicas=replicas)
+
+async_engine = build_async_engine(settings.DATABASE_URL)
+async_replica_engines = [build_async_replica_engine(url) for url in settings.get_replica_urls()]
+async_replicas = ReplicaSet(replica.sync_engine for replica in async_replica_engines)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, sync_session_class=RoutingSession,
+    autoflush=False, expire_on_commit=False, replicas=async_replicas,
+)
+
+def get_db(primary: bool = False):
+    db = SessionLocal(primary=primary)
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_primary_db():
+    """Для изменяющих роутов: проверки перед записью читают основную базу."""
+    async with AsyncSessionLocal(primary=True) as db:
+        yield db
+
+
+def ping_db() -> bool:
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+async def ping_async_db() -> bool:
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,183 @@
+"""Поиск и объединение дублей мероприятий.
+
+Дубль — мероприятие в том же городе и в тот же день, у которого SimHash
+названия (app/core/simhash.py) отличается не больше чем в DEDUP_MAX_DISTANCE
+битах. Кандидаты ищутся по индексу event_title_bands (city, day, band, value):
+читаются только записи того же дня с совпадающей полосой хэша, а не вся
+таблица events.
+
+Проверка вызывается при создании мероприятия в боте и через API (в том
+числе при пакетном импорте). Уже накопившиеся дубли объединяет пакетная задача:
+
+    python -m app.database.dedupe           # показать найденные группы
+    python -m app.database.dedupe --merge   # объединить в самое раннее мероприятие
+"""
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import aliased
+
+from app.core import posters, simhash
+from app.core.config import settings
+from app.models.event import Event, EventTitleBand
+from app.models.favorite import Favorite
+from app.models.reminder import EventReminder
+
+# Поля, которые дубль может дополнить, если у сохраняемого мероприятия они пустые
+MERGE_FIELDS = ("description", "location", "venue_id")
+
+
+def candidates_stmt(city: str, date: datetime, title: str, exclude_id: Optional[int] = None):
+    value = simhash.simhash(title)
+    stmt = (
+        select(EventTitleBand.event_id, EventTitleBand.simhash)
+        .where(
+            EventTitleBand.city == city,
+            EventTitleBand.day == date.date(),
+            or_(*(
+                and_(EventTitleBand.band == band, EventTitleBand.value == band_value)
+                for band, band_value in simhash.bands(value)
+            )),
+        )
+        .distinct()
+    )
+    if exclude_id is not None:
+        stmt = stmt.where(EventTitleBand.event_id != exclude_id)
+    return stmt, value
+
+
+def closest(rows, value: int, max_distance: int) -> Optional[int]:
+    """id ближайшего кандидата в пределах max_distance; при равенстве — более раннее мероприятие."""
+    matches = [
+        (simhash.distance(simhash.to_unsigned(candidate), value), event_id)
+        for event_id, candidate in rows
+    ]
+    matches = [match for match in matches if match[0] <= max_distance]
+    return min(matches)[1] if matches else None
+
+
+def find_duplicate(db, city: str, date: datetime, title: str, exclude_id: Optional[int] = None) -> Optional[int]:
+    stmt, value = candidates_stmt(city, date, title, exclude_id)
+    return closest(db.execute(stmt).all(), value, settings.DEDUP_MAX_DISTANCE)
+
+
+async def afind_duplicate(db, city: str, date: datetime, title: str, exclude_id: Optional[int] = None) -> Optional[int]:
+    stmt, value = candidates_stmt(city, date, title, exclude_id)
+    result = await db.execute(stmt)
+    return closest(result.all(), value, settings.DEDUP_MAX_DISTANCE)
+
+
+def fill_missing(event: Event, data: Dict) -> bool:
+    """Дополняет пустые поля event значениями из data; True, если что-то изменилось."""
+    changed = False
+    for field in MERGE_FIELDS:
+        if getattr(event, field) is None and data.get(field) is not None:
+            setattr(event, field, data[field])
+            changed = True
+    return changed
+
+
+def duplicate_groups(db) -> Dict[int, List[int]]:
+    """Все группы дублей: id самого раннего мероприятия -> id остальных."""
+    left, right = aliased(EventTitleBand), aliased(EventTitleBand)
+    # Пары кандидатов — самосоединение индекса по совпадающей полосе внутри города и дня
+    pairs = db.execute(
+        select(left.event_id, right.event_id, left.simhash, right.simhash)
+        .join(right, and_(
+            left.city == right.city,
+            left.day == right.day,
+            left.band == right.band,
+            left.value == right.value,
+            left.event_id < right.event_id,
+        ))
+        .distinct()
+    ).all()
+    parent = {}
+
+    def root(event_id):
+        while parent.get(event_id, event_id) != event_id:
+            event_id = parent[event_id]
+        return event_id
+
+    for a, b, hash_a, hash_b in pairs:
+        if simhash.distance(simhash.to_unsigned(hash_a), simhash.to_unsigned(hash_b)) <= settings.DEDUP_MAX_DISTANCE:
+            root_a, root_b = root(a), root(b)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+    groups = {}
+    for event_id in sorted(parent):
+        groups.setdefault(root(event_id), []).append(event_id)
+    return groups
+
+
+def merge_events(db, keep_id: int, duplicate_ids: List[int]) -> List[Tuple[int, str]]:
+    """Переносит избранное и напоминания на keep_id и удаляет дубли.
+
+    Возвращает постеры дублей (event_id, version), которые нужно перенести
+    к keep_id после commit — см. move_merged_poster.
+    """
+    keep = db.get(Event, keep_id)
+    moved_posters = []
+    for duplicate_id in duplicate_ids:
+        duplicate = db.get(Event, duplicate_id)
+        if duplicate is None:
+            continue
+        for model in (Favorite, EventReminder):
+            already = select(model.user_id).where(model.event_id == keep_id)
+            db.execute(
+                update(model)
+                .where(model.event_id == duplicate_id, model.user_id.not_in(already))
+                .values(event_id=keep_id)
+            )
+            db.query(model).filter(model.event_id == duplicate_id).delete(synchronize_session=False)
+        fill_missing(keep, {field: getattr(duplicate, field) for field in MERGE_FIELDS})
+        if keep.poster_version is None and duplicate.poster_version is not None:
+            keep.poster_version = duplicate.poster_version
+            keep.poster_file_id = duplicate.poster_file_id
+            moved_posters.append((duplicate_id, duplicate.poster_version))
+        db.delete(duplicate)
+    return moved_posters
+
+
+def move_merged_poster(keep_id: int, duplicate_id: int, version: str):
+    source = posters.posters_root() / str(duplicate_id) / version
+    if source.exists():
+        target = posters.posters_root() / str(keep_id) / version
+        target.parent.mkdir(parents=True, exist_ok=True)
+        source.rename(target)
+
+
+def main():
+    from app.database.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Поиск и объединение дублей мероприятий")
+    parser.add_argument("--merge", action="store_true", help="объединить найденные дубли")
+    args = parser.parse_args()
+
+    with SessionLocal(primary=True) as db:
+        groups = duplicate_groups(db)
+        titles = dict(db.execute(
+            select(Event.id, Event.title).where(Event.id.in_([*groups, *(i for ids in groups.values() for i in ids)]))
+        ).all())
+        for keep_id, duplicate_ids in groups.items():
+            print(f"{keep_id} {titles[keep_id]!r} <- " + ", ".join(f"{i} {titles[i]!r}" for i in duplicate_ids))
+        if not args.merge:
+            print(f"{len(groups)} groups, {sum(map(len, groups.values()))} duplicates (run with --merge to merge)")
+            return
+        # Одна транзакция на группу: прерванный запуск можно просто повторить
+        merged = 0
+        for keep_id, duplicate_ids in groups.items():
+            moved_posters = merge_events(db, keep_id, duplicate_ids)
+            db.commit()
+            for duplicate_id, version in moved_posters:
+                move_merged_poster(keep_id, duplicate_id, version)
+            for duplicate_id in duplicate_ids:
+                posters.delete_posters(duplicate_id)
+            merged += len(duplicate_ids)
+        print(f"Merged {merged} duplicates into {len(groups)} events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Поиск «рядом со мной» по заведениям с координатами.
+
+Сначала выборка сужается прямоугольником вокруг точки по индексу
+(latitude, longitude), затем оставшиеся строки точно ранжируются
+по расстоянию haversine в Python.
+"""
+import heapq
+import math
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+
+from app.database.read_models import afetch, fetch, one_off, series_active, upcoming_occurrences
+from app.models.event import Event
+from app.models.promotion import Promotion
+from app.models.venue import Venue
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+class NearbyEvent(NamedTuple):
+    id: int
+    title: str
+    date: datetime
+    location: Optional[str]
+    description: Optional[str]
+    latitude: float
+    longitude: float
+    rrule: Optional[str]
+
+
+class NearbyPromotion(NamedTuple):
+    id: int
+    title: str
+    description: Optional[str]
+    venue: Optional[str]
+    end_date: datetime
+    latitude: float
+    longitude: float
+
+
+class VenueRecord(NamedTuple):
+    """Полная запись для API (совпадает с VenueInDB)."""
+    id: int
+    name: str
+    address: Optional[str]
+    latitude: float
+    longitude: float
+    created_at: datetime
+    updated_at: datetime
+
+
+VENUE_RECORD_COLUMNS = (
+    Venue.id, Venue.name, Venue.address, Venue.latitude, Venue.longitude, Venue.created_at, Venue.updated_at,
+)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float):
+    """Прямоугольник, гарантированно содержащий круг радиуса radius_km."""
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(lat))
+    min_lat, max_lat = lat - d_lat, lat + d_lat
+    if cos_lat < 1e-6 or min_lat <= -90 or max_lat >= 90:
+        # У полюса круг охватывает все долготы
+        return max(min_lat, -90.0), min(max_lat, 90.0), None, None
+    d_lon = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+    min_lon, max_lon = lon - d_lon, lon + d_lon
+    if min_lon < -180 or max_lon > 180:
+        # Пересечение 180-го меридиана — по долготе не ограничиваем
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def within_box(lat: float, lon: float, radius_km: float):
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    condition = Venue.latitude.between(min_lat, max_lat)
+    if min_lon is not None:
+        condition = and_(condition, Venue.longitude.between(min_lon, max_lon))
+    return condition
+
+
+def rank_by_distance(rows: Iterable, lat: float, lon: float, radius_km: float, limit: int, order=None) -> List[Tuple]:
+    """Ближайшие limit строк в радиусе: [(row, distance_km), ...]. order — доп. ключ при равном расстоянии."""
+    scored = (
+        (row, haversine_km(lat, lon, row.latitude, row.longitude))
+        for row in rows
+    )
+    return heapq.nsmallest(
+        limit,
+        ((row, distance) for row, distance in scored if distance <= radius_km),
+        key=lambda item: (item[1], order(item[0]) if order else 0),
+    )
+
+
+def nearby_events(db, lat: float, lon: float, radius_km: float, limit: int, now: Optional[datetime] = None):
+    now = now or datetime.utcnow()
+    stmt = (
+        select(
+            Event.id, Event.title, Event.date,
+            func.coalesce(Event.location, Venue.name), Event.description,
+            Venue.latitude, Venue.longitude, Event.rrule,
+        )
+        .join(Venue, Venue.id == Event.venue_id)
+        .where(within_box(lat, lon, radius_km), or_(and_(one_off(), Event.date >= now), series_active(now)))
+    )
+    rows = upcoming_occurrences(fetch(db, stmt, NearbyEvent), now)
+    return rank_by_distance(rows, lat, lon, radius_km, limit, order=lambda row: row.date)
+
+
+def nearby_promotions(db, lat: float, lon: float, radius_km: float, limit: int, now: Optional[datetime] = None):
+    now = now or datetime.utcnow()
+    stmt = (
+        select(
+            Promotion.id, Promotion.title, Promotion.description,
+            func.coalesce(Promotion.venue, Venue.name), Promotion.end_date,
+            Venue.latitude, Venue.longitude,
+        )
+        .join(Venue, Venue.id == Promotion.venue_id)
+        .where(
+            within_box(lat, lon, radius_km),
+            Promotion.is_active == True,
+            Promotion.start_date <= now,
+            Promotion.end_date >= now,
+        )
+    )
+    return rank_by_distance(fetch(db, stmt, NearbyPromotion), lat, lon, radius_km, limit, order=lambda row: row.end_date)
+
+
+async def nearby_venues(db, lat: float, lon: float, radius_km: float, limit: int):
+    stmt = select(*VENUE_RECORD_COLUMNS).where(within_box(lat, lon, radius_km))
+    return rank_by_distance(await afetch(db, stmt, VenueRecord), lat, lon, radius_km, limit)
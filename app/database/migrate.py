@@ -0,0 +1,39 @@
+"""Применение миграций Alembic: один раз при деплое, до старта процессов.
+
+    python -m app.database.migrate
+"""
+import os
+
+from sqlalchemy import inspect
+
+from app.core.config import settings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Ревизия, совпадающая со схемой, которую раньше создавал Base.metadata.create_all
+BASELINE_REVISION = "0001"
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT, "migrations"))
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def upgrade_head():
+    from alembic import command
+    from app.database.database import engine
+
+    config = alembic_config()
+    tables = set(inspect(engine).get_table_names())
+    if "alembic_version" not in tables and "events" in tables:
+        # База создана до появления миграций через create_all
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+
+
+if __name__ == "__main__":
+    upgrade_head()
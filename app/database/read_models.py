@@ -0,0 +1,332 @@
+"""Read-модели для списков: только нужные колонки, без ORM-сущностей.
+
+Запросы выбирают колонки (select(Event.id, Event.title, ...)) и упаковывают
+строки в NamedTuple, поэтому не создаются identity map, отслеживание
+изменений и lazy-load состояние на каждый объект.
+
+Повторения серий (Event.rrule, app/core/recurrence.py) выбираются отдельным
+запросом и развёртываются лениво — только внутри окна списка. Ближайшие дни
+(OccurrenceHorizon) уже развёрнуты в event_occurrences: списки, которые в них
+укладываются, читают повторения по индексу (city, date) и сливают с разовыми.
+"""
+import heapq
+from collections import Counter
+from datetime import date, datetime, time
+from itertools import islice
+from operator import attrgetter
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import and_, case, func, or_, select
+
+from app.core import recurrence
+from app.models.change_log import ChangeLog
+from app.models.event import Event, EventDayCount, EventOccurrence, horizon_stmt
+from app.models.favorite import Favorite
+from app.models.popularity import EventPopularity
+from app.models.promotion import Promotion
+from app.models.recommendation import UserRecommendation
+
+
+class EventRow(NamedTuple):
+    id: int
+    title: str
+    date: datetime
+    location: Optional[str]
+    description: Optional[str]
+    poster_file_id: Optional[str]
+    poster_version: Optional[str]
+    rrule: Optional[str]
+
+
+class EventRecord(NamedTuple):
+    """Полная запись для API (совпадает с EventInDB)."""
+    id: int
+    title: str
+    description: Optional[str]
+    date: datetime
+    location: Optional[str]
+    venue_id: Optional[int]
+    poster_version: Optional[str]
+    city: str
+    rrule: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+class PromotionRow(NamedTuple):
+    id: int
+    title: str
+    description: Optional[str]
+    venue: Optional[str]
+    end_date: datetime
+
+
+class DigestItem(NamedTuple):
+    """Строка дайджеста: мероприятие (date — ближайшая дата) или акция (date — конец действия)."""
+    seq: int
+    kind: str
+    id: int
+    title: str
+    date: datetime
+    place: Optional[str]
+
+
+EVENT_ROW_COLUMNS = (
+    Event.id, Event.title, Event.date, Event.location, Event.description, Event.poster_file_id, Event.poster_version,
+    Event.rrule,
+)
+EVENT_RECORD_COLUMNS = (
+    Event.id, Event.title, Event.description, Event.date, Event.location, Event.venue_id, Event.poster_version,
+    Event.city, Event.rrule, Event.created_at, Event.updated_at,
+)
+PROMOTION_ROW_COLUMNS = (Promotion.id, Promotion.title, Promotion.description, Promotion.venue, Promotion.end_date)
+
+
+def fetch(db, stmt, row_type) -> list:
+    return [row_type._make(row) for row in db.execute(stmt)]
+
+
+async def afetch(db, stmt, row_type) -> list:
+    result = await db.execute(stmt)
+    return [row_type._make(row) for row in result]
+
+
+def one_off():
+    return Event.rrule.is_(None)
+
+
+def series_active(start: datetime, end: Optional[datetime] = None):
+    """Серии, у которых могут быть повторения в [start, end)."""
+    condition = and_(Event.rrule.is_not(None), or_(Event.recurrence_end.is_(None), Event.recurrence_end >= start))
+    return and_(condition, Event.date < end) if end is not None else condition
+
+
+def series_stmt(columns, city: str, start: datetime, end: Optional[datetime] = None):
+    return select(*columns).where(Event.city == city, series_active(start, end))
+
+
+def occurrences_stmt(columns, city: str, start: datetime, end: datetime):
+    """Готовые повторения серий города в [start, end) — строки с датой повторения."""
+    columns = [EventOccurrence.date if column is Event.date else column for column in columns]
+    return (
+        select(*columns)
+        .select_from(EventOccurrence)
+        .join(Event, Event.id == EventOccurrence.event_id)
+        .where(EventOccurrence.city == city, EventOccurrence.date >= start, EventOccurrence.date < end)
+        .order_by(EventOccurrence.date, EventOccurrence.event_id)
+    )
+
+
+def covers(horizon, start: datetime) -> bool:
+    """Начало списка внутри окна event_occurrences (строка horizon_stmt)."""
+    return horizon is not None and horizon.until is not None and horizon.since <= start < horizon.until
+
+
+def merge_materialized(
+    one_offs: List, occurrences: List, until: datetime, limit: Optional[int] = None, end: Optional[datetime] = None,
+) -> Optional[List]:
+    """Разовые вперемешку с готовыми повторениями; None — список выходит за окно (until)."""
+    rows = list(islice(heapq.merge(one_offs, occurrences, key=attrgetter("date")), limit))
+    if end is not None and end <= until:
+        return rows
+    # Без конца списка ответ верен, если все limit строк — внутри окна
+    if limit is not None and len(rows) == limit and rows[-1].date < until:
+        return rows
+    return None
+
+
+def upcoming_occurrences(rows: List, now: datetime) -> List:
+    """Серии заменяются ближайшим повторением; закончившиеся отбрасываются."""
+    rows = [recurrence.next_occurrence(row, now) if row.rrule else row for row in rows]
+    return [row for row in rows if row is not None]
+
+
+def sort_by_date(rows: List, now: datetime) -> List:
+    """Списки без окна (категория, избранное): серия — ближайшим повторением, закончившаяся — первым."""
+    rows = [(recurrence.next_occurrence(row, now) or row) if row.rrule else row for row in rows]
+    return sorted(rows, key=lambda row: row.date)
+
+
+def upcoming_events(db, city: str, limit: int = 5, now: Optional[datetime] = None) -> List[EventRow]:
+    now = now or datetime.utcnow()
+    stmt = (
+        select(*EVENT_ROW_COLUMNS)
+        .where(Event.city == city, one_off(), Event.date >= now)
+        .order_by(Event.date)
+        .limit(limit)
+    )
+    one_offs = fetch(db, stmt, EventRow)
+    horizon = db.execute(horizon_stmt()).first()
+    if covers(horizon, now):
+        stmt = occurrences_stmt(EVENT_ROW_COLUMNS, city, now, horizon.until).limit(limit)
+        rows = merge_materialized(one_offs, fetch(db, stmt, EventRow), horizon.until, limit=limit)
+        if rows is not None:
+            return rows
+    series = fetch(db, series_stmt(EVENT_ROW_COLUMNS, city, now), EventRow)
+    return list(islice(recurrence.merge_by_date(one_offs, series, now), limit))
+
+
+def events_between(db, city: str, start: datetime, end: datetime) -> List[EventRow]:
+    stmt = (
+        select(*EVENT_ROW_COLUMNS)
+        .where(Event.city == city, one_off(), Event.date >= start, Event.date < end)
+        .order_by(Event.date)
+    )
+    one_offs = fetch(db, stmt, EventRow)
+    horizon = db.execute(horizon_stmt()).first()
+    if covers(horizon, start) and end <= horizon.until:
+        occurrences = fetch(db, occurrences_stmt(EVENT_ROW_COLUMNS, city, start, end), EventRow)
+        return merge_materialized(one_offs, occurrences, horizon.until, end=end)
+    series = fetch(db, series_stmt(EVENT_ROW_COLUMNS, city, start, end), EventRow)
+    return list(recurrence.merge_by_date(one_offs, series, start, end))
+
+
+def event_days(db, city: str, start: date, end: date) -> Dict[date, int]:
+    """Дни с мероприятиями города в [start, end).
+
+    Разовые мероприятия — из таблицы счётчиков, без обращения к events;
+    к ним добавляются повторения серий внутри окна.
+    """
+    stmt = (
+        select(EventDayCount.day, EventDayCount.count)
+        .where(
+            EventDayCount.city == city,
+            EventDayCount.day >= start,
+            EventDayCount.day < end,
+            EventDayCount.count > 0,
+        )
+    )
+    days = Counter(dict(db.execute(stmt).all()))
+    window = datetime.combine(start, time.min), datetime.combine(end, time.min)
+    for rule, first in db.execute(series_stmt((Event.rrule, Event.date), city, *window)):
+        days.update(occurrence.date() for occurrence in recurrence.dates(rule, first, *window))
+    return dict(days)
+
+
+def events_by_category(db, city: str, category: str, now: Optional[datetime] = None) -> List[EventRow]:
+    """Серии показываются ближайшим повторением (или первым, если их ещё нет)."""
+    now = now or datetime.utcnow()
+    stmt = (
+        select(*EVENT_ROW_COLUMNS)
+        .where(Event.city == city, Event.description.ilike(f"%{category}%"))
+        .order_by(Event.date)
+    )
+    return sort_by_date(fetch(db, stmt, EventRow), now)
+
+
+def search_events(db, city: str, query: str, limit: int, now: Optional[datetime] = None) -> List[EventRow]:
+    """Предстоящие мероприятия города по подстроке названия: сначала совпадения с начала, затем по дате."""
+    now = now or datetime.utcnow()
+    stmt = select(*EVENT_ROW_COLUMNS).where(Event.city == city, one_off(), Event.date >= now)
+    series = series_stmt(EVENT_ROW_COLUMNS, city, now)
+    prefix = query.casefold()
+    if prefix:
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        matches = Event.title_folded.like(f"%{pattern}%", escape="\\")
+        stmt = stmt.where(matches).order_by(case((Event.title_folded.like(f"{pattern}%", escape="\\"), 0), else_=1))
+        series = series.where(matches)
+    rows = fetch(db, stmt.order_by(Event.date).limit(limit), EventRow)
+    rows += upcoming_occurrences(fetch(db, series, EventRow), now)
+    # Дата серии в базе — первое повторение, поэтому серии встают на место уже после развёртывания
+    rows.sort(key=lambda row: (not row.title.casefold().startswith(prefix), row.date))
+    return rows[:limit]
+
+
+def all_events(db, city: str) -> List[EventRow]:
+    return fetch(db, select(*EVENT_ROW_COLUMNS).where(Event.city == city).order_by(Event.date), EventRow)
+
+
+def favorite_events(db, user_id: int, now: Optional[datetime] = None) -> List[EventRow]:
+    now = now or datetime.utcnow()
+    stmt = (
+        select(*EVENT_ROW_COLUMNS)
+        .join(Favorite, Favorite.event_id == Event.id)
+        .where(Favorite.user_id == user_id)
+        .order_by(Event.date)
+    )
+    return sort_by_date(fetch(db, stmt, EventRow), now)
+
+
+def recommended_events(db, user_id: int, city: str, limit: int, now: Optional[datetime] = None) -> List[EventRow]:
+    """Готовая подборка из user_recommendations; прошедшие и из других городов отбрасываются."""
+    now = now or datetime.utcnow()
+    stmt = (
+        select(*EVENT_ROW_COLUMNS)
+        .join(UserRecommendation, UserRecommendation.event_id == Event.id)
+        .where(
+            UserRecommendation.user_id == user_id,
+            Event.city == city,
+            or_(and_(one_off(), Event.date >= now), series_active(now)),
+        )
+        .order_by(UserRecommendation.rank)
+        .limit(limit)
+    )
+    return upcoming_occurrences(fetch(db, stmt, EventRow), now)
+
+
+def popular_events(db, city: str, limit: int, now: Optional[datetime] = None) -> List[EventRow]:
+    """Предстоящие мероприятия города по убыванию популярности — обход индекса (city, score) event_popularity."""
+    now = now or datetime.utcnow()
+    stmt = (
+        select(*EVENT_ROW_COLUMNS)
+        .join(EventPopularity, EventPopularity.event_id == Event.id)
+        .where(
+            EventPopularity.city == city,
+            Event.city == city,
+            or_(and_(one_off(), Event.date >= now), series_active(now)),
+        )
+        .order_by(EventPopularity.score.desc())
+        .limit(limit)
+    )
+    return upcoming_occurrences(fetch(db, stmt, EventRow), now)
+
+
+def active_promotions(db, city: str) -> List[PromotionRow]:
+    stmt = (
+        select(*PROMOTION_ROW_COLUMNS)
+        .where(Promotion.city == city, Promotion.is_active == True)
+        .order_by(Promotion.end_date)
+    )
+    return fetch(db, stmt, PromotionRow)
+
+
+def all_promotions(db, city: str) -> List[PromotionRow]:
+    stmt = select(*PROMOTION_ROW_COLUMNS).where(Promotion.city == city).order_by(Promotion.start_date)
+    return fetch(db, stmt, PromotionRow)
+
+
+def digest_items(db, city: str, after_seq: int, until_seq: int, now: Optional[datetime] = None) -> List[DigestItem]:
+    """Предстоящие мероприятия и действующие акции города, добавленные или изменённые в (after_seq, until_seq].
+
+    seq строки — последнее изменение записи: один запрос на диапазон журнала
+    обслуживает всех пользователей, у которых курсор не меньше after_seq.
+    """
+    now = now or datetime.utcnow()
+    changes = (
+        select(ChangeLog.entity, ChangeLog.entity_id, func.max(ChangeLog.seq).label("seq"))
+        .where(ChangeLog.seq > after_seq, ChangeLog.seq <= until_seq, ChangeLog.op == "upsert")
+        .group_by(ChangeLog.entity, ChangeLog.entity_id)
+        .subquery()
+    )
+    events = db.execute(
+        select(changes.c.seq, Event.id, Event.title, Event.date, Event.location, Event.rrule)
+        .join(changes, and_(changes.c.entity == "event", changes.c.entity_id == Event.id))
+        .where(Event.city == city, or_(and_(one_off(), Event.date >= now), series_active(now)))
+    ).all()
+    promotions = db.execute(
+        select(changes.c.seq, Promotion.id, Promotion.title, Promotion.end_date, Promotion.venue)
+        .join(changes, and_(changes.c.entity == "promotion", changes.c.entity_id == Promotion.id))
+        .where(Promotion.city == city, Promotion.is_active == True, Promotion.end_date >= now)
+    ).all()
+    items = []
+    for seq, event_id, title, date, location, rule in events:
+        date = next(recurrence.dates(rule, date, now), None) if rule else date
+        if date is not None:
+            items.append(DigestItem(seq, "event", event_id, title, date, location))
+    items.sort(key=lambda item: item.date)
+    items += sorted(
+        (DigestItem(seq, "promotion", promotion_id, title, end_date, venue)
+         for seq, promotion_id, title, end_date, venue in promotions),
+        key=lambda item: item.date,
+    )
+    return items
@@ -0,0 +1,51 @@
+"""Реплика SQLite для локальной проверки чтения с реплик: периодическая копия файла базы.
+
+    python -m app.database.sqlite_replica ./replica.db --interval 5
+    DATABASE_REPLICA_URLS=sqlite:///./replica.db python main.py
+
+Копия снимается через backup API (согласованный снимок даже при записи в
+основную базу) во временный файл и атомарно подменяет файл реплики.
+Отставание реплики — до interval секунд плюс период heartbeat.
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import time
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def copy_database(source: str, target: str):
+    tmp = f"{target}.tmp"
+    with sqlite3.connect(source) as src, sqlite3.connect(tmp) as dst:
+        src.backup(dst)
+        # Реплика открывается только на чтение — WAL-файлы ей не нужны
+        dst.execute("PRAGMA journal_mode=DELETE")
+    os.replace(tmp, target)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("target", help="путь к файлу реплики")
+    parser.add_argument("--interval", type=float, default=5.0)
+    parser.add_argument("--once", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    source = make_url(settings.DATABASE_URL).database
+    while True:
+        started = time.perf_counter()
+        copy_database(source, args.target)
+        logger.info("Copied %s -> %s in %.3fs", source, args.target, time.perf_counter() - started)
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
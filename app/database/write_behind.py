@@ -0,0 +1,285 @@
+"""Отложенная запись мелких изменений из бота: избранное, отзывы, язык, город, подписка, популярность.
+
+Обработчик кладёт изменение в буфер и сразу отвечает; буфер пишется в базу
+одной транзакцией, когда набирается WRITE_BEHIND_MAX_PENDING изменений или
+проходит WRITE_BEHIND_FLUSH_INTERVAL секунд. Повторы схлопываются: одна пара
+«пользователь — мероприятие», один язык и город (последние) на пользователя,
+одно приращение популярности на мероприятие (app/models/popularity.py).
+
+Если batch не записался, изменения пишутся по одному: то, что база
+отвергает само по себе, отбрасывается с записью в лог, остальное доходит
+до базы. Если не записалось ничего (база недоступна), batch возвращается
+в буфер и повторяется целиком, но не дольше WRITE_BEHIND_MAX_RETRIES
+сбросов подряд.
+
+Чтение своих записей: пока изменение не в базе, его видно через методы
+буфера (has_favorite, lang, city, is_subscribed). При остановке бота буфер
+сбрасывается в drain (app/core/lifecycle.py); изменения последнего интервала
+теряются только при аварийном завершении процесса.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.core.config import settings
+from app.models.digest import add_default_preferences
+from app.models.event import Event
+from app.models.favorite import Favorite
+from app.models.feedback import Feedback
+from app.models.popularity import add_scores, log_weight, logaddexp
+from app.models.subscriber import Subscriber
+from app.models.user_lang import UserLang
+
+logger = logging.getLogger(__name__)
+
+
+class Batch:
+    def __init__(self):
+        # dict вместо set — сохраняет порядок добавления
+        self.favorites = {}
+        self.subscribers = {}
+        self.langs = {}
+        self.cities = {}
+        self.feedback = []
+        # event_id → log суммы взвешенных действий (⭐ учитываются при записи избранного)
+        self.popularity = {}
+
+    def __len__(self):
+        return (
+            len(self.favorites) + len(self.subscribers) + len(self.langs) + len(self.cities) + len(self.feedback)
+            + len(self.popularity)
+        )
+
+    def merge_older(self, older: "Batch"):
+        """Возвращает в буфер неудачно записанный batch; более новые изменения важнее."""
+        self.favorites = {**self.favorites, **older.favorites}
+        self.subscribers = {**self.subscribers, **older.subscribers}
+        self.langs = {**older.langs, **self.langs}
+        self.cities = {**older.cities, **self.cities}
+        self.feedback = older.feedback + self.feedback
+        for event_id, score in older.popularity.items():
+            self.popularity[event_id] = logaddexp(self.popularity.get(event_id), score)
+
+    def split(self):
+        """Batch по одному изменению — чтобы отделить то, что не записывается."""
+        for name in ("favorites", "subscribers", "langs", "cities", "popularity"):
+            for key, value in getattr(self, name).items():
+                batch = Batch()
+                setattr(batch, name, {key: value})
+                yield batch
+        for item in self.feedback:
+            batch = Batch()
+            batch.feedback = [item]
+            yield batch
+
+    def __repr__(self):
+        return repr({name: value for name, value in vars(self).items() if value})
+
+
+def upsert(connection, table, rows, key, update=None):
+    insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(table)
+    if update:
+        stmt = stmt.on_conflict_do_update(index_elements=[key], set_={column: stmt.excluded[column] for column in update})
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[key])
+    connection.execute(stmt, rows)
+
+
+def write_batch(session_factory, batch: Batch):
+    now = datetime.utcnow()
+    popularity = dict(batch.popularity)
+    with session_factory(primary=True) as db:
+        if batch.favorites:
+            users = {user_id for user_id, _ in batch.favorites}
+            # У favorites нет уникального ключа — отсеиваем уже сохранённые пары
+            existing = set(db.execute(
+                select(Favorite.user_id, Favorite.event_id).where(Favorite.user_id.in_(users))
+            ).all())
+            # Мероприятие могли удалить, пока изменение ждало в буфере
+            events = set(db.execute(
+                select(Event.id).where(Event.id.in_({event_id for _, event_id in batch.favorites}))
+            ).scalars())
+            rows = [
+                {"user_id": user_id, "event_id": event_id, "created_at": created_at, "updated_at": created_at}
+                for (user_id, event_id), created_at in batch.favorites.items()
+                if (user_id, event_id) not in existing and event_id in events
+            ]
+            if rows:
+                db.execute(Favorite.__table__.insert(), rows)
+            # Популярность растёт только от новых избранных, повторное ⭐ не считается
+            for row in rows:
+                increment = log_weight(settings.POPULARITY_FAVORITE_WEIGHT, row["created_at"])
+                popularity[row["event_id"]] = logaddexp(popularity.get(row["event_id"]), increment)
+        if batch.feedback:
+            db.execute(Feedback.__table__.insert(), [
+                {"user_id": user_id, "message": message, "created_at": created_at, "updated_at": created_at}
+                for user_id, message, created_at in batch.feedback
+            ])
+        connection = db.connection()
+        if batch.subscribers:
+            upsert(connection, Subscriber.__table__, [
+                {"user_id": user_id, "city": city, "created_at": created_at, "updated_at": created_at}
+                for user_id, (city, created_at) in batch.subscribers.items()
+            ], "user_id")
+            add_default_preferences(connection, batch.subscribers, now)
+        if batch.langs:
+            upsert(connection, UserLang.__table__, [
+                {"user_id": user_id, "lang": lang, "created_at": now, "updated_at": now}
+                for user_id, lang in batch.langs.items()
+            ], "user_id", update=("lang", "updated_at"))
+        if batch.cities:
+            upsert(connection, UserLang.__table__, [
+                {"user_id": user_id, "city": city, "created_at": now, "updated_at": now}
+                for user_id, city in batch.cities.items()
+            ], "user_id", update=("city", "updated_at"))
+            # Подписка переезжает вместе с пользователем — рассылки идут по городу подписчика
+            connection.execute(
+                update(Subscriber.__table__)
+                .where(Subscriber.user_id == bindparam("target_user_id"))
+                .values(city=bindparam("new_city"), updated_at=now),
+                [{"target_user_id": user_id, "new_city": city} for user_id, city in batch.cities.items()],
+            )
+        if popularity:
+            add_scores(connection, popularity, now)
+        db.commit()
+
+
+class WriteBehind:
+    def __init__(self, session_factory, max_pending: int = None, flush_interval: float = None):
+        self.session_factory = session_factory
+        self.max_pending = settings.WRITE_BEHIND_MAX_PENDING if max_pending is None else max_pending
+        self.flush_interval = settings.WRITE_BEHIND_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self._pending = Batch()
+        # Записывается прямо сейчас: ещё не в базе, но уже не в _pending
+        self._inflight = Batch()
+        self._lock = asyncio.Lock()
+        # Сбросы подряд, не записавшие ни одного изменения
+        self._failures = 0
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _added(self):
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    def add_favorite(self, user_id: int, event_id: int):
+        self._pending.favorites.setdefault((user_id, event_id), datetime.utcnow())
+        self._added()
+
+    def add_feedback(self, user_id: int, message: str):
+        if not message:
+            raise ValueError("Feedback message is empty")
+        self._pending.feedback.append((user_id, message, datetime.utcnow()))
+        self._added()
+
+    def add_subscriber(self, user_id: int, city: str):
+        self._pending.subscribers.setdefault(user_id, (city, datetime.utcnow()))
+        self._added()
+
+    def set_lang(self, user_id: int, lang: str):
+        self._pending.langs[user_id] = lang
+        self._added()
+
+    def set_city(self, user_id: int, city: str):
+        self._pending.cities[user_id] = city
+        self._added()
+
+    def add_hit(self, event_id: int, weight: float):
+        """Действие с мероприятием для рейтинга популярности: «Подробнее», «Поделиться»."""
+        increment = log_weight(weight, datetime.utcnow())
+        self._pending.popularity[event_id] = logaddexp(self._pending.popularity.get(event_id), increment)
+        self._added()
+
+    def has_favorite(self, user_id: int, event_id: int) -> bool:
+        key = (user_id, event_id)
+        return key in self._pending.favorites or key in self._inflight.favorites
+
+    def has_pending_favorites(self, user_id: int) -> bool:
+        return any(
+            pending_user == user_id
+            for batch in (self._pending, self._inflight)
+            for pending_user, _ in batch.favorites
+        )
+
+    def is_subscribed(self, user_id: int) -> bool:
+        return user_id in self._pending.subscribers or user_id in self._inflight.subscribers
+
+    def lang(self, user_id: int) -> Optional[str]:
+        return self._pending.langs.get(user_id) or self._inflight.langs.get(user_id)
+
+    def city(self, user_id: int) -> Optional[str]:
+        return self._pending.cities.get(user_id) or self._inflight.cities.get(user_id)
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending:
+                return
+            self._inflight, self._pending = self._pending, Batch()
+            self._wakeup.clear()
+            try:
+                await asyncio.to_thread(write_batch, self.session_factory, self._inflight)
+                self._failures = 0
+            except Exception:
+                logger.exception("Write-behind flush of %s changes failed", len(self._inflight))
+                if 0 < self._failures < settings.WRITE_BEHIND_MAX_RETRIES:
+                    # База всё ещё недоступна — не перебираем изменения по одному на каждом сбросе
+                    self._failures += 1
+                    self._pending.merge_older(self._inflight)
+                else:
+                    await self._write_separately()
+            finally:
+                self._inflight = Batch()
+
+    async def _write_separately(self):
+        failed, written = [], 0
+        for batch in self._inflight.split():
+            try:
+                await asyncio.to_thread(write_batch, self.session_factory, batch)
+                written += 1
+            except Exception:
+                failed.append(batch)
+        if not written and self._failures < settings.WRITE_BEHIND_MAX_RETRIES:
+            # Не записалось ничего — скорее всего, недоступна база: повторим весь batch
+            self._failures += 1
+            self._pending.merge_older(self._inflight)
+            return
+        # Остальное записалось — эти изменения база не примет и при повторе (или повторы исчерпаны)
+        self._failures = 0
+        for batch in failed:
+            logger.error("Write-behind dropped a change that could not be written: %r", batch)
+
+    async def run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def start(self):
+        # Корутина: синхронный обработчик startup aiogram вызывает в отдельном потоке, без цикла событий
+        self._closing = False
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(), name="write_behind")
+
+    async def close(self):
+        """Останавливает фоновый сброс и записывает всё, что осталось в буфере."""
+        # Без cancel: начатая запись должна дойти до commit
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+        if self._pending:
+            logger.error("Write-behind lost %s changes on shutdown", len(self._pending))
@@ -0,0 +1,109 @@
+import asyncio
+import contextlib
+import logging
+from datetime import datetime
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError, TelegramBadRequest, TelegramRetryAfter
+
+from app.bot.i18n import DEFAULT_LANG, t
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.models.broadcast import BroadcastJob
+from app.models.subscriber import Subscriber
+from app.models.user_lang import UserLang
+
+logger = logging.getLogger(__name__)
+
+# Время (loop.time()) следующей отправки: рассылки, напоминания и дайджесты идут параллельно,
+# а BROADCAST_RATE — общий предел на бота
+_next_send_at = 0.0
+
+
+async def wait_send_slot():
+    global _next_send_at
+    now = asyncio.get_running_loop().time()
+    at = max(now, _next_send_at)
+    _next_send_at = at + 1 / settings.BROADCAST_RATE
+    if at > now:
+        await asyncio.sleep(at - now)
+
+
+async def send_with_retry(
+    bot: Bot, user_id: int, text: str, reply_markup=None, stop: Optional[asyncio.Event] = None,
+) -> Optional[bool]:
+    """True — отправлено, False — чат недоступен, None — остановка пришла во время ожидания retry_after."""
+    while True:
+        await wait_send_slot()
+        try:
+            await bot.send_message(user_id, text, reply_markup=reply_markup)
+            return True
+        except TelegramRetryAfter as e:
+            if stop is None:
+                await asyncio.sleep(e.retry_after)
+                continue
+            # Ожидание прерывается остановкой: retry_after бывает в десятки секунд
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), timeout=e.retry_after)
+            if stop.is_set():
+                return None
+        except (TelegramForbiddenError, TelegramBadRequest):
+            # Пользователь заблокировал бота или чат недоступен
+            return False
+
+
+async def run_broadcast(bot: Bot, job_id: int, stop: asyncio.Event):
+    with SessionLocal(primary=True) as db:
+        job = db.get(BroadcastJob, job_id)
+        job.status = "running"
+        job.started_at = job.started_at or datetime.utcnow()
+        db.commit()
+        # Продолжаем с сохранённого курсора, чтобы после рестарта не слать повторно
+        recipients = (
+            db.query(Subscriber.id, Subscriber.user_id)
+            .filter(Subscriber.city == job.city, Subscriber.id > job.cursor)
+            .order_by(Subscriber.id)
+            .all()
+        )
+
+        unsaved = 0
+        for subscriber_id, user_id in recipients:
+            if stop.is_set():
+                break
+            sent = await send_with_retry(bot, user_id, f"📢 {job.text}", stop=stop)
+            if sent is None:
+                # Не отправлено — курсор остаётся, получатель будет первым после рестарта
+                break
+            if sent:
+                job.sent_count += 1
+            job.cursor = subscriber_id
+            unsaved += 1
+            if unsaved >= settings.BROADCAST_CHECKPOINT_EVERY:
+                db.commit()
+                unsaved = 0
+
+        if stop.is_set():
+            # Чекпоинт: незавершённая рассылка продолжится с cursor в следующем процессе
+            db.commit()
+            logger.info("Broadcast %s paused at subscriber %s", job.id, job.cursor)
+            return
+        job.status = "done"
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        logger.info("Broadcast %s done, sent %s", job.id, job.sent_count)
+        lang = db.query(UserLang.lang).filter_by(user_id=job.created_by).scalar() or DEFAULT_LANG
+        await send_with_retry(bot, job.created_by, t(lang, "broadcast_done", count=job.sent_count), stop=stop)
+
+
+async def process_broadcasts(bot: Bot, stop: asyncio.Event):
+    with SessionLocal(primary=True) as db:
+        job_ids = [
+            job_id for (job_id,) in db.query(BroadcastJob.id)
+            .filter(BroadcastJob.status.in_(("pending", "running")))
+            .order_by(BroadcastJob.id)
+        ]
+    for job_id in job_ids:
+        if stop.is_set():
+            return
+        await run_broadcast(bot, job_id, stop)
@@ -0,0 +1,81 @@
+"""Дайджест: новые мероприятия и акции одним сообщением раз в день или неделю.
+
+Вместо сообщения на каждое мероприятие пользователь получает одно сообщение
+со всем, что накопилось в журнале изменений (change_log) после его курсора,
+постранично (листание — кнопками, см. cards.format_digest). Задача выбирает
+только тех, кому пора (next_send_at), и читает журнал один раз на город
+за проход, а не на пользователя.
+"""
+import logging
+from datetime import datetime
+
+from aiogram import Bot
+from sqlalchemy import bindparam, func, select, update
+
+from app.bot.cards import format_digest
+from app.bot.i18n import DEFAULT_LANG
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.database.read_models import digest_items
+from app.jobs.broadcast import send_with_retry
+from app.models.digest import DigestPreference, change_log_head, next_send_at
+from app.models.user_lang import UserLang
+
+logger = logging.getLogger(__name__)
+
+
+def reschedule(db, rows, cursor: int, now: datetime):
+    if not rows:
+        return
+    db.execute(
+        update(DigestPreference.__table__)
+        .where(DigestPreference.id == bindparam("preference_id"))
+        .values(cursor=cursor, next_send_at=bindparam("next_at"), updated_at=now),
+        [{"preference_id": row.id, "next_at": next_send_at(row.frequency, now)} for row in rows],
+    )
+    db.commit()
+
+
+async def send_digests(bot: Bot, stop):
+    now = datetime.utcnow()
+    with SessionLocal(primary=True) as db:
+        due = db.execute(
+            select(
+                DigestPreference.id, DigestPreference.user_id, DigestPreference.frequency, DigestPreference.cursor,
+                func.coalesce(UserLang.lang, DEFAULT_LANG).label("lang"),
+                func.coalesce(UserLang.city, settings.get_default_city()).label("city"),
+            )
+            .outerjoin(UserLang, UserLang.user_id == DigestPreference.user_id)
+            .where(DigestPreference.next_send_at <= now)
+            .order_by(DigestPreference.next_send_at)
+            .limit(settings.DIGEST_BATCH_SIZE)
+        ).all()
+        if not due:
+            return
+        head = change_log_head(db.connection())
+        items = {}
+        for city in {row.city for row in due}:
+            after = min(row.cursor for row in due if row.city == city)
+            items[city] = digest_items(db, city, after, head, now)
+
+        # Кому нечего отправлять — только переносим курсор и время, одним запросом
+        pending = [row for row in due if any(item.seq > row.cursor for item in items[row.city])]
+        pending_ids = {row.id for row in pending}
+        reschedule(db, [row for row in due if row.id not in pending_ids], head, now)
+
+        sent = 0
+        for row in pending:
+            if stop.is_set():
+                break
+            text, markup = format_digest(
+                [item for item in items[row.city] if item.seq > row.cursor], 0, row.lang, row.cursor, head,
+            )
+            delivered = await send_with_retry(bot, row.user_id, text, markup, stop=stop)
+            if delivered is None:
+                # Курсор не сдвигается — дайджест уйдёт после рестарта
+                break
+            if delivered:
+                sent += 1
+            # Курсор фиксируется сразу: после рестарта дайджест не уйдёт повторно
+            reschedule(db, [row], head, now)
+    logger.info("Sent %s digests, %s users had nothing new", sent, len(due) - len(pending))
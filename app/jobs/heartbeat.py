@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from aiogram import Bot
+
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.models.heartbeat import ReplicaHeartbeat
+
+
+async def write_heartbeat(bot: Bot, stop):
+    """Отметка времени на основной базе; по её возрасту на реплике ReplicaSet оценивает отставание."""
+    if not settings.get_replica_urls():
+        return
+    with SessionLocal(primary=True) as db:
+        db.merge(ReplicaHeartbeat(id=1, beat_at=datetime.utcnow()))
+        db.commit()
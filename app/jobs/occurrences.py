@@ -0,0 +1,28 @@
+"""Окно event_occurrences: раз в день сдвигается на OCCURRENCE_WINDOW_DAYS вперёд от сегодняшнего дня.
+
+Прошедшие повторения удаляются, дописываются только новые дни ещё не
+закончившихся серий — строк на серию не больше её повторений за окно.
+Пока окно не задано, списки развёртывают серии из правила
+(app/database/read_models.py).
+"""
+import logging
+from datetime import datetime, time, timedelta
+
+from aiogram import Bot
+
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.models.event import shift_occurrences
+
+logger = logging.getLogger(__name__)
+
+
+async def shift_occurrence_window(bot: Bot, stop):
+    # Окно — от начала дня: сдвиг происходит раз в сутки, а не на каждом проходе
+    since = datetime.combine(datetime.utcnow().date(), time.min)
+    until = since + timedelta(days=settings.OCCURRENCE_WINDOW_DAYS)
+    with SessionLocal(primary=True) as db:
+        added = shift_occurrences(db.connection(), since, until)
+        db.commit()
+    if added:
+        logger.info("Materialized %s series occurrences until %s", added, until)
@@ -0,0 +1,147 @@
+"""Рекомендации «Для вас» по совместному избранному (item-item).
+
+Раз в RECOMMENDATIONS_INTERVAL секунд задача пересобирает две таблицы:
+event_similarities — top-K похожих предстоящих мероприятий для каждого
+мероприятия (косинус по бинарным векторам «кто добавил в избранное») и
+user_recommendations — готовую подборку на пользователя. Бот читает только
+user_recommendations; в обработчиках ничего не считается.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+import numpy as np
+from aiogram import Bot
+from sqlalchemy import and_, delete, or_, select
+
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.database.read_models import one_off, series_active
+from app.models.event import Event
+from app.models.favorite import Favorite
+from app.models.recommendation import EventSimilarity, UserRecommendation
+
+logger = logging.getLogger(__name__)
+
+_next_run = 0.0
+
+
+def expand(starts, lengths):
+    """Для каждой группы i — индексы starts[i] .. starts[i] + lengths[i] - 1: (номер группы, индекс)."""
+    owner = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owner, starts[owner] + offsets
+
+
+def top_per_group(groups, scores, ties, k):
+    """Индексы k лучших по scores в каждой группе (при равенстве — меньший ties) и их ранги."""
+    order = np.lexsort((ties, -scores, groups))
+    _, first, counts = np.unique(groups[order], return_index=True, return_counts=True)
+    rank = np.arange(len(order)) - np.repeat(first, counts)
+    keep = rank < k
+    return order[keep], rank[keep]
+
+
+def compute(users, events, upcoming, similar_k, per_user, max_favorites):
+    """users/events — плотные индексы избранного, upcoming — маска предстоящих мероприятий.
+
+    Возвращает (a, b, score) для похожих и (user, rank, event, score) для подборок.
+    """
+    n = len(upcoming)
+    # Пара (пользователь, мероприятие) учитывается один раз; у активных — только последние max_favorites
+    keys, first = np.unique(users * n + events, return_index=True)
+    users, events = keys // n, keys % n
+    keep, _ = top_per_group(users, -first.astype(float), events, max_favorites)
+    keep.sort()
+    users, events = users[keep], events[keep]
+    popularity = np.bincount(events, minlength=n)
+
+    # Совместная встречаемость: все пары внутри избранного каждого пользователя
+    _, starts, lengths = np.unique(users, return_index=True, return_counts=True)
+    group = np.repeat(np.arange(len(starts)), lengths)
+    owner, partner = expand(starts[group], lengths[group])
+    left, right = events[owner], events[partner]
+    mask = (left != right) & upcoming[right]
+    pair_keys, co = np.unique(left[mask] * n + right[mask], return_counts=True)
+    a, b = pair_keys // n, pair_keys % n
+    score = co / np.sqrt(popularity[a] * popularity[b])
+    selected, _ = top_per_group(a, score, b, similar_k)
+    selected.sort()
+    a, b, score = a[selected], b[selected], score[selected]
+
+    # Подборка пользователя: сумма сходств его избранного с кандидатами
+    sim_starts = np.zeros(n, dtype=np.int64)
+    sim_lengths = np.zeros(n, dtype=np.int64)
+    heads, head_index, head_counts = np.unique(a, return_index=True, return_counts=True)
+    sim_starts[heads], sim_lengths[heads] = head_index, head_counts
+    owner, index = expand(sim_starts[events], sim_lengths[events])
+    candidate_keys, inverse = np.unique(users[owner] * n + b[index], return_inverse=True)
+    totals = np.bincount(inverse, weights=score[index], minlength=len(candidate_keys))
+    fresh = ~np.isin(candidate_keys, users * n + events)
+    candidate_keys, totals = candidate_keys[fresh], totals[fresh]
+    rec_users, rec_events = candidate_keys // n, candidate_keys % n
+    selected, rank = top_per_group(rec_users, totals, rec_events, per_user)
+    return (
+        (a, b, score),
+        (rec_users[selected], rank, rec_events[selected], totals[selected]),
+    )
+
+
+def rebuild(now=None):
+    now = now or datetime.utcnow()
+    with SessionLocal() as db:
+        favorites = db.execute(
+            select(Favorite.user_id, Favorite.event_id)
+            .join(Event, Event.id == Favorite.event_id)
+            .order_by(Favorite.id.desc())
+        ).all()
+        upcoming_ids = db.execute(
+            select(Event.id).where(or_(and_(one_off(), Event.date >= now), series_active(now)))
+        ).scalars().all()
+        similar_rows, user_rows = [], []
+        if favorites and upcoming_ids:
+            favorites = np.array(favorites, dtype=np.int64)
+            user_ids, users = np.unique(favorites[:, 0], return_inverse=True)
+            event_ids, events = np.unique(np.concatenate([favorites[:, 1], upcoming_ids]), return_inverse=True)
+            events = events[:len(favorites)]
+            upcoming = np.isin(event_ids, upcoming_ids)
+            (a, b, score), (rec_users, rank, rec_events, totals) = compute(
+                users, events, upcoming,
+                settings.RECOMMENDATIONS_SIMILAR_K,
+                settings.RECOMMENDATIONS_PER_USER,
+                settings.RECOMMENDATIONS_MAX_FAVORITES,
+            )
+            similar_rows = [
+                {"event_id": x, "similar_event_id": y, "score": s}
+                for x, y, s in zip(event_ids[a].tolist(), event_ids[b].tolist(), score.tolist())
+            ]
+            user_rows = [
+                {"user_id": u, "rank": r, "event_id": e, "score": s}
+                for u, r, e, s in zip(
+                    user_ids[rec_users].tolist(), rank.tolist(), event_ids[rec_events].tolist(), totals.tolist()
+                )
+            ]
+        # Подмена целиком в одной транзакции: читатели видят либо старую, либо новую подборку
+        db.execute(delete(EventSimilarity))
+        db.execute(delete(UserRecommendation))
+        if similar_rows:
+            db.execute(EventSimilarity.__table__.insert(), similar_rows)
+        if user_rows:
+            db.execute(UserRecommendation.__table__.insert(), user_rows)
+        db.commit()
+    return len(similar_rows), len(user_rows)
+
+
+async def rebuild_recommendations(bot: Bot, stop):
+    global _next_run
+    if time.monotonic() < _next_run:
+        return
+    # Следующий запуск планируется заранее, чтобы ошибка не повторялась на каждом цикле
+    _next_run = time.monotonic() + settings.RECOMMENDATIONS_INTERVAL
+    started = time.perf_counter()
+    similar, recommended = await asyncio.to_thread(rebuild)
+    logger.info(
+        "Rebuilt recommendations: %s similar pairs, %s user rows in %.2fs",
+        similar, recommended, time.perf_counter() - started,
+    )
@@ -0,0 +1,48 @@
+import logging
+from datetime import datetime, timedelta
+
+from aiogram import Bot
+
+from app.bot.i18n import DEFAULT_LANG, t
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.jobs.broadcast import send_with_retry
+from app.models.event import Event
+from app.models.favorite import Favorite
+from app.models.reminder import EventReminder
+from app.models.user_lang import UserLang
+
+logger = logging.getLogger(__name__)
+
+
+async def send_reminders(bot: Bot, stop):
+    now = datetime.utcnow()
+    horizon = now + timedelta(hours=settings.REMINDER_LEAD_HOURS)
+    with SessionLocal(primary=True) as db:
+        pending = (
+            db.query(Favorite.user_id, UserLang.lang, Event.id, Event.title, Event.date, Event.location)
+            .join(Event, Event.id == Favorite.event_id)
+            .outerjoin(UserLang, UserLang.user_id == Favorite.user_id)
+            .outerjoin(
+                EventReminder,
+                (EventReminder.user_id == Favorite.user_id) & (EventReminder.event_id == Favorite.event_id),
+            )
+            .filter(Event.date >= now, Event.date < horizon, EventReminder.id.is_(None))
+            .order_by(Event.date)
+            .all()
+        )
+        for user_id, lang, event_id, title, date, location in pending:
+            if stop.is_set():
+                break
+            text = t(
+                lang or DEFAULT_LANG, "reminder",
+                title=title,
+                date=date.strftime('%d.%m.%Y %H:%M'),
+                location=location,
+            )
+            if await send_with_retry(bot, user_id, text, stop=stop) is None:
+                break
+            db.add(EventReminder(user_id=user_id, event_id=event_id))
+            db.commit()
+    if pending:
+        logger.info("Sent %s reminders", len(pending))
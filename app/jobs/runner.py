@@ -0,0 +1,40 @@
+import asyncio
+import logging
+
+from aiogram import Bot
+
+from app.core.config import settings
+from app.jobs.broadcast import process_broadcasts
+from app.jobs.digest import send_digests
+from app.jobs.heartbeat import write_heartbeat
+from app.jobs.occurrences import shift_occurrence_window
+from app.jobs.recommendations import rebuild_recommendations
+from app.jobs.reminders import send_reminders
+
+logger = logging.getLogger(__name__)
+
+JOBS = (
+    write_heartbeat, process_broadcasts, send_reminders, send_digests, rebuild_recommendations,
+    shift_occurrence_window,
+)
+
+
+async def run_job(job, bot: Bot, stop: asyncio.Event):
+    while not stop.is_set():
+        try:
+            await job(bot, stop)
+        except Exception:
+            logger.exception("Background job %s failed", job.__name__)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.JOBS_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_jobs(bot: Bot, stop: asyncio.Event):
+    """Фоновые задачи (JOBS): рассылки, напоминания, дайджесты и т. д. Завершаются после stop.set().
+
+    Каждая задача — отдельный цикл: долгая рассылка не задерживает heartbeat,
+    напоминания и дайджесты.
+    """
+    await asyncio.gather(*(asyncio.create_task(run_job(job, bot, stop), name=job.__name__) for job in JOBS))
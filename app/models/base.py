@@ -1,7 +1,6 @@
 from datetime import datetime
 from sqlalchemy import Column, Integer, DateTime
 from sqlalchemy.ext.declarative import declarative_base
-from aiogram.types import ReplyKeyboardRemove
 
 Base = declarative_base()
 
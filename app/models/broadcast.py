@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from .base import BaseModel
+
+class BroadcastJob(BaseModel):
+    __tablename__ = "broadcast_jobs"
+
+    text = Column(Text, nullable=False)
+    created_by = Column(Integer, nullable=False)
+    # Подписчики какого города получают рассылку
+    city = Column(String(32), nullable=False)
+    status = Column(String(16), nullable=False, default="pending", index=True)
+    sent_count = Column(Integer, nullable=False, default=0)
+    # id последнего подписчика, которому отправлено сообщение
+    cursor = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
@@ -0,0 +1,33 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, text
+from .base import Base
+
+# Ключ advisory-блокировки PostgreSQL для журнала изменений
+CHANGE_LOG_LOCK = 4004
+
+
+class ChangeLog(Base):
+    """Журнал изменений каталога для синхронизации (GET /sync/changes).
+
+    seq растёт монотонно; клиент хранит последний полученный seq и запрашивает
+    только то, что изменилось после него. op: upsert или delete.
+    """
+    __tablename__ = "change_log"
+    # В SQLite без AUTOINCREMENT seq может повториться после удаления последней строки
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)
+    changed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+def record_change(connection, entity: str, entity_id: int, op: str):
+    if connection.dialect.name == "postgresql":
+        # Записи журнала выстраиваются в порядке commit: иначе транзакция с меньшим seq
+        # могла бы зафиксироваться позже и клиент, уже ушедший дальше, её пропустил бы
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOG_LOCK})
+    connection.execute(
+        ChangeLog.__table__.insert().values(entity=entity, entity_id=entity_id, op=op, changed_at=datetime.utcnow())
+    )
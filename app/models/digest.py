@@ -0,0 +1,67 @@
+from datetime import datetime, time, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import Column, Integer, String, DateTime, Index, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.core.config import settings
+from .base import BaseModel
+from .change_log import ChangeLog
+
+DIGEST_FREQUENCIES = ("daily", "weekly", "off")
+
+
+class DigestPreference(BaseModel):
+    """Как часто пользователь получает дайджест новых мероприятий и акций (app/jobs/digest.py).
+
+    cursor — seq журнала изменений (change_log), до которого дайджест уже
+    отправлен: всё, что накопилось после него, уйдёт одним сообщением.
+    """
+    __tablename__ = "digest_preferences"
+    # Задача выбирает только тех, кому пора, по индексу next_send_at
+    __table_args__ = (Index("ix_digest_preferences_next_send_at", "next_send_at"),)
+
+    user_id = Column(Integer, unique=True, nullable=False)
+    frequency = Column(String(10), nullable=False, default="daily")
+    cursor = Column(Integer, nullable=False, default=0)
+    # NULL — дайджест выключен
+    next_send_at = Column(DateTime)
+
+
+def next_send_at(frequency: str, after: datetime) -> Optional[datetime]:
+    """Ближайший слот отправки после after: DIGEST_HOUR (UTC) каждый день или по DIGEST_WEEKDAY."""
+    if frequency == "off":
+        return None
+    slot = datetime.combine(after.date(), time(settings.DIGEST_HOUR))
+    if frequency == "weekly":
+        slot += timedelta(days=(settings.DIGEST_WEEKDAY - slot.weekday()) % 7)
+    while slot <= after:
+        slot += timedelta(days=7 if frequency == "weekly" else 1)
+    return slot
+
+
+def change_log_head(connection) -> int:
+    """Последний seq журнала: новый подписчик получит только то, что появится после подписки."""
+    return connection.execute(select(func.coalesce(func.max(ChangeLog.seq), 0))).scalar_one()
+
+
+def add_default_preferences(connection, user_ids: Iterable[int], now: datetime):
+    """Новые подписчики получают дайджест по умолчанию; уже выбранную частоту не трогаем.
+
+    Вызывается в той же транзакции, что и запись подписки — из бота
+    (app/database/write_behind.py) и из API.
+    """
+    cursor = change_log_head(connection)
+    frequency = settings.DIGEST_DEFAULT_FREQUENCY
+    rows = [
+        {
+            "user_id": user_id, "frequency": frequency, "cursor": cursor,
+            "next_send_at": next_send_at(frequency, now), "created_at": now, "updated_at": now,
+        }
+        for user_id in user_ids
+    ]
+    if not rows:
+        return
+    insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    connection.execute(insert(DigestPreference.__table__).on_conflict_do_nothing(index_elements=["user_id"]), rows)
@@ -1,10 +1,291 @@
-from sqlalchemy import Column, String, Text, DateTime
-from .base import BaseModel
+from sqlalchemy import (
+    Column, String, Text, DateTime, Date, Integer, BigInteger, ForeignKey, Index, event, inspect, or_, select, text,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import column_property
+from app.core import recurrence, simhash
+from app.core.config import settings
+from .base import Base, BaseModel
+from .venue import Venue  # noqa: F401 — таблица для ForeignKey venue_id
+from .change_log import record_change
+
+def fold_title(context):
+    return context.get_current_parameters()["title"].casefold()
+
 
 class Event(BaseModel):
     __tablename__ = "events"
+    # Все списки бота выбирают мероприятия одного города по дате
+    __table_args__ = (
+        Index("ix_events_city_date", "city", "date"),
+        # Серий немного — выборка серий города не читает разовые мероприятия
+        Index(
+            "ix_events_city_series", "city", "date",
+            sqlite_where=text("rrule IS NOT NULL"), postgresql_where=text("rrule IS NOT NULL"),
+        ),
+    )
 
     title = Column(String(200), nullable=False)
+    # Название для поиска по подстроке: LIKE и lower() в SQLite не сворачивают регистр кириллицы.
+    # Default — и для вставок без ORM; при изменении названия обновляет set_title_folded
+    title_folded = Column(Text, nullable=False, default=fold_title)
     description = Column(Text)
-    date = Column(DateTime, nullable=False)
-    location = Column(String(200)) 
\ No newline at end of file
+    # active_history: старое значение даты нужно, чтобы поправить счётчик прежнего дня
+    date = column_property(Column(DateTime, nullable=False), active_history=True)
+    location = Column(String(200))
+    venue_id = Column(Integer, ForeignKey("venues.id", ondelete="SET NULL"), index=True)
+    # Постер: file_id в Telegram (загружается один раз) и версия файлов на диске (app/core/posters.py)
+    poster_file_id = Column(String(200))
+    poster_version = Column(String(16))
+    # Код города из CITIES; active_history — чтобы перенести счётчик дня при смене города
+    city = column_property(
+        Column(String(32), nullable=False, default=settings.get_default_city), active_history=True,
+    )
+    # Серия (app/core/recurrence.py): date — первое повторение, rrule — правило вида FREQ=WEEKLY;BYDAY=TH.
+    # Разовое мероприятие — rrule IS NULL; ближайшие повторения — в event_occurrences
+    rrule = column_property(Column(String(200)), active_history=True)
+    # Последнее повторение конечной серии (COUNT/UNTIL); NULL — бесконечная
+    recurrence_end = Column(DateTime)
+
+
+class EventDayCount(Base):
+    """Сколько разовых мероприятий приходится на день в городе — календарь читает месяц из этой таблицы.
+
+    Повторения серий сюда не попадают: их дни считаются при чтении окна (read_models.event_days).
+    """
+    __tablename__ = "event_day_counts"
+
+    city = Column(String(32), primary_key=True)
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class EventTitleBand(Base):
+    """Полосы SimHash названия (app/core/simhash.py) — индекс поиска дублей внутри города и дня."""
+    __tablename__ = "event_title_bands"
+    __table_args__ = (Index("ix_event_title_bands_lookup", "city", "day", "band", "value"),)
+
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    band = Column(Integer, primary_key=True)
+    city = Column(String(32), nullable=False)
+    day = Column(Date, nullable=False)
+    value = Column(Integer, nullable=False)
+    # Полный хэш — чтобы проверить расстояние без обращения к events
+    simhash = Column(BigInteger, nullable=False)
+
+
+class EventOccurrence(Base):
+    """Повторения серий в коротком окне (OccurrenceHorizon) — «ближайшие» читают его по индексу (city, date).
+
+    Хранятся только ближайшие OCCURRENCE_WINDOW_DAYS дней: строк на серию — не
+    больше повторений за окно, прошедшие удаляются. Разовые мероприятия сюда
+    не попадают: они читаются из events по ix_events_city_date.
+    """
+    __tablename__ = "event_occurrences"
+    __table_args__ = (Index("ix_event_occurrences_city_date", "city", "date"),)
+
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(DateTime, primary_key=True)
+    city = Column(String(32), nullable=False)
+
+
+class OccurrenceHorizon(Base):
+    """Одна строка (id=1): в event_occurrences — все повторения в [since, until); until NULL — окна ещё нет.
+
+    Окно раз в день сдвигает app/jobs/occurrences.py; запросы вне окна
+    развёртывают серии из правила (app/database/read_models.py).
+    """
+    __tablename__ = "occurrence_horizon"
+
+    id = Column(Integer, primary_key=True)
+    since = Column(DateTime)
+    until = Column(DateTime)
+
+
+def horizon_stmt(lock=None, dialect=None):
+    """lock (PostgreSQL): "share" — при записи серии, "update" — при сдвиге окна."""
+    stmt = select(OccurrenceHorizon.since, OccurrenceHorizon.until).where(OccurrenceHorizon.id == 1)
+    if lock and dialect == "postgresql":
+        # Серия, записанная во время сдвига, иначе могла бы остаться развёрнутой по старому окну
+        stmt = stmt.with_for_update(read=lock == "share")
+    return stmt
+
+
+def occurrence_rows(event_id, city, rule, first, start, until):
+    return [
+        {"event_id": event_id, "city": city, "date": date}
+        for date in recurrence.dates(rule, first, start, until)
+    ]
+
+
+def drop_occurrences(connection, event_id):
+    table = EventOccurrence.__table__
+    connection.execute(table.delete().where(table.c.event_id == event_id))
+
+
+def materialize_occurrences(connection, target):
+    drop_occurrences(connection, target.id)
+    horizon = connection.execute(horizon_stmt("share", connection.dialect.name)).first()
+    if target.rrule and horizon is not None and horizon.until is not None:
+        rows = occurrence_rows(target.id, target.city, target.rrule, target.date, horizon.since, horizon.until)
+        if rows:
+            connection.execute(EventOccurrence.__table__.insert(), rows)
+
+
+def shift_occurrences(connection, since, until) -> int:
+    """Сдвигает окно повторений на [since, until): прошедшие удаляются, новые дни дописываются.
+
+    Возвращает число новых строк.
+    """
+    table = OccurrenceHorizon.__table__
+    if connection.execute(select(table.c.id).where(table.c.id == 1)).first() is None:
+        connection.execute(table.insert().values(id=1, since=None, until=None))
+    current = connection.execute(horizon_stmt("update", connection.dialect.name)).first()
+    if current.until is not None and current.since >= since and current.until >= until:
+        return 0
+    occurrences = EventOccurrence.__table__
+    # Дописываются только дни после прежнего окна; если оно не продолжается новым — всё заново
+    if current.until is not None and current.since <= since <= current.until:
+        start = current.until
+        connection.execute(occurrences.delete().where(occurrences.c.date < since))
+    else:
+        start = since
+        connection.execute(occurrences.delete())
+    stmt = select(Event.id, Event.city, Event.rrule, Event.date).where(
+        Event.rrule.is_not(None), Event.date < until, or_(Event.recurrence_end.is_(None), Event.recurrence_end >= start),
+    )
+    rows = [
+        row
+        for event_id, city, rule, first in connection.execute(stmt)
+        for row in occurrence_rows(event_id, city, rule, first, start, until)
+    ]
+    if rows:
+        connection.execute(occurrences.insert(), rows)
+    connection.execute(table.update().where(table.c.id == 1).values(since=since, until=until))
+    return len(rows)
+
+
+def title_band_rows(event_id, city, date, title):
+    value = simhash.simhash(title)
+    return [
+        {"event_id": event_id, "band": band, "city": city, "day": date.date(), "value": band_value,
+         "simhash": simhash.to_signed(value)}
+        for band, band_value in simhash.bands(value)
+    ]
+
+
+def index_title(connection, target):
+    table = EventTitleBand.__table__
+    connection.execute(table.delete().where(table.c.event_id == target.id))
+    connection.execute(table.insert(), title_band_rows(target.id, target.city, target.date, target.title))
+
+
+def adjust_day_count(connection, city, day, delta: int):
+    table = EventDayCount.__table__
+    insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(table).values(city=city, day=day, count=delta)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.city, table.c.day], set_={"count": table.c.count + delta},
+    )
+    connection.execute(stmt)
+
+
+def stored_value(target, attr):
+    """Значение, которое было в базе до текущего flush."""
+    history = inspect(target).attrs[attr].history
+    return history.deleted[0] if history.deleted else getattr(target, attr)
+
+
+def counted_day(city, date, rrule):
+    """(город, день) счётчика разового мероприятия; серии не считаются."""
+    return None if rrule else (city, date.date())
+
+
+@event.listens_for(Event, "before_insert")
+@event.listens_for(Event, "before_update")
+def set_recurrence_end(mapper, connection, target):
+    target.recurrence_end = recurrence.last_occurrence(target.rrule, target.date) if target.rrule else None
+
+
+@event.listens_for(Event, "before_update")
+def set_title_folded(mapper, connection, target):
+    if inspect(target).attrs.title.history.has_changes():
+        target.title_folded = target.title.casefold()
+
+
+# Счётчики обновляются в той же транзакции, что и сама запись мероприятия
+@event.listens_for(Event, "after_insert")
+def count_inserted_event(mapper, connection, target):
+    day = counted_day(target.city, target.date, target.rrule)
+    if day:
+        adjust_day_count(connection, *day, 1)
+
+
+@event.listens_for(Event, "after_update")
+def count_moved_event(mapper, connection, target):
+    old = counted_day(*(stored_value(target, attr) for attr in ("city", "date", "rrule")))
+    new = counted_day(target.city, target.date, target.rrule)
+    if old != new:
+        if old:
+            adjust_day_count(connection, *old, -1)
+        if new:
+            adjust_day_count(connection, *new, 1)
+
+
+@event.listens_for(Event, "after_delete")
+def count_deleted_event(mapper, connection, target):
+    day = counted_day(*(stored_value(target, attr) for attr in ("city", "date", "rrule")))
+    if day:
+        adjust_day_count(connection, *day, -1)
+
+
+# Индекс дублей: пересчитывается, только если изменились название, дата или город
+@event.listens_for(Event, "after_insert")
+def index_inserted_title(mapper, connection, target):
+    index_title(connection, target)
+
+
+@event.listens_for(Event, "after_update")
+def index_updated_title(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[attr].history.has_changes() for attr in ("title", "date", "city")):
+        index_title(connection, target)
+
+
+@event.listens_for(Event, "after_delete")
+def unindex_deleted_title(mapper, connection, target):
+    table = EventTitleBand.__table__
+    connection.execute(table.delete().where(table.c.event_id == target.id))
+
+
+# Повторения серии разворачиваются заново, только если изменились дата, правило или город
+@event.listens_for(Event, "after_insert")
+def materialize_inserted_series(mapper, connection, target):
+    if target.rrule:
+        materialize_occurrences(connection, target)
+
+
+@event.listens_for(Event, "after_update")
+def materialize_updated_series(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[attr].history.has_changes() for attr in ("date", "rrule", "city")):
+        materialize_occurrences(connection, target)
+
+
+@event.listens_for(Event, "after_delete")
+def delete_occurrences(mapper, connection, target):
+    if stored_value(target, "rrule"):
+        drop_occurrences(connection, target.id)
+
+
+# Журнал изменений для GET /sync/changes
+@event.listens_for(Event, "after_insert")
+@event.listens_for(Event, "after_update")
+def log_event_upsert(mapper, connection, target):
+    record_change(connection, "event", target.id, "upsert")
+
+
+@event.listens_for(Event, "after_delete")
+def log_event_delete(mapper, connection, target):
+    record_change(connection, "event", target.id, "delete")
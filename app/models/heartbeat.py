@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, DateTime
+from .base import Base
+
+class ReplicaHeartbeat(Base):
+    """Одна строка (id=1): время последней записи на основной базе; по её возрасту на реплике считается отставание."""
+    __tablename__ = "replica_heartbeat"
+
+    id = Column(Integer, primary_key=True)
+    beat_at = Column(DateTime, nullable=False)
@@ -0,0 +1,92 @@
+"""Популярность мероприятий с затуханием: «Популярное» в боте и sort=trending в API.
+
+Действие (⭐, «Подробнее», «Поделиться») весом w в момент t добавляет
+w·2^((t − EPOCH)/H), H — POPULARITY_HALF_LIFE_HOURS. Хранится логарифм суммы
+(score), поэтому числа не переполняются. Текущая популярность —
+exp(score)·2^(−(now − EPOCH)/H): множитель у всех мероприятий общий, так что
+порядок по score — это порядок по текущей популярности, и старые значения
+не нужно пересчитывать со временем. Новое действие —
+score = logaddexp(score, log_weight(w, t)).
+
+Действия копит буфер отложенной записи (app/database/write_behind.py) и
+сбрасывает в event_popularity вместе с остальными изменениями. Город
+мероприятия продублирован в строке: список города — обход индекса
+(city, score) от самых популярных, без сортировки.
+"""
+import math
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, bindparam, event, select, update
+
+from app.core.config import settings
+from .base import Base
+from .event import Event, stored_value
+
+# Начало отсчёта затухания; менять нельзя — сохранённые score посчитаны от него
+EPOCH = datetime(2024, 1, 1)
+
+
+class EventPopularity(Base):
+    __tablename__ = "event_popularity"
+    # Списки по популярности читают индекс, без GROUP BY по избранному
+    __table_args__ = (Index("ix_event_popularity_city_score", "city", "score"),)
+
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    city = Column(String(32), nullable=False)
+    score = Column(Float, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+
+def log_weight(weight: float, at: datetime) -> float:
+    half_lives = (at - EPOCH).total_seconds() / 3600 / settings.POPULARITY_HALF_LIFE_HOURS
+    return math.log(weight) + half_lives * math.log(2)
+
+
+def logaddexp(a: Optional[float], b: float) -> float:
+    """log(exp(a) + exp(b)) без переполнения; a=None — пустая сумма."""
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def add_scores(connection, increments: Dict[int, float], now: datetime):
+    """Прибавляет накопленные приращения (event_id → logaddexp действий); удалённые мероприятия пропускаются."""
+    stmt = select(EventPopularity.event_id, EventPopularity.score).where(EventPopularity.event_id.in_(increments))
+    if connection.dialect.name == "postgresql":
+        # Бот и API пишут одни и те же строки — чтение и запись под блокировкой
+        stmt = stmt.with_for_update()
+    existing = dict(connection.execute(stmt).all())
+    cities = dict(connection.execute(select(Event.id, Event.city).where(Event.id.in_(increments))).all())
+    updates, inserts = [], []
+    for event_id, increment in increments.items():
+        if event_id not in cities:
+            continue
+        if event_id in existing:
+            updates.append({"target_id": event_id, "new_score": logaddexp(existing[event_id], increment)})
+        else:
+            inserts.append({"event_id": event_id, "city": cities[event_id], "score": increment, "updated_at": now})
+    if updates:
+        connection.execute(
+            update(EventPopularity.__table__)
+            .where(EventPopularity.event_id == bindparam("target_id"))
+            .values(score=bindparam("new_score"), updated_at=now),
+            updates,
+        )
+    if inserts:
+        connection.execute(EventPopularity.__table__.insert(), inserts)
+
+
+# Город в рейтинге — вслед за мероприятием; строка удалённого мероприятия удаляется и без каскада SQLite
+@event.listens_for(Event, "after_update")
+def move_popularity(mapper, connection, target):
+    if stored_value(target, "city") != target.city:
+        table = EventPopularity.__table__
+        connection.execute(table.update().where(table.c.event_id == target.id).values(city=target.city))
+
+
+@event.listens_for(Event, "after_delete")
+def delete_popularity(mapper, connection, target):
+    table = EventPopularity.__table__
+    connection.execute(table.delete().where(table.c.event_id == target.id))
@@ -1,12 +1,30 @@
-from sqlalchemy import Column, String, Text, DateTime, Boolean
+from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, ForeignKey, Index, event
+from app.core.config import settings
 from .base import BaseModel
+from .venue import Venue  # noqa: F401 — таблица для ForeignKey venue_id
+from .change_log import record_change
 
 class Promotion(BaseModel):
     __tablename__ = "promotions"
+    __table_args__ = (Index("ix_promotions_city_active_end_date", "city", "is_active", "end_date"),)
 
     title = Column(String(200), nullable=False)
     description = Column(Text)
     venue = Column(String(200))
+    venue_id = Column(Integer, ForeignKey("venues.id", ondelete="SET NULL"), index=True)
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
-    is_active = Column(Boolean, default=True) 
\ No newline at end of file
+    is_active = Column(Boolean, default=True)
+    city = Column(String(32), nullable=False, default=settings.get_default_city)
+
+
+# Журнал изменений для GET /sync/changes
+@event.listens_for(Promotion, "after_insert")
+@event.listens_for(Promotion, "after_update")
+def log_promotion_upsert(mapper, connection, target):
+    record_change(connection, "promotion", target.id, "upsert")
+
+
+@event.listens_for(Promotion, "after_delete")
+def log_promotion_delete(mapper, connection, target):
+    record_change(connection, "promotion", target.id, "delete")
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey
+from .base import Base
+
+# Обе таблицы целиком пересобирает app/jobs/recommendations.py; бот только читает
+class EventSimilarity(Base):
+    """Top-K похожих мероприятий: их чаще всего добавляют в избранное вместе."""
+    __tablename__ = "event_similarities"
+
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    similar_event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False)
+
+
+class UserRecommendation(Base):
+    """Готовая подборка «Для вас»: rank 0 — лучшая рекомендация."""
+    __tablename__ = "user_recommendations"
+
+    user_id = Column(Integer, primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+from .base import BaseModel
+
+class EventReminder(BaseModel):
+    __tablename__ = "event_reminders"
+    __table_args__ = (UniqueConstraint("user_id", "event_id"),)
+
+    user_id = Column(Integer, nullable=False)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    sent_at = Column(DateTime, default=datetime.utcnow)
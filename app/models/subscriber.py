@@ -1,6 +1,11 @@
-from sqlalchemy import Column, Integer
+from sqlalchemy import Column, Integer, String, Index
+from app.core.config import settings
 from .base import BaseModel
 
 class Subscriber(BaseModel):
     __tablename__ = "subscribers"
-    user_id = Column(Integer, unique=True, nullable=False) 
\ No newline at end of file
+    # Рассылка идёт по подписчикам одного города в порядке id (курсор BroadcastJob)
+    __table_args__ = (Index("ix_subscribers_city_id", "city", "id"),)
+
+    user_id = Column(Integer, unique=True, nullable=False)
+    city = Column(String(32), nullable=False, default=settings.get_default_city)
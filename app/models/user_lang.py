@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, Index
+from app.core.config import settings
+from .base import BaseModel
+
+# Модель для хранения языка и города пользователя
+class UserLang(BaseModel):
+    __tablename__ = "user_langs"
+    __table_args__ = (Index("ix_user_langs_city", "city"),)
+
+    user_id = Column(Integer, unique=True, nullable=False)
+    lang = Column(String(5), default="ru")
+    city = Column(String(32), nullable=False, default=settings.get_default_city)
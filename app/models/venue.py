@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Float, Index
+from .base import BaseModel
+
+class Venue(BaseModel):
+    __tablename__ = "venues"
+    # Поиск «рядом» сужает выборку прямоугольником по широте/долготе
+    __table_args__ = (Index("ix_venues_lat_lon", "latitude", "longitude"),)
+
+    name = Column(String(200), nullable=False, unique=True)
+    address = Column(String(300))
+    # Заведения, перенесённые из текстовых полей, могут быть ещё без координат
+    latitude = Column(Float)
+    longitude = Column(Float)
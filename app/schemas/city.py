@@ -0,0 +1,15 @@
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+from app.core.config import settings
+
+
+def known_city(value: str) -> str:
+    if value not in settings.get_cities():
+        raise ValueError(f"Unknown city: {value}")
+    return value
+
+
+# Код города из CITIES
+City = Annotated[str, AfterValidator(known_city)]
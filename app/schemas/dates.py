@@ -0,0 +1,15 @@
+from datetime import datetime, timezone
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+
+def naive_utc(value: datetime) -> datetime:
+    """Даты в базе — naive UTC (datetime.utcnow()); значение со смещением переводится в UTC."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# Дата из запроса: «2030-01-01T19:00:00Z» и «2030-01-01T19:00:00» — одно и то же время
+UtcDateTime = Annotated[datetime, AfterValidator(naive_utc)]
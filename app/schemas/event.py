@@ -1,24 +1,49 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+from app.core.config import settings
+from app.schemas.city import City
+from app.schemas.dates import UtcDateTime
+from app.schemas.recurrence import RRule
 
 class EventBase(BaseModel):
     title: str
     description: Optional[str] = None
-    date: datetime
+    date: UtcDateTime
     location: Optional[str] = None
+    venue_id: Optional[int] = None
+    city: City = Field(default_factory=settings.get_default_city)
+    # Правило повторения без DTSTART (FREQ=WEEKLY;BYDAY=TH): date — первое повторение
+    rrule: Optional[RRule] = None
 
 class EventCreate(EventBase):
     pass
 
 class EventUpdate(EventBase):
-    title: Optional[str] = None
-    date: Optional[datetime] = None
+    # Поля можно не передавать, но null — 422: в базе они NOT NULL
+    title: str = None
+    date: UtcDateTime = None
+    city: City = None
 
 class EventInDB(EventBase):
     id: int
+    # Город, убранный из CITIES, не должен ломать выдачу
+    city: str
+    rrule: Optional[str] = None
+    # Постер: GET /events/{id}/poster?size=thumb|medium|original; версия меняется при замене
+    poster_version: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class EventDuplicate(BaseModel):
+    # Номер записи в запросе импорта и id уже существующего мероприятия
+    index: int
+    duplicate_of: int
+
+class EventImportResult(BaseModel):
+    created: List[EventInDB]
+    duplicates: List[EventDuplicate]
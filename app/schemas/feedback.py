@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class FeedbackBase(BaseModel):
+    user_id: int
+    message: str
+
+class FeedbackCreate(FeedbackBase):
+    pass
+
+class FeedbackInDB(FeedbackBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+from app.schemas.city import City
+
+class PromotionBase(BaseModel):
+    title: str
+    description: Optional[str] = None
+    venue: Optional[str] = None
+    venue_id: Optional[int] = None
+    start_date: datetime
+    end_date: datetime
+    is_active: bool = True
+    city: City = Field(default_factory=settings.get_default_city)
+
+class PromotionCreate(PromotionBase):
+    pass
+
+class PromotionUpdate(PromotionBase):
+    title: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    is_active: Optional[bool] = None
+    city: Optional[City] = None
+
+class PromotionInDB(PromotionBase):
+    id: int
+    city: str
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,8 @@
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+from app.core.recurrence import normalize_rule
+
+# RRULE (RFC 5545) без DTSTART, приводится к виду FREQ=...;...
+RRule = Annotated[str, AfterValidator(normalize_rule)]
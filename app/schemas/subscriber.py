@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+from app.core.config import settings
+from app.schemas.city import City
+
+class SubscriberBase(BaseModel):
+    user_id: int
+    city: City = Field(default_factory=settings.get_default_city)
+
+class SubscriberCreate(SubscriberBase):
+    pass
+
+class SubscriberInDB(SubscriberBase):
+    id: int
+    city: str
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List
+
+from app.schemas.event import EventInDB
+from app.schemas.promotion import PromotionInDB
+
+class DeletedIds(BaseModel):
+    events: List[int] = []
+    promotions: List[int] = []
+
+class ChangesPage(BaseModel):
+    # seq последнего изменения на странице — since для следующего запроса
+    cursor: int
+    has_more: bool
+    events: List[EventInDB] = []
+    promotions: List[PromotionInDB] = []
+    deleted: DeletedIds = DeletedIds()
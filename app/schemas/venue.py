@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional
+
+class VenueBase(BaseModel):
+    name: str
+    address: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+class VenueCreate(VenueBase):
+    pass
+
+class VenueUpdate(VenueBase):
+    name: Optional[str] = None
+
+class VenueInDB(VenueBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class VenueNearby(VenueInDB):
+    distance_km: float
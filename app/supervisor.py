@@ -0,0 +1,189 @@
+"""Многопроцессный режим: API, приём апдейтов бота и фоновые задачи в отдельных процессах.
+
+    python -m app.supervisor              # все роли под супервизором
+    python -m app.supervisor --role bot   # одна роль (например, под systemd/k8s)
+
+Процессы делят только базу данных. При SIGTERM/SIGINT супервизор пересылает
+SIGTERM дочерним процессам и ждёт их завершения не дольше SHUTDOWN_TIMEOUT. Сами роли
+при этом проходят drain (см. app/core/lifecycle.py).
+"""
+import argparse
+import asyncio
+import logging
+import signal
+import subprocess
+import sys
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger("supervisor")
+
+
+def run_api():
+    import uvicorn
+
+    # uvicorn сам запускает и перезапускает API_WORKERS воркеров;
+    # воркеры импортируют только API (без aiogram) и не трогают схему БД
+    uvicorn.run(
+        "app.api.main:create_app",
+        factory=True,
+        host=settings.WEBAPP_HOST,
+        port=settings.WEBAPP_PORT,
+        workers=settings.API_WORKERS,
+    )
+
+
+def install_stop_handlers(stop: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+
+async def bot_role():
+    from app.bot.bot import create_bot, create_dispatcher, start_bot
+    from app.core.health import start_health_server
+    from app.core.lifecycle import drain_bot, wait_tasks, close_resources
+    from app.database.database import ping_db
+
+    bot = create_bot()
+    dp = create_dispatcher()
+    started = asyncio.Event()
+    stop = asyncio.Event()
+    install_stop_handlers(stop)
+
+    async def on_startup():
+        started.set()
+
+    async def ready():
+        return started.is_set() and not stop.is_set() and await asyncio.to_thread(ping_db)
+
+    dp.startup.register(on_startup)
+    runner = await start_health_server("bot", settings.BOT_HEALTH_PORT, ready)
+    polling = asyncio.create_task(start_bot(bot, dp), name="polling")
+    await asyncio.wait([polling, asyncio.create_task(stop.wait())], return_when=asyncio.FIRST_COMPLETED)
+    try:
+        await drain_bot(dp, bot=bot)
+        await wait_tasks([polling])
+        if not stop.is_set():
+            # polling завершился сам — пробрасываем ошибку, супервизор перезапустит роль
+            polling.result()
+    finally:
+        await runner.cleanup()
+        await close_resources(bot)
+
+
+async def jobs_role():
+    from aiogram import Bot
+    from app.core.health import start_health_server
+    from app.core.lifecycle import wait_tasks, close_resources
+    from app.database.database import ping_db
+    from app.jobs.runner import run_jobs
+
+    bot = Bot(token=settings.BOT_TOKEN)
+    stop = asyncio.Event()
+    install_stop_handlers(stop)
+
+    async def ready():
+        return not stop.is_set() and await asyncio.to_thread(ping_db)
+
+    runner = await start_health_server("jobs", settings.JOBS_HEALTH_PORT, ready)
+    jobs = asyncio.create_task(run_jobs(bot, stop), name="jobs")
+    try:
+        await stop.wait()
+        # Рассылки сохраняют курсор и выходят после текущего сообщения
+        await wait_tasks([jobs])
+    finally:
+        await runner.cleanup()
+        await close_resources(bot)
+
+
+def run_bot():
+    asyncio.run(bot_role())
+
+
+def run_jobs():
+    asyncio.run(jobs_role())
+
+
+ROLES = {
+    "api": run_api,
+    "bot": run_bot,
+    "jobs": run_jobs,
+}
+
+
+class Supervisor:
+    restart_delay = 1.0
+    max_restart_delay = 60.0
+
+    def __init__(self, roles):
+        self.roles = roles
+        self.processes = {}
+        self.delays = {role: self.restart_delay for role in roles}
+        self.stopping = False
+
+    def start(self, role):
+        # Каждая роль — отдельный интерпретатор: uvicorn с workers > 1 не работает
+        # внутри дочернего процесса multiprocessing
+        process = subprocess.Popen([sys.executable, "-m", "app.supervisor", "--role", role])
+        self.processes[role] = process
+        logger.info("Started %s (pid %s)", role, process.pid)
+
+    def handle_signal(self, signum, frame):
+        logger.info("Received %s, shutting down", signal.Signals(signum).name)
+        self.stopping = True
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.handle_signal)
+        signal.signal(signal.SIGINT, self.handle_signal)
+        for role in self.roles:
+            self.start(role)
+        while not self.stopping:
+            time.sleep(0.5)
+            for role, process in list(self.processes.items()):
+                if process.poll() is None or self.stopping:
+                    continue
+                # Упавшую роль перезапускаем с экспоненциальной задержкой
+                delay = self.delays[role]
+                logger.warning("%s exited with code %s, restarting in %.0fs", role, process.returncode, delay)
+                time.sleep(delay)
+                self.delays[role] = min(delay * 2, self.max_restart_delay)
+                if not self.stopping:
+                    self.start(role)
+        self.shutdown()
+
+    def shutdown(self):
+        for process in self.processes.values():
+            if process.poll() is None:
+                process.terminate()
+        deadline = time.monotonic() + settings.SHUTDOWN_TIMEOUT
+        for role, process in self.processes.items():
+            try:
+                process.wait(max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                logger.warning("%s did not stop in time, killing", role)
+                process.kill()
+                process.wait()
+            logger.info("%s stopped with code %s", role, process.returncode)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--role", choices=sorted(ROLES))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    if args.role:
+        ROLES[args.role]()
+        return
+
+    # Миграции применяются один раз до старта ролей
+    from app.database.migrate import upgrade_head
+    upgrade_head()
+
+    Supervisor(ROLES).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Нагрузочный тест REST API.
+
+Запускает N конкурентных клиентов против работающего сервера и печатает
+RPS и перцентили задержки по каждому эндпоинту.
+
+    uvicorn --factory app.api.main:create_app --port 8000 &
+    python -m benchmarks.bench_api --url http://127.0.0.1:8000 --concurrency 64 --seconds 15
+
+С флагом --seed база заранее наполняется мероприятиями через POST /events/.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def seed(client, count):
+    start = datetime.utcnow()
+    for i in range(count):
+        await client.post("/events/", json={
+            "title": f"Bench event {i}",
+            "description": "Концерт",
+            "date": (start + timedelta(hours=i)).isoformat(),
+            "location": "Aktau",
+        })
+
+
+async def run(url, paths, concurrency, seconds):
+    latencies = {path: [] for path in paths}
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        async def worker(n):
+            nonlocal errors
+            i = n
+            while time.perf_counter() < deadline:
+                path = paths[i % len(paths)]
+                i += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies[path].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"total: {total / elapsed:.1f} req/s, errors={errors}")
+    for path, values in latencies.items():
+        print(
+            f"{path:<32} n={len(values):<7} "
+            f"p50={statistics.median(values or [0]) * 1000:.1f}ms "
+            f"p95={percentile(values, 0.95) * 1000:.1f}ms "
+            f"p99={percentile(values, 0.99) * 1000:.1f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--path", action="append", dest="paths")
+    args = parser.parse_args()
+    paths = args.paths or ["/events/?limit=50", "/events/1", "/events/?skip=100&limit=100"]
+
+    async def go():
+        if args.seed:
+            async with httpx.AsyncClient(base_url=args.url, timeout=30) as client:
+                await seed(client, args.seed)
+        await run(args.url, paths, args.concurrency, args.seconds)
+
+    asyncio.run(go())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Бенчмарк профилей движка БД.
+
+Проверяет, что PRAGMA из настроек применились к каждому соединению, и
+сравнивает пропускную способность конкурентных чтений/записей из пула
+потоков (как у синхронных роутов FastAPI) для движка по умолчанию и для
+настроенного профиля.
+
+    python -m benchmarks.bench_db --threads 16 --ops 200
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import build_engine, is_sqlite, sqlite_pragmas
+from app.models.base import Base
+from app.models.event import Event
+
+
+SYNCHRONOUS_LEVELS = {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3}
+
+
+def check_pragmas(engine):
+    expected = sqlite_pragmas()
+    expected["synchronous"] = SYNCHRONOUS_LEVELS[expected["synchronous"]]
+    problems = []
+    with engine.connect() as conn:
+        for name, value in expected.items():
+            actual = conn.execute(text(f"PRAGMA {name}")).scalar()
+            if str(actual).upper() != str(value).upper():
+                problems.append(f"{name}: expected {value}, got {actual}")
+    return problems
+
+
+def run_workload(engine, threads, ops, write_ratio):
+    Session = sessionmaker(bind=engine, autoflush=False)
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(n):
+        nonlocal errors
+        local = []
+        for i in range(ops):
+            started = time.perf_counter()
+            db = Session()
+            try:
+                if (i % 100) < write_ratio * 100:
+                    db.add(Event(title=f"bench {n}-{i}", date=datetime.utcnow(), location="bench"))
+                    db.commit()
+                else:
+                    db.query(Event).order_by(Event.id.desc()).limit(10).all()
+            except Exception:
+                with lock:
+                    errors += 1
+            finally:
+                db.close()
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "ops/s": len(latencies) / elapsed,
+        "p50 ms": statistics.median(latencies) * 1000,
+        "p99 ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=200)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profiles = {
+            "default": lambda url: create_engine(url, connect_args={"check_same_thread": False}),
+            "tuned": build_engine,
+        }
+        for name, factory in profiles.items():
+            url = f"sqlite:///{os.path.join(tmp, name + '.db')}"
+            engine = factory(url)
+            Base.metadata.create_all(bind=engine)
+            if name == "tuned" and is_sqlite(url):
+                problems = check_pragmas(engine)
+                if problems:
+                    raise SystemExit("PRAGMA check failed: " + "; ".join(problems))
+            result = run_workload(engine, args.threads, args.ops, args.write_ratio)
+            engine.dispose()
+            print(name.ljust(8), "  ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Задержка поиска дублей при создании мероприятия на большой таблице.
+
+Наполняет временную SQLite-базу мероприятиями за --days дней и для слегка
+изменённых названий существующих мероприятий сравнивает поиск по индексу
+полос SimHash (dedupe.find_duplicate) с перебором всех мероприятий города.
+
+    python -m benchmarks.bench_dedupe --events 50000 --days 365 --queries 50
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.core import simhash
+from app.core.config import settings
+from app.database import dedupe
+from app.database.database import build_engine
+from app.models.base import Base
+from app.models.event import Event, EventTitleBand, title_band_rows
+
+WORDS = (
+    "концерт", "вечеринка", "джаз", "стендап", "кино", "йога", "лекция", "квиз", "маркет", "фестиваль",
+    "рок", "техно", "open", "air", "night", "party", "на", "пляже", "в", "порту", "клубе", "парке",
+)
+
+
+def random_title(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))) + f" {rng.randint(1, 999)}"
+
+
+def seed(Session, events, days, city, rng):
+    start = datetime(2030, 1, 1)
+    rows = [
+        {
+            "id": i + 1,
+            "title": random_title(rng),
+            "date": start + timedelta(days=rng.randrange(days), hours=rng.randint(10, 23)),
+            "city": city,
+            "created_at": start,
+            "updated_at": start,
+        }
+        for i in range(events)
+    ]
+    with Session() as db:
+        # Core-вставка без слушателей ORM: полосы пишутся здесь же, счётчики дней не нужны
+        db.execute(Event.__table__.insert(), rows)
+        db.execute(EventTitleBand.__table__.insert(), [
+            band for row in rows for band in title_band_rows(row["id"], city, row["date"], row["title"])
+        ])
+        db.commit()
+    return rows
+
+
+def full_scan(db, city, date, title):
+    value = simhash.simhash(title)
+    rows = db.execute(select(Event.id, Event.date, Event.title).where(Event.city == city)).all()
+    matches = [
+        (simhash.distance(simhash.simhash(row.title), value), row.id)
+        for row in rows
+        if row.date.date() == date.date()
+    ]
+    matches = [match for match in matches if match[0] <= settings.DEDUP_MAX_DISTANCE]
+    return min(matches)[1] if matches else None
+
+
+def measure(Session, search, queries, city):
+    timings = []
+    with Session() as db:
+        for date, title in queries:
+            started = time.perf_counter()
+            search(db, city, date, title)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    city = settings.get_default_city()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        rows = seed(Session, args.events, args.days, city, rng)
+        # Повторная отправка того же мероприятия: другой регистр и пунктуация, время на час позже
+        queries = [
+            (row["date"] + timedelta(hours=1) if row["date"].hour < 23 else row["date"], row["title"].upper() + "!")
+            for row in rng.sample(rows, args.queries)
+        ]
+        with Session() as db:
+            for date, title in queries[:20]:
+                assert dedupe.find_duplicate(db, city, date, title) == full_scan(db, city, date, title)
+        for name, search in (("band index", dedupe.find_duplicate), ("full scan", full_scan)):
+            p50, p95 = measure(Session, search, queries, city)
+            print(f"{name:<11} p50 {p50:8.2f} ms  p95 {p95:8.2f} ms  ({args.events} events, {args.days} days)")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
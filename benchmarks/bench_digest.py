@@ -0,0 +1,91 @@
+"""Загруженный день: сообщение на каждое новое мероприятие против дайджеста.
+
+Подписывает --users пользователей, добавляет --events мероприятий и прогоняет
+задачу дайджестов (app/jobs/digest.py) с заглушкой вместо сессии Bot. Печатает
+число отправленных сообщений и время прохода; для сравнения — сколько
+сообщений ушло бы при отправке каждого мероприятия отдельно.
+
+    python -m benchmarks.bench_digest --users 5000 --events 30
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+async def run(users, events):
+    from aiogram import Bot
+    from aiogram.client.session.base import BaseSession
+
+    from app.core.config import settings
+    from app.database.database import SessionLocal
+    from app.database.migrate import upgrade_head
+    from app.jobs.digest import send_digests
+    from app.models.digest import DigestPreference
+    from app.models.event import Event
+    from app.models.subscriber import Subscriber
+
+    sent = 0
+
+    class CountingSession(BaseSession):
+        async def make_request(self, bot, method, timeout=None):
+            nonlocal sent
+            sent += 1
+            return None
+
+        async def stream_content(self, *args, **kwargs):
+            yield b""
+
+        async def close(self):
+            pass
+
+    upgrade_head()
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        db.execute(Subscriber.__table__.insert(), [
+            {"user_id": user_id, "city": settings.get_default_city(), "created_at": now, "updated_at": now}
+            for user_id in range(users)
+        ])
+        db.execute(DigestPreference.__table__.insert(), [
+            {"user_id": user_id, "frequency": "daily", "cursor": 0, "next_send_at": now + timedelta(days=1)}
+            for user_id in range(users)
+        ])
+        # ORM-вставка: мероприятия попадают в журнал изменений, как при добавлении в боте
+        db.add_all(Event(title=f"Мероприятие {i}", date=now + timedelta(days=1, hours=i)) for i in range(events))
+        # Наступило время рассылки
+        db.query(DigestPreference).update({DigestPreference.next_send_at: now})
+        db.commit()
+
+    bot = Bot("42:BENCH", session=CountingSession())
+    stop = asyncio.Event()
+    started = time.perf_counter()
+    passes = 0
+    while True:
+        before = sent
+        await send_digests(bot, stop)
+        passes += 1
+        if sent == before:
+            break
+    elapsed = time.perf_counter() - started
+    print(f"message per event: {users * events:>8} messages")
+    print(f"digest:            {sent:>8} messages, {passes - 1} passes, {elapsed * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("BOT_TOKEN", "42:BENCH")
+        # Без ограничения скорости Telegram — меряется работа самой задачи
+        os.environ["BROADCAST_RATE"] = "1000000"
+        asyncio.run(run(args.users, args.events))
+
+
+if __name__ == "__main__":
+    main()
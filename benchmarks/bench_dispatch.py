@@ -0,0 +1,118 @@
+"""Стоимость маршрутизации одного сообщения в Dispatcher бота.
+
+Прогоняет через dp.feed_update сообщения разных видов с заглушкой вместо
+сессии Bot (без сети) и печатает задержку и число чтений состояния из
+хранилища FSM на сообщение.
+
+    python -m benchmarks.bench_dispatch --messages 20000
+
+С флагом --plain-storage хранилище не оборачивается в IndexedStorage —
+для сравнения числа обращений к хранилищу.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def make_update(update_id, user_id, text):
+    from aiogram.types import Update
+
+    message = {
+        "message_id": update_id,
+        "date": int(datetime.utcnow().timestamp()),
+        "chat": {"id": user_id, "type": "private"},
+        "from": {"id": user_id, "is_bot": False, "first_name": "Bench"},
+        "text": text,
+    }
+    if text.startswith("/"):
+        message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text)}]
+    return Update.model_validate({"update_id": update_id, "message": message})
+
+
+async def run(messages, plain_storage):
+    from aiogram import Bot
+    from aiogram.client.session.base import BaseSession
+    from aiogram.fsm.storage.base import StorageKey
+    from aiogram.fsm.storage.memory import MemoryStorage
+
+    from app.bot.bot import SearchStates, create_dispatcher
+    from app.bot.routing import IndexedStorage
+    from app.core.lifecycle import close_resources
+    from app.database.migrate import upgrade_head
+
+    class NullSession(BaseSession):
+        async def make_request(self, bot, method, timeout=None):
+            return None
+
+        async def stream_content(self, *args, **kwargs):
+            yield b""
+
+        async def close(self):
+            pass
+
+    upgrade_head()
+    dp = create_dispatcher()
+    if plain_storage:
+        dp.fsm.storage = MemoryStorage()
+    bot = Bot("42:BENCH", session=NullSession())
+
+    storage = dp.fsm.storage.storage if isinstance(dp.fsm.storage, IndexedStorage) else dp.fsm.storage
+    reads = 0
+    get_state = storage.get_state
+
+    async def counting_get_state(key):
+        nonlocal reads
+        reads += 1
+        return await get_state(key)
+
+    storage.get_state = counting_get_state
+
+    # Пользователь 2 всё время ждёт ввода даты — сообщения идут в обработчик состояния
+    await dp.fsm.storage.set_state(StorageKey(bot_id=bot.id, chat_id=2, user_id=2), SearchStates.wait_date)
+    kinds = {
+        "unmatched": (1, "просто текст"),
+        "button": (1, "Помощь"),
+        "command": (1, "/help"),
+        "state": (2, "не дата"),
+    }
+    ids = itertools.count(1)
+    print(f"{'kind':<10} {'mean µs':>9} {'p50 µs':>9} {'p95 µs':>9} {'reads/msg':>10}")
+    for kind, (user_id, text) in kinds.items():
+        updates = [make_update(next(ids), user_id, text) for _ in range(messages)]
+        timings = []
+        reads = 0
+        for update in updates:
+            start = time.perf_counter()
+            await dp.feed_update(bot, update)
+            timings.append((time.perf_counter() - start) * 1e6)
+        print(
+            f"{kind:<10} {statistics.mean(timings):>9.1f} {percentile(timings, 0.5):>9.1f} "
+            f"{percentile(timings, 0.95):>9.1f} {reads / messages:>10.2f}"
+        )
+    await close_resources(bot)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--plain-storage", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("BOT_TOKEN", "42:BENCH")
+        asyncio.run(run(args.messages, args.plain_storage))
+
+
+if __name__ == "__main__":
+    main()
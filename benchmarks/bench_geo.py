@@ -0,0 +1,115 @@
+"""Задержка поиска «рядом со мной» на большом справочнике заведений.
+
+Наполняет временную SQLite-базу заведениями вокруг Актау и мероприятиями в них,
+затем для случайных точек сравнивает выборку через прямоугольник по индексу
+(geo.nearby_events) с полным перебором всех заведений.
+
+    python -m benchmarks.bench_geo --venues 5000 --events-per-venue 2 --queries 500
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import geo
+from app.database.database import build_engine
+from app.database.read_models import fetch
+from app.models.base import Base
+from app.models.event import Event
+from app.models.venue import Venue
+
+AKTAU = (43.65, 51.17)
+# Разброс координат ~±25 км вокруг центра
+SPREAD = 0.25
+
+
+def seed(Session, venues, events_per_venue, rng):
+    start = datetime.utcnow()
+    with Session() as db:
+        db.bulk_insert_mappings(Venue, [
+            {
+                "id": i + 1,
+                "name": f"Venue {i}",
+                "latitude": AKTAU[0] + rng.uniform(-SPREAD, SPREAD),
+                "longitude": AKTAU[1] + rng.uniform(-SPREAD, SPREAD),
+                "created_at": start,
+                "updated_at": start,
+            }
+            for i in range(venues)
+        ])
+        # Core-вставка: счётчики по дням для бенчмарка не нужны
+        db.execute(Event.__table__.insert(), [
+            {
+                "title": f"Event {i}",
+                "date": start + timedelta(hours=rng.randint(1, 24 * 60)),
+                "venue_id": i % venues + 1,
+                "created_at": start,
+                "updated_at": start,
+            }
+            for i in range(venues * events_per_venue)
+        ])
+        db.commit()
+
+
+def full_scan(db, lat, lon, radius_km, limit):
+    stmt = (
+        select(
+            Event.id, Event.title, Event.date, Event.location, Event.description,
+            Venue.latitude, Venue.longitude, Event.rrule,
+        )
+        .join(Venue, Venue.id == Event.venue_id)
+        .where(Event.date >= datetime.utcnow())
+    )
+    return geo.rank_by_distance(fetch(db, stmt, geo.NearbyEvent), lat, lon, radius_km, limit, order=lambda row: row.date)
+
+
+def measure(Session, search, points, radius_km, limit):
+    timings = []
+    with Session() as db:
+        for lat, lon in points:
+            started = time.perf_counter()
+            search(db, lat, lon, radius_km, limit)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--venues", type=int, default=5000)
+    parser.add_argument("--events-per-venue", type=int, default=2)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--radius-km", type=float, default=2.0)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        seed(Session, args.venues, args.events_per_venue, rng)
+        points = [
+            (AKTAU[0] + rng.uniform(-SPREAD, SPREAD), AKTAU[1] + rng.uniform(-SPREAD, SPREAD))
+            for _ in range(args.queries)
+        ]
+        # Проверка: оба способа дают одинаковый результат
+        with Session() as db:
+            for lat, lon in points[:20]:
+                expected = [row.id for row, _ in full_scan(db, lat, lon, args.radius_km, args.limit)]
+                actual = [row.id for row, _ in geo.nearby_events(db, lat, lon, args.radius_km, args.limit)]
+                assert expected == actual, (expected, actual)
+        for name, search in (("bounding box", geo.nearby_events), ("full scan", full_scan)):
+            p50, p95 = measure(Session, search, points, args.radius_km, args.limit)
+            print(f"{name:<13} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  ({args.venues} venues, r={args.radius_km:g} km)")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Профиль времени импорта (python -X importtime) для точек входа.
+
+Для каждого модуля запускает чистый интерпретатор, суммирует время импорта
+и печатает самые тяжёлые пакеты верхнего уровня. Показывает, что воркер API
+не тянет aiogram и не выполняет работу при импорте.
+
+    python -m benchmarks.bench_importtime
+    python -m benchmarks.bench_importtime --module app.api.main --top 15 --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+DEFAULT_MODULES = ["app.api.main", "app.bot.bot", "app.supervisor", "main"]
+
+
+def profile(module):
+    env = dict(os.environ, BOT_TOKEN=os.environ.get("BOT_TOKEN") or "42:TEST")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+    self_us = {}
+    cumulative_us = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_part, cumulative_part, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        self_us[name] = int(self_part)
+        cumulative_us[name] = int(cumulative_part)
+    return self_us, cumulative_us
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", action="append", dest="modules")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for module in args.modules or DEFAULT_MODULES:
+        totals = []
+        packages = defaultdict(int)
+        loaded = set()
+        for _ in range(args.runs):
+            self_us, cumulative_us = profile(module)
+            totals.append(sum(self_us.values()))
+            loaded = set(self_us)
+        for name, value in self_us.items():
+            packages[name.split(".")[0]] += value
+        print(f"{module}: {statistics.median(totals) / 1000:.1f} ms, {len(loaded)} modules"
+              f"{'' if 'aiogram' in loaded else ', no aiogram'}")
+        for package, value in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {package:<24} {value / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""«Популярное»: подсчёт избранного на каждый запрос против готового score.
+
+Наполняет временную SQLite-базу --events предстоящими мероприятиями и
+--favorites избранными за последние 30 дней и сравнивает задержку списка
+«Популярное»: GROUP BY по favorites за 7 дней (как считали бы без рейтинга)
+и read_models.popular_events — обход индекса (city, score) event_popularity.
+Отдельно — сколько стоит поддерживать рейтинг: --taps нажатий «Подробнее»
+через буфер отложенной записи.
+
+    python -m benchmarks.bench_popularity --events 20000 --favorites 500000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.database import read_models
+from app.database.database import build_engine
+from app.database.write_behind import WriteBehind
+from app.models.base import Base
+from app.models.event import Event
+from app.models.favorite import Favorite
+from app.models.popularity import add_scores, log_weight, logaddexp
+
+
+def seed(Session, events, favorites, now, rng):
+    city = settings.get_default_city()
+    with Session() as db:
+        db.execute(Event.__table__.insert(), [
+            {"title": f"Мероприятие {i}", "date": now + timedelta(hours=rng.randint(1, 24 * 60)), "city": city,
+             "created_at": now, "updated_at": now}
+            for i in range(events)
+        ])
+        rows = [
+            # Популярность неравномерна: немногие мероприятия собирают большую часть избранного
+            {"user_id": i, "event_id": min(events, int(rng.paretovariate(1.2))),
+             "created_at": now - timedelta(minutes=rng.randrange(30 * 24 * 60))}
+            for i in range(favorites)
+        ]
+        db.execute(Favorite.__table__.insert(), rows)
+        scores = {}
+        for row in rows:
+            increment = log_weight(settings.POPULARITY_FAVORITE_WEIGHT, row["created_at"])
+            scores[row["event_id"]] = logaddexp(scores.get(row["event_id"]), increment)
+        add_scores(db.connection(), scores, now)
+        db.commit()
+
+
+def group_by_favorites(db, city, limit, now):
+    counts = (
+        select(Favorite.event_id, func.count().label("favorites"))
+        .where(Favorite.created_at >= now - timedelta(days=7))
+        .group_by(Favorite.event_id)
+        .subquery()
+    )
+    stmt = (
+        select(*read_models.EVENT_ROW_COLUMNS)
+        .join(counts, counts.c.event_id == Event.id)
+        .where(Event.city == city, Event.date >= now)
+        .order_by(counts.c.favorites.desc())
+        .limit(limit)
+    )
+    return read_models.fetch(db, stmt, read_models.EventRow)
+
+
+def measure(Session, query, now, repeat):
+    city = settings.get_default_city()
+    timings = []
+    with Session() as db:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            query(db, city, settings.POPULAR_LIMIT, now)
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def taps(Session, events, count, rng):
+    buffer = WriteBehind(lambda primary=False: Session(), max_pending=10 ** 9)
+    started = time.perf_counter()
+    for _ in range(count):
+        buffer.add_hit(rng.randint(1, events), settings.POPULARITY_DETAILS_WEIGHT)
+    accepted = time.perf_counter() - started
+    await buffer.flush()
+    return accepted, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--favorites", type=int, default=500000)
+    parser.add_argument("--taps", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        seed(Session, args.events, args.favorites, now, rng)
+        group_by = measure(Session, group_by_favorites, now, args.repeat)
+        indexed = measure(Session, read_models.popular_events, now, args.repeat)
+        print(f"GROUP BY favorites (7 days): p50 {group_by:8.2f} ms")
+        print(f"event_popularity index:      p50 {indexed:8.2f} ms")
+        accepted, durable = asyncio.run(taps(Session, args.events, args.taps, rng))
+        print(f"{args.taps} taps: {accepted * 1000:.1f} ms to accept, {durable * 1000:.1f} ms until durable")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Сравнение ORM-сущностей и read-моделей на больших списках.
+
+Наполняет временную SQLite-базу N мероприятиями и для каждого варианта
+меряет время выборки+форматирования карточек и пик памяти (tracemalloc).
+
+    python -m benchmarks.bench_read_models --rows 10000 --runs 5
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.database import read_models
+from app.database.database import build_engine
+from app.models.base import Base
+from app.models.event import Event
+
+
+def seed(Session, rows):
+    start = datetime.utcnow()
+    with Session() as db:
+        db.bulk_insert_mappings(Event, [
+            {
+                "title": f"Event {i}",
+                "description": f"Концерт #{i} " * 5,
+                "date": start + timedelta(minutes=i),
+                "location": "Aktau",
+                "created_at": start,
+                "updated_at": start,
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+
+
+def orm_list(db):
+    return db.query(Event).order_by(Event.date).all()
+
+
+def read_model_list(db):
+    return read_models.all_events(db, settings.get_default_city())
+
+
+def render(events):
+    return [
+        f"{event.title}|{event.date:%d.%m.%Y %H:%M}|{event.location}|{event.description}"
+        for event in events
+    ]
+
+
+def measure(Session, loader, runs):
+    timings = []
+    peaks = []
+    for _ in range(runs):
+        with Session() as db:
+            tracemalloc.start()
+            started = time.perf_counter()
+            render(loader(db))
+            timings.append(time.perf_counter() - started)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return statistics.median(timings), max(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        seed(Session, args.rows)
+        for name, loader in (("orm entities", orm_list), ("read models", read_model_list)):
+            elapsed, peak = measure(Session, loader, args.runs)
+            print(f"{name:<14} {elapsed * 1000:8.1f} ms  peak {peak / 1024 / 1024:7.1f} MiB  ({args.rows} rows)")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Время пересборки рекомендаций «Для вас» на синтетическом избранном.
+
+Считает только compute() из app/jobs/recommendations.py (без базы): сколько
+длится векторизованный расчёт сходств и подборок на N пользователей.
+
+    python -m benchmarks.bench_recommendations --users 50000 --events 3000 --favorites 20
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.jobs.recommendations import compute
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--events", type=int, default=3000)
+    parser.add_argument("--favorites", type=int, default=20, help="среднее число избранных на пользователя")
+    parser.add_argument("--similar-k", type=int, default=20)
+    parser.add_argument("--per-user", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    total = args.users * args.favorites
+    users = rng.integers(0, args.users, total)
+    # Популярность мероприятий неравномерная: Zipf-подобное распределение
+    weights = 1 / np.arange(1, args.events + 1)
+    events = rng.choice(args.events, total, p=weights / weights.sum())
+    upcoming = rng.random(args.events) < 0.5
+
+    started = time.perf_counter()
+    (a, _, _), (rec_users, _, _, _) = compute(
+        users, events, upcoming, args.similar_k, args.per_user, max_favorites=200,
+    )
+    elapsed = time.perf_counter() - started
+    print(
+        f"{total} favorites, {args.users} users, {args.events} events: {elapsed:.2f}s "
+        f"({len(a)} similar pairs, {len(rec_users)} user rows)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Списки с повторяющимися мероприятиями: серии против отдельных строк.
+
+Наполняет временные SQLite-базы одинаковым расписанием: еженедельные
+мероприятия хранятся сериями (одна строка и RRULE) — с повторениями
+ближайших дней в event_occurrences (окно сдвигается перед каждым замером,
+как ежедневной задачей), и без них (ленивое развёртывание на каждый
+запрос), — или строкой на каждое повторение за
+--years лет, как до появления серий. Сравнивает размер таблиц и задержку
+«ближайших» и календаря месяца.
+
+    python -m benchmarks.bench_recurrence --series 300 --one-offs 5000 --years 3
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core import recurrence
+from app.core.config import settings
+from app.database import read_models
+from app.database.database import build_engine
+from app.models.base import Base
+from app.models.event import Event, EventOccurrence, shift_occurrences
+
+START = datetime(2030, 1, 1)
+
+
+def schedule(series, one_offs, years, rng):
+    weekly = [
+        {"title": f"Квиз {i}", "date": START + timedelta(days=rng.randrange(7), hours=rng.randint(10, 22)),
+         "rrule": f"FREQ=WEEKLY;UNTIL={START.year + years}0101T000000"}
+        for i in range(series)
+    ]
+    single = [
+        {"title": f"Концерт {i}", "date": START + timedelta(days=rng.randrange(365 * years), hours=rng.randint(10, 22))}
+        for i in range(one_offs)
+    ]
+    return weekly, single
+
+
+def seed(Session, weekly, single, layout, years):
+    rows = list(single)
+    for row in weekly:
+        if layout == "row per date":
+            dates = recurrence.parse_rule(row["rrule"], row["date"])
+            rows += [{"title": row["title"], "date": occurrence} for occurrence in dates]
+        else:
+            rows.append(row)
+    with Session() as db:
+        # ORM-вставка: слушатели заполняют recurrence_end и счётчики дней
+        db.add_all(Event(city=settings.get_default_city(), **row) for row in rows)
+        if layout == "occurrences":
+            shift_occurrences(db.connection(), START, START + timedelta(days=settings.OCCURRENCE_WINDOW_DAYS))
+        db.commit()
+        return db.scalar(select(func.count(Event.id))) + db.scalar(select(func.count()).select_from(EventOccurrence))
+
+
+def measure(Session, repeat, window):
+    city = settings.get_default_city()
+    timings = {"upcoming": [], "month": []}
+    with Session() as db:
+        for i in range(repeat):
+            now = START + timedelta(days=7 * i)
+            if window:
+                shift_occurrences(db.connection(), now, now + timedelta(days=settings.OCCURRENCE_WINDOW_DAYS))
+                db.commit()
+            started = time.perf_counter()
+            read_models.upcoming_events(db, city, 10, now)
+            timings["upcoming"].append((time.perf_counter() - started) * 1000)
+            month = date(now.year, now.month, 1)
+            started = time.perf_counter()
+            read_models.event_days(db, city, month, month + timedelta(days=31))
+            read_models.events_between(db, city, now, now + timedelta(days=1))
+            timings["month"].append((time.perf_counter() - started) * 1000)
+    return {name: statistics.median(values) for name, values in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--series", type=int, default=300)
+    parser.add_argument("--one-offs", type=int, default=5000)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    weekly, single = schedule(args.series, args.one_offs, args.years, random.Random(42))
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout in ("lazy series", "occurrences", "row per date"):
+            engine = build_engine(f"sqlite:///{os.path.join(tmp, f'{layout}.db')}")
+            Base.metadata.create_all(bind=engine)
+            Session = sessionmaker(bind=engine)
+            rows = seed(Session, weekly, single, layout, args.years)
+            timings = measure(Session, args.repeat, layout == "occurrences")
+            print(
+                f"{layout:<12} {rows:>7} rows  upcoming p50 {timings['upcoming']:7.2f} ms"
+                f"  day + month p50 {timings['month']:7.2f} ms"
+            )
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
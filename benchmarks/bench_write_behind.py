@@ -0,0 +1,63 @@
+"""Всплеск нажатий ⭐: запись каждой строки отдельным commit против буфера write-behind.
+
+    python -m benchmarks.bench_write_behind --taps 5000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+async def run(taps):
+    from app.database.database import SessionLocal
+    from app.database.migrate import upgrade_head
+    from app.database.write_behind import WriteBehind
+    from app.models.event import Event
+    from app.models.favorite import Favorite
+
+    upgrade_head()
+    with SessionLocal() as db:
+        event = Event(title="Bench", date=datetime.utcnow() + timedelta(days=1))
+        db.add(event)
+        db.commit()
+        event_id = event.id
+
+    # Как было в обработчике: проверка, add, commit на каждое нажатие
+    started = time.perf_counter()
+    for user_id in range(taps):
+        with SessionLocal() as db:
+            if not db.query(Favorite.id).filter_by(user_id=user_id, event_id=event_id).first():
+                db.add(Favorite(user_id=user_id, event_id=event_id))
+                db.commit()
+    direct = time.perf_counter() - started
+
+    buffer = WriteBehind(SessionLocal, flush_interval=0.5)
+    await buffer.start()
+    started = time.perf_counter()
+    for user_id in range(taps, 2 * taps):
+        buffer.add_favorite(user_id, event_id)
+        # Обработчики уступают циклу событий между апдейтами
+        await asyncio.sleep(0)
+    accepted = time.perf_counter() - started
+    await buffer.close()
+    flushed = time.perf_counter() - started
+
+    print(f"commit per tap: {direct * 1000:8.1f} ms total, {direct / taps * 1e6:7.1f} µs/tap")
+    print(f"write-behind:   {accepted * 1000:8.1f} ms to accept, {flushed * 1000:8.1f} ms until durable")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--taps", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("BOT_TOKEN", "42:BENCH")
+        asyncio.run(run(args.taps))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Воспроизведение записанного потока апдейтов (app/bot/recorder.py) на текущей сборке.
+
+Апдейты из лога подаются в Dispatcher с заглушкой вместо сессии Bot (без сети)
+с исходными интервалами, ускоренными в --speed раз, или подряд без пауз
+(--speed 0). Печатает распределение задержки по обработчикам и, для
+сравнения, задержку тех же обработчиков при записи.
+
+    python -m benchmarks.replay_updates updates.jsonl.gz --speed 10 --api-latency 40
+
+Обработчики пишут в базу DATABASE_URL — воспроизводите на копии или на
+отдельной базе. Для сравнения сборок сохраните отчёт (--json) каждой и
+сравните их.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import statistics
+import time
+import zlib
+from collections import defaultdict
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def read_log(path, limit=None):
+    records = []
+    with gzip.open(path, "rt", encoding="utf-8") as log:
+        try:
+            for line in log:
+                records.append(json.loads(line))
+                if limit and len(records) >= limit:
+                    break
+        except (EOFError, zlib.error, json.JSONDecodeError):
+            # Хвост последнего запуска мог не дописаться при аварийной остановке
+            pass
+    records.sort(key=lambda record: record["at"])
+    return records
+
+
+def summarize(samples):
+    return {
+        "count": len(samples),
+        "p50": statistics.median(samples),
+        "p95": percentile(samples, 0.95),
+        "p99": percentile(samples, 0.99),
+        "max": max(samples),
+    }
+
+
+async def replay(records, speed, api_latency):
+    from aiogram import Bot
+    from aiogram.client.session.base import BaseSession
+    from aiogram.types import Update
+
+    from app.bot.bot import create_dispatcher
+    from app.bot.recorder import current_handler, track_handlers
+    from app.core.lifecycle import close_resources, drain_bot
+    from app.database.migrate import upgrade_head
+
+    class MockSession(BaseSession):
+        async def make_request(self, bot, method, timeout=None):
+            if api_latency:
+                await asyncio.sleep(api_latency)
+            return None
+
+        async def stream_content(self, *args, **kwargs):
+            yield b""
+
+        async def close(self):
+            pass
+
+    upgrade_head()
+    dp = create_dispatcher()
+    track_handlers(dp)
+    bot = Bot("42:REPLAY", session=MockSession())
+    await dp.emit_startup()
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+
+    async def feed(update):
+        holder = []
+        current_handler.set(holder)
+        started = time.perf_counter()
+        try:
+            await dp.feed_update(bot, update)
+            failed = False
+        except Exception:
+            failed = True
+        handler = holder[-1] if holder else "(unhandled)"
+        latencies[handler].append((time.perf_counter() - started) * 1000)
+        errors[handler] += failed
+
+    updates = [Update.model_validate(record["update"]) for record in records]
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    if speed:
+        # Как при polling: каждый апдейт — отдельная задача в момент, когда он пришёл
+        first, origin = records[0]["at"], loop.time()
+        tasks = []
+        for record, update in zip(records, updates):
+            delay = origin + (record["at"] - first) / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(feed(update)))
+        await asyncio.gather(*tasks)
+    else:
+        for update in updates:
+            await feed(update)
+    elapsed = time.perf_counter() - started
+    await drain_bot(dp)
+    await close_resources(bot)
+    return latencies, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("log", help="gzip-лог, записанный при UPDATE_LOG_PATH")
+    parser.add_argument("--speed", type=float, default=1.0, help="ускорение относительно записи; 0 — подряд без пауз")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="задержка ответа Telegram API, мс")
+    parser.add_argument("--limit", type=int, default=None, help="воспроизвести только первые N апдейтов")
+    parser.add_argument("--json", help="сохранить отчёт в файл")
+    args = parser.parse_args()
+
+    records = read_log(args.log, args.limit)
+    if not records:
+        print("Log is empty")
+        return
+    latencies, errors, elapsed = asyncio.run(replay(records, args.speed, args.api_latency / 1000))
+
+    recorded = defaultdict(list)
+    for record in records:
+        recorded[record["handler"] or "(unhandled)"].append(record["ms"])
+    report = {
+        handler: {**summarize(samples), "errors": errors[handler], "recorded_p50": statistics.median(recorded[handler])
+                  if recorded.get(handler) else None}
+        for handler, samples in latencies.items()
+    }
+    print(f"{len(records)} updates in {elapsed:.1f} s ({len(records) / elapsed:.0f} updates/s)")
+    print(f"{'handler':<36} {'count':>6} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'rec p50':>8}")
+    for handler, row in sorted(report.items(), key=lambda item: -item[1]["count"]):
+        recorded_p50 = f"{row['recorded_p50']:8.2f}" if row["recorded_p50"] is not None else f"{'-':>8}"
+        print(
+            f"{handler[:36]:<36} {row['count']:>6} {row['errors']:>4} {row['p50']:8.2f} {row['p95']:8.2f}"
+            f" {row['p99']:8.2f} {row['max']:8.2f} {recorded_p50}"
+        )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump({"updates": len(records), "elapsed": elapsed, "handlers": report}, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,50 @@
 import asyncio
-import uvicorn
-from fastapi import FastAPI
-from app.bot.bot import start_bot
-from app.database.database import engine
-from app.models.base import Base
+import contextlib
 import signal
 
-app = FastAPI(title="Event Bot API")
+import uvicorn
+
+from app.core.config import settings
 
-@app.get("/")
-async def root():
-    return {"message": "Event Bot API"}
+class Server(uvicorn.Server):
+    # Сигналы обрабатывает main(), а не uvicorn
+    @contextlib.contextmanager
+    def capture_signals(self):
+        yield
 
-# Создание таблиц базы данных
-Base.metadata.create_all(bind=engine)
+async def main():
+    from app.api.main import create_app
+    from app.bot.bot import create_bot, create_dispatcher, start_bot
+    from app.core.lifecycle import drain_bot, wait_tasks, close_resources
+    from app.jobs.runner import run_jobs
 
-async def shutdown(signal, loop):
-    print(f"Received exit signal {signal.name}...")
-    tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
-    [task.cancel() for task in tasks]
-    print(f"Cancelling {len(tasks)} outstanding tasks")
-    await asyncio.gather(*tasks, return_exceptions=True)
-    loop.stop()
+    bot = create_bot()
+    dp = create_dispatcher()
+    stop = asyncio.Event()
+    config = uvicorn.Config(create_app(), host=settings.WEBAPP_HOST, port=settings.WEBAPP_PORT, loop="asyncio")
+    server = Server(config)
 
-def handle_exit():
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     for sig in (signal.SIGTERM, signal.SIGINT):
-        loop.add_signal_handler(
-            sig,
-            lambda s=sig: asyncio.create_task(shutdown(s, loop))
-        )
+        loop.add_signal_handler(sig, stop.set)
 
-async def main():
-    # Запускаем aiogram-бота как задачу
-    bot_task = asyncio.create_task(start_bot())
-    # Запускаем FastAPI через uvicorn в асинхронном режиме
-    config = uvicorn.Config(app, host="0.0.0.0", port=8000, loop="asyncio")
-    server = uvicorn.Server(config)
-    api_task = asyncio.create_task(server.serve())
-    # Ждём завершения обеих задач
-    await asyncio.gather(bot_task, api_task)
+    # Бот, API и фоновые задачи в одном процессе; для раздельного запуска см. app/supervisor.py
+    bot_task = asyncio.create_task(start_bot(bot, dp), name="bot")
+    api_task = asyncio.create_task(server.serve(), name="api")
+    jobs_task = asyncio.create_task(run_jobs(bot, stop), name="jobs")
+
+    await stop.wait()
+    print("Received exit signal, draining...")
+    # Drain: не принимаем новые апдейты и запросы, даём закончить начатые,
+    # фоновые задачи сохраняют курсоры в БД; только потом закрываем пул и сессию бота
+    server.should_exit = True
+    await drain_bot(dp, bot=bot)
+    await wait_tasks([bot_task, api_task, jobs_task])
+    await close_resources(bot)
 
 if __name__ == "__main__":
-    handle_exit()
-    asyncio.run(main()) 
\ No newline at end of file
+    from app.database.migrate import upgrade_head
+
+    # Миграции применяются один раз до старта
+    upgrade_head()
+    asyncio.run(main())
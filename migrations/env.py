@@ -0,0 +1,48 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.core.config import settings
+from app.database.database import build_engine
+from app.models.base import Base
+# Импорт моделей регистрирует таблицы в Base.metadata
+from app.models import event, promotion, feedback, favorite, subscriber, user_lang, broadcast, reminder, venue, recommendation, change_log, heartbeat, digest, popularity  # noqa: F401
+
+config = context.config
+# При запуске из приложения (app/database/migrate.py) логирование уже настроено
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def database_url():
+    return config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = build_engine(database_url())
+    with connectable.connect() as connection:
+        # batch-режим нужен SQLite для ALTER TABLE
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+        with context.begin_transaction():
+            context.run_migrations()
+    connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
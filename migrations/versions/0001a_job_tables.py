@@ -0,0 +1,62 @@
+"""job tables
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-19 17:58:39.784765
+
+Таблицы фонового процесса задач: очередь рассылок и отправленные
+напоминания. Базы, созданные через create_all уже с этими таблицами,
+штампуются ревизией 0001 — тогда существующие таблицы не создаются заново.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0001a'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('broadcast_jobs'):
+        op.create_table('broadcast_jobs',
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('sent_count', sa.Integer(), nullable=False),
+        sa.Column('cursor', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('broadcast_jobs', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_broadcast_jobs_status'), ['status'], unique=False)
+
+    if not inspector.has_table('event_reminders'):
+        op.create_table('event_reminders',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'event_id')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('event_reminders')
+    with op.batch_alter_table('broadcast_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_broadcast_jobs_status'))
+
+    op.drop_table('broadcast_jobs')
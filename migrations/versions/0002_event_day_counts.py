@@ -0,0 +1,38 @@
+"""event day counts
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-19 18:08:00.358255
+
+Материализованные счётчики мероприятий по дням для календаря;
+заполняются из уже существующих мероприятий.
+
+"""
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0002'
+down_revision: Union[str, None] = '0001a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    event_day_counts = op.create_table('event_day_counts',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+
+    events = sa.table('events', sa.column('date', sa.DateTime()))
+    counts = Counter(date.date() for (date,) in op.get_bind().execute(sa.select(events.c.date)))
+    if counts:
+        op.bulk_insert(event_day_counts, [{'day': day, 'count': count} for day, count in counts.items()])
+
+
+def downgrade() -> None:
+    op.drop_table('event_day_counts')
@@ -0,0 +1,80 @@
+"""venues
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 18:15:57.013634
+
+Справочник заведений с координатами; мероприятия и акции ссылаются на него
+через venue_id. Заведения заводятся из уже введённых Event.location и
+Promotion.venue (без координат — их заполняют через API).
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    venues = op.create_table('venues',
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('address', sa.String(length=300), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    with op.batch_alter_table('venues', schema=None) as batch_op:
+        batch_op.create_index('ix_venues_lat_lon', ['latitude', 'longitude'], unique=False)
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('venue_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_events_venue_id'), ['venue_id'], unique=False)
+        batch_op.create_foreign_key('fk_events_venue_id_venues', 'venues', ['venue_id'], ['id'], ondelete='SET NULL')
+
+    with op.batch_alter_table('promotions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('venue_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_promotions_venue_id'), ['venue_id'], unique=False)
+        batch_op.create_foreign_key('fk_promotions_venue_id_venues', 'venues', ['venue_id'], ['id'], ondelete='SET NULL')
+
+    bind = op.get_bind()
+    events = sa.table('events', sa.column('location', sa.String()), sa.column('venue_id', sa.Integer()))
+    promotions = sa.table('promotions', sa.column('venue', sa.String()), sa.column('venue_id', sa.Integer()))
+    names = set()
+    for column in (events.c.location, promotions.c.venue):
+        names.update(name.strip() for (name,) in bind.execute(sa.select(column).distinct()) if name and name.strip())
+    if not names:
+        return
+    now = datetime.utcnow()
+    op.bulk_insert(venues, [{'name': name[:200], 'created_at': now, 'updated_at': now} for name in sorted(names)])
+    venue_ids = {name: venue_id for venue_id, name in bind.execute(sa.select(venues.c.id, venues.c.name))}
+    for table, column in ((events, events.c.location), (promotions, promotions.c.venue)):
+        for name, venue_id in venue_ids.items():
+            bind.execute(sa.update(table).where(sa.func.trim(column) == name).values(venue_id=venue_id))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('promotions', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_promotions_venue_id_venues', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_promotions_venue_id'))
+        batch_op.drop_column('venue_id')
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_events_venue_id_venues', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_events_venue_id'))
+        batch_op.drop_column('venue_id')
+
+    with op.batch_alter_table('venues', schema=None) as batch_op:
+        batch_op.drop_index('ix_venues_lat_lon')
+
+    op.drop_table('venues')
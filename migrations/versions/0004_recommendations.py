@@ -0,0 +1,44 @@
+"""recommendations
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 18:21:07.307144
+
+Таблицы рекомендаций «Для вас». Наполняются фоновой задачей
+app/jobs/recommendations.py при первом запуске.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('event_similarities',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('similar_event_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['similar_event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('event_id', 'similar_event_id')
+    )
+    op.create_table('user_recommendations',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'rank')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_recommendations')
+    op.drop_table('event_similarities')
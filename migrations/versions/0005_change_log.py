@@ -0,0 +1,48 @@
+"""change log
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 18:25:09.886586
+
+Журнал изменений мероприятий и акций для GET /sync/changes. Уже
+существующие записи попадают в журнал как upsert, поэтому since=0 —
+полная выгрузка каталога.
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    change_log = op.create_table('change_log',
+    sa.Column('seq', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(length=10), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('seq'),
+    sqlite_autoincrement=True
+    )
+
+    bind = op.get_bind()
+    now = datetime.utcnow()
+    for entity, table_name in (('event', 'events'), ('promotion', 'promotions')):
+        table = sa.table(table_name, sa.column('id', sa.Integer()))
+        ids = bind.execute(sa.select(table.c.id).order_by(table.c.id)).scalars().all()
+        if ids:
+            op.bulk_insert(change_log, [
+                {'entity': entity, 'entity_id': entity_id, 'op': 'upsert', 'changed_at': now} for entity_id in ids
+            ])
+
+
+def downgrade() -> None:
+    op.drop_table('change_log')
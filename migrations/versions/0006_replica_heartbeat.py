@@ -0,0 +1,32 @@
+"""replica heartbeat
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 18:27:43.446633
+
+Отметка времени для оценки отставания реплик чтения
+(DATABASE_REPLICA_URLS); строку пишет фоновая задача app/jobs/heartbeat.py.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('replica_heartbeat',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('beat_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('replica_heartbeat')
@@ -0,0 +1,31 @@
+"""event posters
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 18:30:48.354466
+
+Постеры мероприятий: file_id в Telegram и версия файлов в MEDIA_DIR.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('poster_file_id', sa.String(length=200), nullable=True))
+        batch_op.add_column(sa.Column('poster_version', sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_column('poster_version')
+        batch_op.drop_column('poster_file_id')
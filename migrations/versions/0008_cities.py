@@ -0,0 +1,78 @@
+"""cities
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 18:35:55.844179
+
+Код города на мероприятиях, акциях, подписчиках, пользователях и рассылках;
+все уже существующие данные — Актау. Индексы начинаются с city, счётчики
+календаря ведутся по (city, day).
+
+"""
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EXISTING_CITY = 'aktau'
+TABLES = ('broadcast_jobs', 'events', 'promotions', 'subscribers', 'user_langs')
+INDEXES = (
+    ('events', 'ix_events_city_date', ['city', 'date']),
+    ('promotions', 'ix_promotions_city_active_end_date', ['city', 'is_active', 'end_date']),
+    ('subscribers', 'ix_subscribers_city_id', ['city', 'id']),
+    ('user_langs', 'ix_user_langs_city', ['city']),
+)
+
+
+def create_day_counts(by_city: bool):
+    columns = [sa.Column('city', sa.String(length=32), nullable=False)] if by_city else []
+    table = op.create_table('event_day_counts',
+    *columns,
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint(*(['city', 'day'] if by_city else ['day']))
+    )
+    events = sa.table('events', sa.column('date', sa.DateTime()), *([sa.column('city', sa.String())] if by_city else []))
+    rows = op.get_bind().execute(sa.select(*events.c)).all()
+    counts = Counter((row.city, row.date.date()) if by_city else row.date.date() for row in rows)
+    if counts:
+        op.bulk_insert(table, [
+            {'city': key[0], 'day': key[1], 'count': count} if by_city else {'day': key, 'count': count}
+            for key, count in counts.items()
+        ])
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        # server_default только для заполнения существующих строк
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('city', sa.String(length=32), nullable=False, server_default=EXISTING_CITY))
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('city', server_default=None)
+
+    for table, name, columns in INDEXES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(name, columns, unique=False)
+
+    op.drop_table('event_day_counts')
+    create_day_counts(by_city=True)
+
+
+def downgrade() -> None:
+    op.drop_table('event_day_counts')
+    create_day_counts(by_city=False)
+
+    for table, name, _ in INDEXES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(name)
+
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('city')
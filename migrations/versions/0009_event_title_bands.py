@@ -0,0 +1,80 @@
+"""event title bands
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 18:39:45.485950
+
+Индекс поиска дублей: полосы SimHash названия по городу и дню
+(app/database/dedupe.py). Заполняется для уже существующих мероприятий;
+сами дубли не объединяются — для этого python -m app.database.dedupe --merge.
+
+"""
+import hashlib
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Копия app/core/simhash.py на момент миграции: изменения хэша в приложении не должны менять эту ревизию
+def simhash(title):
+    text = re.sub(r"[\W_]", "", title.casefold().replace("ё", "е"))
+    shingles = [text] if len(text) < 2 else [text[i:i + 2] for i in range(len(text) - 1)]
+    weights = [0] * 64
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def title_band_rows(event_id, city, date, title):
+    value = simhash(title)
+    signed = value - (1 << 64) if value >> 63 else value
+    return [
+        {"event_id": event_id, "band": band, "city": city, "day": date.date(), "value": value >> (band * 8) & 0xFF,
+         "simhash": signed}
+        for band in range(8)
+    ]
+
+
+def upgrade() -> None:
+    event_title_bands = op.create_table('event_title_bands',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('band', sa.Integer(), nullable=False),
+    sa.Column('city', sa.String(length=32), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.Column('simhash', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('event_id', 'band')
+    )
+    with op.batch_alter_table('event_title_bands', schema=None) as batch_op:
+        batch_op.create_index('ix_event_title_bands_lookup', ['city', 'day', 'band', 'value'], unique=False)
+
+    events = sa.table(
+        'events',
+        sa.column('id', sa.Integer()), sa.column('city', sa.String()),
+        sa.column('date', sa.DateTime()), sa.column('title', sa.String()),
+    )
+    rows = [
+        row
+        for event in op.get_bind().execute(sa.select(events.c.id, events.c.city, events.c.date, events.c.title))
+        for row in title_band_rows(event.id, event.city, event.date, event.title)
+    ]
+    if rows:
+        op.bulk_insert(event_title_bands, rows)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('event_title_bands', schema=None) as batch_op:
+        batch_op.drop_index('ix_event_title_bands_lookup')
+
+    op.drop_table('event_title_bands')
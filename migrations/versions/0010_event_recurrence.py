@@ -0,0 +1,34 @@
+"""event recurrence
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 18:45:41.560595
+
+Повторяющиеся мероприятия: правило RRULE и дата последнего повторения
+конечной серии. Существующие мероприятия остаются разовыми (rrule NULL).
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rrule', sa.String(length=200), nullable=True))
+        batch_op.add_column(sa.Column('recurrence_end', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_events_city_series', ['city', 'date'], unique=False, sqlite_where=sa.text('rrule IS NOT NULL'), postgresql_where=sa.text('rrule IS NOT NULL'))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_index('ix_events_city_series', sqlite_where=sa.text('rrule IS NOT NULL'), postgresql_where=sa.text('rrule IS NOT NULL'))
+        batch_op.drop_column('recurrence_end')
+        batch_op.drop_column('rrule')
@@ -0,0 +1,74 @@
+"""digest preferences
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 18:53:58.978537
+
+Настройки дайджеста (app/jobs/digest.py). Уже подписанные пользователи
+получают дайджест с частотой DIGEST_DEFAULT_FREQUENCY — только о том,
+что появится после миграции.
+
+"""
+from typing import Sequence, Union
+
+from datetime import datetime, time, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Копия app/models/digest.next_send_at на момент миграции
+def next_send_at(frequency, after):
+    if frequency == "off":
+        return None
+    slot = datetime.combine(after.date(), time(settings.DIGEST_HOUR))
+    if frequency == "weekly":
+        slot += timedelta(days=(settings.DIGEST_WEEKDAY - slot.weekday()) % 7)
+    while slot <= after:
+        slot += timedelta(days=7 if frequency == "weekly" else 1)
+    return slot
+
+
+def upgrade() -> None:
+    digest_preferences = op.create_table('digest_preferences',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('frequency', sa.String(length=10), nullable=False),
+    sa.Column('cursor', sa.Integer(), nullable=False),
+    sa.Column('next_send_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    with op.batch_alter_table('digest_preferences', schema=None) as batch_op:
+        batch_op.create_index('ix_digest_preferences_next_send_at', ['next_send_at'], unique=False)
+
+    subscribers = sa.table('subscribers', sa.column('user_id', sa.Integer()))
+    change_log = sa.table('change_log', sa.column('seq', sa.Integer()))
+    now = datetime.utcnow()
+    frequency = settings.DIGEST_DEFAULT_FREQUENCY
+    cursor = op.get_bind().execute(sa.select(sa.func.coalesce(sa.func.max(change_log.c.seq), 0))).scalar_one()
+    op.execute(digest_preferences.insert().from_select(
+        ['user_id', 'frequency', 'cursor', 'next_send_at', 'created_at', 'updated_at'],
+        sa.select(
+            subscribers.c.user_id, sa.literal(frequency), sa.literal(cursor),
+            sa.literal(next_send_at(frequency, now), sa.DateTime()), sa.literal(now, sa.DateTime()),
+            sa.literal(now, sa.DateTime()),
+        ),
+    ))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('digest_preferences', schema=None) as batch_op:
+        batch_op.drop_index('ix_digest_preferences_next_send_at')
+
+    op.drop_table('digest_preferences')
@@ -0,0 +1,79 @@
+"""event popularity
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 19:04:31.430856
+
+Популярность мероприятий (app/models/popularity.py). Начальный score
+считается по уже сохранённому избранному с его датами.
+
+"""
+from typing import Sequence, Union
+
+import math
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Копия app/models/popularity.py на момент миграции: EPOCH и формула score
+EPOCH = datetime(2024, 1, 1)
+
+
+def log_weight(weight, at):
+    half_lives = (at - EPOCH).total_seconds() / 3600 / settings.POPULARITY_HALF_LIFE_HOURS
+    return math.log(weight) + half_lives * math.log(2)
+
+
+def logaddexp(a, b):
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def upgrade() -> None:
+    event_popularity = op.create_table('event_popularity',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('city', sa.String(length=32), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+    with op.batch_alter_table('event_popularity', schema=None) as batch_op:
+        batch_op.create_index('ix_event_popularity_city_score', ['city', 'score'], unique=False)
+
+    favorites = sa.table('favorites', sa.column('event_id', sa.Integer()), sa.column('created_at', sa.DateTime()))
+    events = sa.table('events', sa.column('id', sa.Integer()), sa.column('city', sa.String()))
+    now = datetime.utcnow()
+    scores, cities = {}, {}
+    rows = op.get_bind().execute(
+        sa.select(favorites.c.event_id, events.c.city, favorites.c.created_at)
+        .join(events, events.c.id == favorites.c.event_id)
+    )
+    for event_id, city, created_at in rows:
+        increment = log_weight(settings.POPULARITY_FAVORITE_WEIGHT, created_at or now)
+        scores[event_id] = logaddexp(scores.get(event_id), increment)
+        cities[event_id] = city
+    if scores:
+        op.bulk_insert(event_popularity, [
+            {'event_id': event_id, 'city': cities[event_id], 'score': score, 'updated_at': now}
+            for event_id, score in scores.items()
+        ])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('event_popularity', schema=None) as batch_op:
+        batch_op.drop_index('ix_event_popularity_city_score')
+
+    op.drop_table('event_popularity')
@@ -0,0 +1,46 @@
+"""event title folded
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 19:14:38.235139
+
+Название в casefold для поиска по подстроке: LIKE и lower() в SQLite
+сворачивают регистр только латиницы. Заполняется из существующих названий.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('title_folded', sa.Text(), nullable=True))
+
+    events = sa.table('events', sa.column('id', sa.Integer()), sa.column('title', sa.String()),
+                      sa.column('title_folded', sa.Text()))
+    bind = op.get_bind()
+    rows = [
+        {'event_id': event_id, 'folded': title.casefold()}
+        for event_id, title in bind.execute(sa.select(events.c.id, events.c.title))
+    ]
+    if rows:
+        bind.execute(
+            events.update().where(events.c.id == sa.bindparam('event_id')).values(title_folded=sa.bindparam('folded')),
+            rows,
+        )
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.alter_column('title_folded', existing_type=sa.Text(), nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_column('title_folded')
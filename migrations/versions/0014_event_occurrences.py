@@ -0,0 +1,64 @@
+"""event occurrences
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19 19:19:55.497135
+
+Повторения серий в коротком окне (app/jobs/occurrences.py). Таблица
+заполняется первым запуском задачи; до этого окно не задано (NULL),
+и списки развёртывают серии из правила, как раньше.
+
+"""
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0014'
+down_revision: Union[str, None] = '0013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    occurrence_horizon = op.create_table('occurrence_horizon',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('since', sa.DateTime(), nullable=True),
+    sa.Column('until', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Строка есть с самого начала — задача продления блокирует её при первом заполнении
+    op.bulk_insert(occurrence_horizon, [{'id': 1, 'since': None, 'until': None}])
+    op.create_table('event_occurrences',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.DateTime(), nullable=False),
+    sa.Column('city', sa.String(length=32), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('event_id', 'date')
+    )
+    with op.batch_alter_table('event_occurrences', schema=None) as batch_op:
+        batch_op.create_index('ix_event_occurrences_city_date', ['city', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('event_occurrences', schema=None) as batch_op:
+        batch_op.drop_index('ix_event_occurrences_city_date')
+
+    op.drop_table('event_occurrences')
+    op.drop_table('occurrence_horizon')
+
+    # Счётчики пересчитываются по разовым мероприятиям: до 0014 повторения серий в них не попадали
+    day_counts = sa.table('event_day_counts',
+    sa.column('city', sa.String()), sa.column('day', sa.Date()), sa.column('count', sa.Integer()),
+    )
+    events = sa.table('events', sa.column('city', sa.String()), sa.column('date', sa.DateTime()), sa.column('rrule', sa.String()))
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(events.c.city, events.c.date).where(events.c.rrule.is_(None))).all()
+    counts = Counter((row.city, row.date.date()) for row in rows)
+    bind.execute(day_counts.delete())
+    if counts:
+        op.bulk_insert(day_counts, [
+            {'city': city, 'day': day, 'count': count} for (city, day), count in counts.items()
+        ])
@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+# Настройки читаются при импорте app — окружение задаётся до него
+_tmp = tempfile.mkdtemp()
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_tmp, 'test.db')}",
+    "BOT_TOKEN": "42:TEST",
+    "CITIES": "aktau:Актау,almaty:Алматы",
+    "MEDIA_DIR": os.path.join(_tmp, "media"),
+})
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    from app.database.migrate import upgrade_head
+
+    upgrade_head()
+
+
+@pytest.fixture
+def db():
+    from app.database.database import SessionLocal
+
+    with SessionLocal(primary=True) as session:
+        yield session
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.api.main import create_app
+
+    return TestClient(create_app())
@@ -0,0 +1,30 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.jobs import digest
+
+
+class RecordingBot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, reply_markup=None):
+        self.sent.append(chat_id)
+
+
+def test_api_subscriber_gets_digest(client, monkeypatch):
+    response = client.post("/subscribers/", json={"user_id": 9001, "city": "aktau"})
+    assert response.status_code == 200, response.text
+    created = client.post("/events/", json={"title": "Фестиваль", "date": "2030-05-01T12:00:00", "city": "aktau"})
+    assert created.status_code == 200, created.text
+
+    class Later(datetime):
+        @classmethod
+        def utcnow(cls):
+            # Ближайший слот отправки — не позже чем через неделю
+            return datetime.utcnow() + timedelta(days=8)
+
+    monkeypatch.setattr(digest, "datetime", Later)
+    bot = RecordingBot()
+    asyncio.run(digest.send_digests(bot, asyncio.Event()))
+    assert 9001 in bot.sent
@@ -0,0 +1,16 @@
+def test_update_rejects_null_title(client):
+    created = client.post("/events/", json={"title": "Концерт", "date": "2030-01-01T19:00:00"})
+    assert created.status_code == 200, created.text
+    event_id = created.json()["id"]
+
+    response = client.put(f"/events/{event_id}", json={"title": None})
+    assert response.status_code == 422
+    assert client.get(f"/events/{event_id}").json()["title"] == "Концерт"
+
+
+def test_update_without_title_keeps_it(client):
+    event_id = client.post("/events/", json={"title": "Выставка", "date": "2030-01-02T19:00:00"}).json()["id"]
+
+    response = client.put(f"/events/{event_id}", json={"location": "Музей"})
+    assert response.status_code == 200, response.text
+    assert response.json()["title"] == "Выставка"
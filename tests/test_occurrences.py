@@ -0,0 +1,76 @@
+from datetime import date, datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import read_models
+from app.models.event import Event, EventDayCount, EventOccurrence, adjust_day_count, shift_occurrences
+
+
+def test_occurrences_accept_utc_suffix(client):
+    created = client.post("/events/", json={
+        "title": "Квиз", "date": "2040-03-01T10:00:00+05:00", "rrule": "FREQ=DAILY;COUNT=3", "city": "almaty",
+    })
+    assert created.status_code == 200, created.text
+    assert created.json()["date"] == "2040-03-01T05:00:00"
+
+    aware = client.get("/events/occurrences", params={
+        "city": "almaty", "date_from": "2040-03-01T00:00:00Z", "date_to": "2040-03-02T12:00:00Z",
+    })
+    assert aware.status_code == 200, aware.text
+    assert [row["date"] for row in aware.json()] == ["2040-03-01T05:00:00", "2040-03-02T05:00:00"]
+    naive = client.get("/events/occurrences", params={
+        "city": "almaty", "date_from": "2040-03-01T00:00:00", "date_to": "2040-03-02T12:00:00",
+    })
+    assert naive.json() == aware.json()
+
+
+def test_window_keeps_only_near_occurrences(db):
+    series = Event(title="Йога", city="aktau", date=datetime(2041, 1, 1, 10), rrule="FREQ=DAILY")
+    db.add(series)
+    db.commit()
+
+    def stored():
+        return db.scalars(select(EventOccurrence.date).where(EventOccurrence.event_id == series.id)).all()
+
+    shift_occurrences(db.connection(), datetime(2041, 1, 10), datetime(2041, 1, 24))
+    db.commit()
+    assert len(stored()) == 14
+
+    # Сдвиг на день: прошедший день удаляется, дописывается один новый
+    assert shift_occurrences(db.connection(), datetime(2041, 1, 11), datetime(2041, 1, 25)) >= 1
+    db.commit()
+    assert min(stored()) == datetime(2041, 1, 11, 10) and max(stored()) == datetime(2041, 1, 24, 10)
+
+    rows = read_models.upcoming_events(db, "aktau", 2, now=datetime(2041, 1, 20, 12))
+    assert [row.date for row in rows] == [datetime(2041, 1, 21, 10), datetime(2041, 1, 22, 10)]
+    # Вне окна серия развёртывается из правила
+    rows = read_models.upcoming_events(db, "aktau", 1, now=datetime(2041, 6, 1))
+    assert [row.date for row in rows] == [datetime(2041, 6, 1, 10)]
+
+
+def test_downgrade_recounts_one_off_days(tmp_path):
+    from alembic import command
+
+    from app.database.database import build_engine
+    from app.database.migrate import alembic_config
+
+    url = f"sqlite:///{tmp_path / 'downgrade.db'}"
+    config = alembic_config()
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "0014")
+    engine = build_engine(url)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all([
+            Event(title="Концерт", city="aktau", date=datetime(2030, 1, 5, 19)),
+            Event(title="Квиз", city="aktau", date=datetime(2030, 1, 1, 19), rrule="FREQ=DAILY"),
+        ])
+        # Прежняя версия 0014 считала повторения серий в счётчиках дней
+        adjust_day_count(db.connection(), "aktau", date(2030, 1, 5), 1)
+        db.commit()
+
+    command.downgrade(config, "0013")
+    with engine.connect() as connection:
+        counts = connection.execute(select(EventDayCount.city, EventDayCount.day, EventDayCount.count)).all()
+    engine.dispose()
+    assert [tuple(row) for row in counts] == [("aktau", date(2030, 1, 5), 1)]
@@ -0,0 +1,48 @@
+import json
+
+from aiogram.types import Update
+
+from app.bot.recorder import UpdateRecorder
+
+USER = {"id": 1111111, "is_bot": False, "first_name": "Айгерим", "username": "aigerim"}
+CHAT = {"id": 1111111, "type": "private", "first_name": "Айгерим"}
+# Автор пересланного сообщения и владелец контакта — другие люди
+FORWARDED = {"id": 2222222, "is_bot": False, "first_name": "Ерлан", "last_name": "Сатпаев"}
+CONTACT_USER_ID = 3333333
+
+
+def record(tmp_path, message):
+    recorder = UpdateRecorder(str(tmp_path / "updates.jsonl.gz"), salt="test")
+    update = Update.model_validate({"update_id": 1, "message": {"message_id": 1, "date": 0, "chat": CHAT, "from": USER, **message}})
+    scrubbed = recorder.scrub(update.model_dump(mode="json", exclude_none=True, by_alias=True))
+    recorder.close()
+    return json.dumps(scrubbed, ensure_ascii=False)
+
+
+def assert_no_raw_ids(text):
+    for raw in (USER["id"], FORWARDED["id"], CONTACT_USER_ID):
+        assert str(raw) not in text
+    for name in ("Айгерим", "aigerim", "Ерлан", "Сатпаев"):
+        assert name not in text
+
+
+def test_forwarded_message_is_scrubbed(tmp_path):
+    text = record(tmp_path, {
+        "text": "Концерт в субботу",
+        "forward_from": FORWARDED,
+        "forward_date": 0,
+        "forward_origin": {"type": "user", "date": 0, "sender_user": FORWARDED},
+    })
+    assert_no_raw_ids(text)
+
+
+def test_shared_contact_is_scrubbed(tmp_path):
+    text = record(tmp_path, {
+        "contact": {
+            "phone_number": "+77011234567", "first_name": "Ерлан", "last_name": "Сатпаев",
+            "user_id": CONTACT_USER_ID, "vcard": "BEGIN:VCARD\nFN:Ерлан Сатпаев\nTEL:+77011234567\nEND:VCARD",
+        },
+    })
+    assert_no_raw_ids(text)
+    assert "77011234567" not in text
+